@@ -0,0 +1,164 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nomina.amount import Amount
+
+if TYPE_CHECKING:
+    from nomina.ledger import Account
+
+
+class AccountTree:
+    """
+    precomputed hierarchy of the accounts of a ledger Book with
+    topological order, depth, ancestor lists, fully qualified names
+    and the common minor unit scale of the account currencies
+    """
+
+    def __init__(self, accounts: Dict[str, "Account"], separator: str = ":"):
+        """
+        constructor
+
+        Args:
+            accounts (Dict[str, Account]): the accounts by account_id
+            separator (str): the separator for the fully qualified names
+        """
+        self.separator = separator
+        self.names: Dict[str, str] = {}
+        self.parent: Dict[str, Optional[str]] = {}
+        self.children: Dict[str, List[str]] = {}
+        # parents before children
+        self.order: List[str] = []
+        self.depth: Dict[str, int] = {}
+        # nearest parent first
+        self.ancestors: Dict[str, List[str]] = {}
+        self.fq_names: Dict[str, str] = {}
+        self.scale = Amount.scale_of_accounts(accounts.values())
+        for account_id, account in accounts.items():
+            self.names[account_id] = account.name
+            parent_id = account.parent_account_id
+            # accounts with unknown parents are roots
+            if parent_id and parent_id in accounts and parent_id != account_id:
+                self.parent[account_id] = parent_id
+            else:
+                self.parent[account_id] = None
+            self.children[account_id] = []
+        for account_id in accounts:
+            self._resolve(account_id)
+        for account_id in self.order:
+            parent_id = self.parent[account_id]
+            if parent_id:
+                self.children[parent_id].append(account_id)
+
+    def _resolve(self, account_id: str):
+        """
+        resolve the ancestors of the given account iteratively
+        """
+        if account_id in self.depth:
+            return
+        # walk up to the first resolved ancestor
+        chain = []
+        seen = set()
+        current = account_id
+        while current is not None and current not in self.depth:
+            if current in seen:
+                # break cycles by making the repeated account a root
+                self.parent[current] = None
+                break
+            seen.add(current)
+            chain.append(current)
+            current = self.parent[current]
+        for current in reversed(chain):
+            parent_id = self.parent[current]
+            if parent_id is None:
+                self.ancestors[current] = []
+                self.depth[current] = 0
+                self.fq_names[current] = self.names[current]
+            else:
+                self.ancestors[current] = [parent_id] + self.ancestors[parent_id]
+                self.depth[current] = self.depth[parent_id] + 1
+                self.fq_names[current] = (
+                    f"{self.fq_names[parent_id]}{self.separator}{self.names[current]}"
+                )
+            self.order.append(current)
+
+    def fq_name(self, account_id: str, separator: str = None) -> Optional[str]:
+        """
+        get the fully qualified name of the given account
+
+        Args:
+            account_id (str): the id of the account
+            separator (str): the separator to use - defaults to the tree's separator
+
+        Returns:
+            Optional[str]: the fully qualified name or None if the account is unknown
+        """
+        if separator is None or separator == self.separator:
+            return self.fq_names.get(account_id)
+        if account_id not in self.ancestors:
+            return None
+        path = [self.names[a] for a in reversed(self.ancestors[account_id])]
+        path.append(self.names[account_id])
+        return separator.join(path)
+
+    def rollup(
+        self, balances: Dict[str, Optional[float]]
+    ) -> Dict[str, Optional[float]]:
+        """
+        propagate the given balances up the hierarchy in a single bottom-up pass
+
+        Args:
+            balances (Dict[str, Optional[float]]): the direct balances by account id -
+                None for unused accounts
+
+        Returns:
+            Dict[str, Optional[float]]: the balances including all descendants
+        """
+        for account_id in reversed(self.order):
+            parent_id = self.parent[account_id]
+            child_balance = balances.get(account_id)
+            if parent_id and child_balance is not None:
+                if balances.get(parent_id) is None:
+                    balances[parent_id] = child_balance
+                else:
+                    balances[parent_id] += child_balance
+        return balances
+
+    def rollup_arrays(
+        self, account_ids: List[str], sums: np.ndarray, counts: np.ndarray
+    ) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        propagate the given per account sums and counts up the hierarchy
+        as vectorized segment sums level by level
+
+        Args:
+            account_ids (List[str]): the account ids in array index order
+            sums (np.ndarray): the direct sums per account index
+            counts (np.ndarray): the direct number of postings per account index
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: the sums and counts including all descendants
+        """
+        index = {account_id: i for i, account_id in enumerate(account_ids)}
+        parent_idx = np.array(
+            [index.get(self.parent.get(account_id), -1) for account_id in account_ids],
+            dtype=np.int64,
+        )
+        depth = np.array(
+            [self.depth.get(account_id, 0) for account_id in account_ids],
+            dtype=np.int64,
+        )
+        sums = sums.copy()
+        counts = counts.copy()
+        max_depth = int(depth.max()) if len(depth) else 0
+        for level in range(max_depth, 0, -1):
+            mask = (depth == level) & (parent_idx >= 0)
+            np.add.at(sums, parent_idx[mask], sums[mask])
+            np.add.at(counts, parent_idx[mask], counts[mask])
+        return sums, counts
@@ -44,23 +44,20 @@ class AccountView:
         """
         try:
             lod = []
-            balance = 0.0
-            row_num = 0
-            for _tx_id, tx in book.transactions.items():
-                for split in tx.splits:
-                    if split.account_id == account.account_id:
-                        if split.amount is not None:
-                            row_num += 1
-                            balance += split.amount
-                            record = {
-                                "#": row_num,
-                                "Date": tx.isodate,
-                                "Memo": split.memo,
-                                "Amount": f"{split.amount:10.2f}",
-                                "Ok": "⚫" if split.reconciled else "⚪",
-                                "Balance": f"{balance:10.2f}",
-                            }
-                            lod.append(record)
+            for row_num, entry in enumerate(
+                book.get_register(account.account_id), start=1
+            ):
+                tx = book.transactions[entry.transaction_id]
+                split = tx.splits[entry.split_pos]
+                record = {
+                    "#": row_num,
+                    "Date": tx.isodate,
+                    "Memo": split.memo,
+                    "Amount": f"{entry.amount:10.2f}",
+                    "Ok": "⚫" if split.reconciled else "⚪",
+                    "Balance": f"{entry.balance:10.2f}",
+                }
+                lod.append(record)
             if self.lod_grid is None:
                 key_col = "#"
                 grid_config = GridConfig(
@@ -0,0 +1,344 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import math
+import re
+from decimal import ROUND_HALF_EVEN, Decimal
+from fractions import Fraction
+from typing import Dict, Iterable, List, Optional, Tuple, Union
+
+import numpy as np
+
+
+class Amount:
+    """
+    exact amounts as int64 minor units (e.g. cents) with a per commodity scale
+    """
+
+    default_scale: int = 2
+    # the finest scale derived from the data - 8 decimals e.g. for satoshis
+    # keep sums of int64 minor units below 9.2e10 major units
+    max_scale: int = 8
+    # ISO 4217 currencies that do not have two decimal places
+    scales: Dict[str, int] = {
+        "BHD": 3,
+        "BIF": 0,
+        "CLP": 0,
+        "IQD": 3,
+        "ISK": 0,
+        "JOD": 3,
+        "JPY": 0,
+        "KRW": 0,
+        "KWD": 3,
+        "LYD": 3,
+        "OMR": 3,
+        "PYG": 0,
+        "TND": 3,
+        "UGX": 0,
+        "VND": 0,
+        "XAF": 0,
+        "XOF": 0,
+    }
+
+    # anything that is not part of a number e.g. currency symbols and whitespace
+    non_numeric = re.compile(r"[^\d,.-]")
+
+    @classmethod
+    def scale(cls, currency: Optional[str] = None) -> int:
+        """
+        get the number of decimal places of the given currency
+
+        Args:
+            currency (str): the ISO 4217 currency code
+
+        Returns:
+            int: the scale - defaults to 2
+        """
+        return cls.scales.get(currency, cls.default_scale)
+
+    @classmethod
+    def scale_of_accounts(cls, accounts: Iterable) -> int:
+        """
+        get a common scale for the given accounts that represents
+        the amounts of all of their currencies exactly
+
+        Args:
+            accounts: the accounts with their currency
+
+        Returns:
+            int: the maximum scale of the account currencies
+        """
+        return max(
+            (cls.scale(account.currency) for account in accounts),
+            default=cls.default_scale,
+        )
+
+    @classmethod
+    def decimals(cls, amount: Union[float, int, str, Decimal, None]) -> int:
+        """
+        get the number of decimal places of the shortest exact representation
+        of the given amount
+
+        Args:
+            amount: the amount e.g. 0.0015
+
+        Returns:
+            int: the number of decimal places e.g. 4
+        """
+        if amount is None or isinstance(amount, int):
+            return 0
+        if isinstance(amount, float):
+            if not math.isfinite(amount):
+                return 0
+            # repr gives the shortest string that round trips
+            amount = Decimal(repr(amount))
+        elif not isinstance(amount, Decimal):
+            amount = Decimal(str(amount))
+        exponent = amount.normalize().as_tuple().exponent
+        return max(0, -exponent) if isinstance(exponent, int) else 0
+
+    @classmethod
+    def scale_of_amounts(
+        cls, amounts: Iterable[Optional[float]], scale: int = default_scale
+    ) -> int:
+        """
+        get the scale that represents all given amounts exactly e.g. the split
+        amounts of a commodity or crypto currency book
+
+        Args:
+            amounts: the amounts in major units - None is ignored
+            scale (int): the minimum scale e.g. of the account currencies
+
+        Returns:
+            int: the scale - at least the given scale and at most max_scale
+        """
+        for amount in amounts:
+            if scale >= cls.max_scale:
+                break
+            if amount is None:
+                continue
+            # round is exact so this is a cheap check for the common case
+            if isinstance(amount, float) and round(amount, scale) == amount:
+                continue
+            scale = max(scale, min(cls.decimals(amount), cls.max_scale))
+        return scale
+
+    @classmethod
+    def scale_of_denom(cls, denom: int) -> int:
+        """
+        get the scale of a denominator e.g. a GnuCash commodity fraction
+        or value_denom - 100 gives 2 and 1 gives 0
+
+        Args:
+            denom (int): the denominator
+
+        Returns:
+            int: the smallest scale with 10**scale divisible by denom - at most max_scale
+        """
+        scale = 0
+        while scale < cls.max_scale and 10**scale % denom:
+            scale += 1
+        return scale
+
+    @classmethod
+    def to_minor(
+        cls,
+        amount: Union[float, int, str, Decimal, Fraction, None],
+        scale: int = default_scale,
+    ) -> int:
+        """
+        convert the given amount to minor units rounding half to even
+
+        Args:
+            amount: the amount in major units
+            scale (int): the number of decimal places of the minor unit
+
+        Returns:
+            int: the amount in minor units
+        """
+        if amount is None:
+            return 0
+        factor = 10**scale
+        if isinstance(amount, float):
+            # the float nearest to a value with at most scale decimals
+            # is far closer than half a minor unit to it
+            return round(amount * factor)
+        if isinstance(amount, (int, Fraction)):
+            return round(amount * factor)
+        if not isinstance(amount, Decimal):
+            amount = Decimal(amount)
+        minor = (amount * factor).to_integral_value(rounding=ROUND_HALF_EVEN)
+        return int(minor)
+
+    @classmethod
+    def clean(cls, amount_str: str) -> str:
+        """
+        remove currency symbols and whitespace from the given amount string
+        and normalize the decimal separator to a dot
+
+        Args:
+            amount_str (str): the amount e.g. '-1.234,50 EUR', '1,234.50' or '-12.50'
+
+        Returns:
+            str: the cleaned amount e.g. '-1234.50'
+        """
+        body = amount_str[1:] if amount_str[:1] == "-" else amount_str
+        if body.isascii() and body.replace(".", "", 1).isdigit():
+            # fast path for amounts that are already clean
+            return amount_str
+        cleaned_str = cls.non_numeric.sub("", amount_str)
+        # the last dot or comma is the decimal separator - all others separate thousands
+        last = max(cleaned_str.rfind("."), cleaned_str.rfind(","))
+        if last >= 0:
+            whole = cleaned_str[:last].replace(".", "").replace(",", "")
+            cleaned_str = f"{whole}.{cleaned_str[last + 1:]}"
+        return cleaned_str
+
+    @classmethod
+    def parse(cls, amount_str: str, scale: int = default_scale) -> Tuple[int, float]:
+        """
+        parse the given amount string exactly
+
+        Args:
+            amount_str (str): the amount e.g. '-1.234,50 EUR'
+            scale (int): the number of decimal places of the minor unit
+
+        Returns:
+            Tuple[int, float]: the amount in minor units and as float in major units
+
+        Raises:
+            ValueError: if the amount can not be parsed
+        """
+        cleaned_str = cls.clean(amount_str)
+        try:
+            amount_float = float(cleaned_str)
+        except ValueError:
+            raise ValueError(f"Unable to parse amount: {amount_str}")
+        negative = cleaned_str.startswith("-")
+        whole, _, frac = cleaned_str.lstrip("-").partition(".")
+        if len(frac) <= scale:
+            # exact integer arithmetic without Decimal
+            minor = int(whole or "0") * 10**scale + int(frac.ljust(scale, "0") or "0")
+            if negative:
+                minor = -minor
+        else:
+            minor = cls.to_minor(cleaned_str, scale)
+        return minor, amount_float
+
+    @classmethod
+    def parse_many(
+        cls, amount_strs: Iterable[str], scale: int = default_scale
+    ) -> Tuple[List[int], List[float]]:
+        """
+        parse all given amount strings e.g. the split amounts of a transaction
+
+        Args:
+            amount_strs (Iterable[str]): the amounts
+            scale (int): the number of decimal places of the minor unit
+
+        Returns:
+            Tuple[List[int], List[float]]: the amounts in minor units and as floats
+
+        Raises:
+            ValueError: if any of the amounts can not be parsed
+        """
+        parsed = [cls.parse(amount_str, scale) for amount_str in amount_strs]
+        minors = [minor for minor, _amount_float in parsed]
+        floats = [amount_float for _minor, amount_float in parsed]
+        return minors, floats
+
+    @classmethod
+    def from_minor(cls, minor: int, scale: int = default_scale) -> float:
+        """
+        convert the given minor units to a float amount in major units
+        """
+        return int(minor) / 10**scale
+
+    @classmethod
+    def to_decimal(cls, minor: int, scale: int = default_scale) -> Decimal:
+        """
+        convert the given minor units to an exact Decimal amount in major units
+        """
+        return Decimal(int(minor)).scaleb(-scale)
+
+    @classmethod
+    def from_fraction(cls, fraction: str, scale: int = default_scale) -> int:
+        """
+        convert a GnuCash style 'num/denom' value to minor units exactly
+
+        Args:
+            fraction (str): the value e.g. '-350/100'
+            scale (int): the number of decimal places of the minor unit
+
+        Returns:
+            int: the amount in minor units
+        """
+        num, _, denom = fraction.partition("/")
+        return cls.from_num_denom(int(num), int(denom) if denom else 1, scale)
+
+    @classmethod
+    def from_num_denom(cls, num: int, denom: int, scale: int = default_scale) -> int:
+        """
+        convert a GnuCash value_num/value_denom pair to minor units exactly
+
+        Args:
+            num (int): the numerator e.g. -350
+            denom (int): the denominator e.g. 100
+            scale (int): the number of decimal places of the minor unit
+
+        Returns:
+            int: the amount in minor units
+        """
+        factor = 10**scale
+        if denom == factor:
+            # the common case of a denominator matching the currency
+            return num
+        return cls.to_minor(Fraction(num, denom), scale)
+
+    @classmethod
+    def to_fraction(cls, minor: int, scale: int = default_scale) -> str:
+        """
+        convert minor units to a GnuCash style 'num/denom' value
+        """
+        return f"{int(minor)}/{10**scale}"
+
+    @classmethod
+    def sum(
+        cls, amounts: Iterable[Optional[float]], scale: int = default_scale
+    ) -> float:
+        """
+        sum up the given float amounts exactly in minor units
+
+        Args:
+            amounts: the amounts in major units
+            scale (int): the minimum number of decimal places of the minor unit -
+                finer amounts raise the scale
+
+        Returns:
+            float: the exact sum converted back to major units
+        """
+        amounts = [amount for amount in amounts if amount]
+        scale = cls.scale_of_amounts(amounts, scale)
+        total = sum(cls.to_minor(amount, scale) for amount in amounts)
+        return cls.from_minor(total, scale)
+
+    @classmethod
+    def to_minor_array(
+        cls, amounts: np.ndarray, scale: int = default_scale
+    ) -> np.ndarray:
+        """
+        vectorized conversion of float amounts to int64 minor units
+
+        Args:
+            amounts (np.ndarray): the float amounts in major units
+            scale (int): the number of decimal places of the minor unit
+
+        Returns:
+            np.ndarray: the int64 minor units
+        """
+        return np.rint(np.asarray(amounts, dtype=np.float64) * 10**scale).astype(
+            np.int64
+        )
@@ -0,0 +1,203 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from bisect import bisect_left, bisect_right
+from typing import TYPE_CHECKING, Dict, List, Optional
+
+from nomina.amount import Amount
+from nomina.running_balances import RunningBalances
+
+if TYPE_CHECKING:
+    from nomina.ledger import Transaction
+
+
+class AccountCheckpoints:
+    """
+    the per period deltas of a single account with lazily
+    maintained cumulative balances at the period ends
+    """
+
+    def __init__(self):
+        """
+        constructor
+        """
+        # sorted period keys e.g. '2024-10' - undated postings have the empty key
+        self.periods: List[str] = []
+        self.deltas: List[int] = []
+        self.counts: List[int] = []
+        self.balances: List[int] = []
+        # index of the first period with a stale balance
+        self.dirty = 0
+
+    def add(self, period: str, amount: int, count: int = 1):
+        """
+        add the given amount to the given period
+
+        Args:
+            period (str): the period key
+            amount (int): the amount in minor units - negative for removals
+            count (int): the number of postings - negative for removals
+        """
+        pos = bisect_left(self.periods, period)
+        if pos == len(self.periods) or self.periods[pos] != period:
+            self.periods.insert(pos, period)
+            self.deltas.insert(pos, 0)
+            self.counts.insert(pos, 0)
+            self.balances.insert(pos, 0)
+        self.deltas[pos] += amount
+        self.counts[pos] += count
+        if self.counts[pos] <= 0:
+            del self.periods[pos]
+            del self.deltas[pos]
+            del self.counts[pos]
+            del self.balances[pos]
+        # only the balances from the touched period onward need an update
+        self.dirty = min(self.dirty, pos)
+
+    def _refresh(self):
+        """
+        recalculate the stale cumulative balances
+        """
+        if self.dirty < len(self.periods):
+            balance = self.balances[self.dirty - 1] if self.dirty > 0 else 0
+            for i in range(self.dirty, len(self.periods)):
+                balance += self.deltas[i]
+                self.balances[i] = balance
+        self.dirty = len(self.periods)
+
+    def balance_at_end(self, period: str) -> Optional[int]:
+        """
+        get the balance at the end of the given period
+
+        Args:
+            period (str): the period key
+
+        Returns:
+            Optional[int]: the balance in minor units or None if there are no postings up to the period
+        """
+        self._refresh()
+        pos = bisect_right(self.periods, period)
+        return self.balances[pos - 1] if pos > 0 else None
+
+    def balance_before(self, period: str) -> int:
+        """
+        get the balance before the start of the given period in minor units
+        """
+        self._refresh()
+        pos = bisect_left(self.periods, period)
+        return self.balances[pos - 1] if pos > 0 else 0
+
+
+class BalanceCheckpoints:
+    """
+    per account balance checkpoints at the month or year boundaries of a ledger Book
+    maintained incrementally as transactions are added or removed
+    """
+
+    granularities = {"month": 7, "year": 4}
+
+    def __init__(self, granularity: str = "month", scale: int = Amount.default_scale):
+        """
+        constructor
+
+        Args:
+            granularity (str): 'month' or 'year'
+            scale (int): the number of decimal places of the minor units
+        """
+        if granularity not in self.granularities:
+            raise ValueError(f"invalid granularity {granularity}")
+        self.granularity = granularity
+        self.key_length = self.granularities[granularity]
+        self.scale = scale
+        self.accounts: Dict[str, AccountCheckpoints] = {}
+
+    @classmethod
+    def granularity_of(cls, period: str) -> str:
+        """
+        get the granularity of the given period key
+
+        Args:
+            period (str): 'YYYY' or 'YYYY-MM'
+
+        Returns:
+            str: 'year' or 'month'
+        """
+        for granularity, key_length in cls.granularities.items():
+            if len(period) == key_length:
+                return granularity
+        raise ValueError(f"invalid period {period} - expected YYYY or YYYY-MM")
+
+    def period_key(self, transaction: "Transaction") -> str:
+        """
+        get the period key of the given transaction
+        """
+        return RunningBalances.date_key(transaction)[: self.key_length]
+
+    def _update(self, transaction: "Transaction", sign: int):
+        period = self.period_key(transaction)
+        for split in transaction.splits:
+            if split is not None and split.amount is not None:
+                checkpoints = self.accounts.get(split.account_id)
+                if checkpoints is None:
+                    checkpoints = AccountCheckpoints()
+                    self.accounts[split.account_id] = checkpoints
+                amount = Amount.to_minor(split.amount, self.scale)
+                checkpoints.add(period, sign * amount, sign)
+
+    def add_transaction(self, transaction: "Transaction"):
+        """
+        add the postings of the given transaction
+        """
+        self._update(transaction, 1)
+
+    def remove_transaction(self, transaction: "Transaction"):
+        """
+        remove the postings of the given transaction
+        """
+        self._update(transaction, -1)
+
+    def periods(self) -> List[str]:
+        """
+        get the sorted periods that have postings
+        """
+        periods = set()
+        for checkpoints in self.accounts.values():
+            periods.update(checkpoints.periods)
+        return sorted(periods)
+
+    def balances_at_end(self, period: str) -> Dict[str, Optional[int]]:
+        """
+        get the balances of all accounts with postings at the end of the given period
+
+        Args:
+            period (str): the period key
+
+        Returns:
+            Dict[str, Optional[int]]: the balances in minor units by account id
+        """
+        balances = {
+            account_id: checkpoints.balance_at_end(period)
+            for account_id, checkpoints in self.accounts.items()
+        }
+        return balances
+
+    def delta(self, account_id: str, start_period: str, end_period: str) -> int:
+        """
+        get the change of the balance of the given account over the given periods
+
+        Args:
+            account_id (str): the id of the account
+            start_period (str): the first period
+            end_period (str): the last period (inclusive)
+
+        Returns:
+            int: the sum of the postings in minor units
+        """
+        checkpoints = self.accounts.get(account_id)
+        if checkpoints is None:
+            return 0
+        end_balance = checkpoints.balance_at_end(end_period) or 0
+        return end_balance - checkpoints.balance_before(start_period)
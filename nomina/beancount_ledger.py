@@ -9,6 +9,7 @@ from typing import Dict, Optional
 
 from beancount.core import data
 
+from nomina.amount import Amount
 from nomina.date_utils import DateUtils
 from nomina.file_formats import AccountingFileFormats
 from nomina.ledger import Account as LedgerAccount
@@ -61,7 +62,7 @@ class BeancountToLedgerConverter(BaseToLedgerConverter):
 
     def convert_to_target(self) -> LedgerBook:
         """Convert the Beancount file to a Ledger Book."""
-        self.ledger_book = LedgerBook()
+        self.ledger_book = self.new_book()
         self.account_map: Dict[str, LedgerAccount] = {}
 
         for entry in self.beancount.entries:
@@ -115,7 +116,7 @@ class BeancountToLedgerConverter(BaseToLedgerConverter):
         transaction_id = (
             f"{ledger_transaction.isodate}:{hash(ledger_transaction.description)}"
         )
-        self.ledger_book.transactions[transaction_id] = ledger_transaction
+        self.ledger_book.add_transaction(transaction_id, ledger_transaction)
 
 
 class LedgerToBeancountConverter(BaseFromLedgerConverter):
@@ -137,6 +138,17 @@ class LedgerToBeancountConverter(BaseFromLedgerConverter):
         self.lbook_stats = None
         self.start_date = None
         self.beancount = None
+        self.account_type_map = {
+            "ROOT": "Equity",
+            "BANK": "Assets",
+            "EXPENSE": "Expenses",
+            "INCOME": "Income",
+            "LIABILITY": "Liabilities",
+            "EQUITY": "Equity",
+            "ASSET": "Assets",
+        }
+        # beancount account names by ledger account_id
+        self.beancount_names: Dict[str, Optional[str]] = {}
 
     def load(self, input_path: str) -> LedgerBook:
         """
@@ -145,7 +157,7 @@ class LedgerToBeancountConverter(BaseFromLedgerConverter):
         Returns:
             LedgerBook: the ledger book
         """
-        lbook = LedgerBook.load_from_yaml_file(input_path) # # @UndefinedVariable
+        lbook = LedgerBook.load_streaming(input_path)  # # @UndefinedVariable
         self.set_source(lbook)
         return lbook
 
@@ -164,10 +176,11 @@ class LedgerToBeancountConverter(BaseFromLedgerConverter):
         """
         self.lbook = self.source
         self.lbook_stats = self.lbook.get_stats()
-        self.start_date = self.lbook.get_stats().start_date or DateUtils.iso_date(
+        self.start_date = self.lbook_stats.start_date or DateUtils.iso_date(
             datetime.now()
         )
         self.beancount = Beancount()
+        self.beancount_names = {}
 
         for account in self.lbook.accounts.values():
             self.beancount.add_entry(self.convert_account(account))
@@ -193,21 +206,16 @@ class LedgerToBeancountConverter(BaseFromLedgerConverter):
         """
         get the beancount name for the ledger account name
         """
-        self.account_type_map = {
-            "ROOT": "Equity",
-            "BANK": "Assets",
-            "EXPENSE": "Expenses",
-            "INCOME": "Income",
-            "LIABILITY": "Liabilities",
-            "EQUITY": "Equity",
-            "ASSET": "Assets",
-        }
+        if account.account_id in self.beancount_names:
+            return self.beancount_names[account.account_id]
         prefix = self.account_type_map.get(account.account_type, "Expenses")
         fq_name = self.lbook.fq_account_name(account)
         fq_name = self.beancount.sanitize_account_name(fq_name)
         if fq_name in self.account_type_map.keys():
-            return None
-        beancount_account_name = f"{prefix}:{fq_name}"
+            beancount_account_name = None
+        else:
+            beancount_account_name = f"{prefix}:{fq_name}"
+        self.beancount_names[account.account_id] = beancount_account_name
         return beancount_account_name
 
     def convert_account(self, account: LedgerAccount) -> Optional[data.Open]:
@@ -244,7 +252,7 @@ class LedgerToBeancountConverter(BaseFromLedgerConverter):
         Returns:
             Optional[data.Transaction]: The Beancount Transaction directive, or None if conversion fails.
         """
-        date=None
+        date = None
         if transaction.isodate:
             date = DateUtils.parse_date(transaction.isodate)
         if date is None:
@@ -262,9 +270,12 @@ class LedgerToBeancountConverter(BaseFromLedgerConverter):
                 continue
             split_account = self.lbook.accounts[split.account_id]
             beancount_account_name = self.get_beancount_name_for_account(split_account)
-            postings.append(
-                (beancount_account_name, split.amount, split_account.currency or "EUR")
-            )
+            currency = split_account.currency or "EUR"
+            amount = None
+            if split.amount is not None:
+                scale = Amount.scale_of_amounts([split.amount], Amount.scale(currency))
+                amount = Amount.to_decimal(Amount.to_minor(split.amount, scale), scale)
+            postings.append((beancount_account_name, amount, currency))
 
         if not postings:
             self.log.log(
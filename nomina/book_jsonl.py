@@ -0,0 +1,341 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import os
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import asdict, fields
+from typing import IO, Any, Dict, Iterator, List, Optional, Tuple
+
+from nomina.book_stream import BookStreamLoader
+from nomina.compressed_file import CompressedFile
+from nomina.ledger import Account, Book, BookListener, Transaction
+
+
+class BookJsonl:
+    """
+    the NOMINA-LEDGER-BOOK-JSONL format: a header line with the book
+    fields and accounts followed by one JSON object per line for each
+    transaction - accounts added later and changes of the book fields
+    are appended as "account" and "book" lines so that a book can be
+    extended without rewriting the file. A later line for an existing
+    transaction id replaces the transaction.
+    """
+
+    file_type = "NOMINA-LEDGER-BOOK-JSONL"
+
+    @classmethod
+    def header_fields(cls, book: Book) -> Dict[str, Any]:
+        """
+        get the header fields of the given book
+        """
+        header = {
+            f.name: getattr(book, f.name)
+            for f in fields(book)
+            if f.name not in ("accounts", "transactions")
+        }
+        header["file_type"] = cls.file_type
+        return header
+
+    @classmethod
+    def transaction_record(
+        cls, transaction_id: str, transaction: Transaction
+    ) -> Dict[str, Any]:
+        """
+        get the JSON record of the given transaction
+        """
+        record = {
+            "transaction_id": transaction_id,
+            "isodate": transaction.isodate,
+            "description": transaction.description,
+            "payee": transaction.payee,
+            "memo": transaction.memo,
+            "splits": [
+                (
+                    None
+                    if split is None
+                    else {
+                        "amount": split.amount,
+                        "account_id": split.account_id,
+                        "memo": split.memo,
+                        "reconciled": split.reconciled,
+                    }
+                )
+                for split in transaction.splits
+            ],
+        }
+        return record
+
+    @classmethod
+    def parse_line(cls, line: bytes) -> Optional[Tuple]:
+        """
+        parse the given line
+
+        Args:
+            line (bytes): the JSON line
+
+        Returns:
+            Optional[Tuple]: ("header", fields, accounts), ("book", fields),
+            ("account", Account) or ("transaction", transaction_id, Transaction) -
+            None for blank lines
+        """
+        line = line.strip()
+        if not line:
+            return None
+        record = json.loads(line)
+        if "file_type" in record:
+            accounts = [Account(**a) for a in record.pop("accounts", [])]
+            entry = ("header", record, accounts)
+        elif "book" in record:
+            entry = ("book", record["book"])
+        elif "account" in record:
+            entry = ("account", Account(**record["account"]))
+        else:
+            transaction = BookStreamLoader.to_transaction(record)
+            entry = ("transaction", record["transaction_id"], transaction)
+        return entry
+
+    @classmethod
+    def parse_chunk(cls, file_path: str, start: int, end: int) -> List[Tuple]:
+        """
+        parse the lines of the given byte range of a file - the range
+        must start and end at line boundaries
+
+        Args:
+            file_path (str): the path of the JSONL file
+            start (int): the offset of the first byte
+            end (int): the offset after the last byte
+
+        Returns:
+            List[Tuple]: the parsed entries
+        """
+        with open(file_path, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start)
+        entries = []
+        for line in data.splitlines():
+            entry = cls.parse_line(line)
+            if entry is not None:
+                entries.append(entry)
+        return entries
+
+    @classmethod
+    def chunk_ranges(cls, file_path: str, chunks: int) -> List[Tuple[int, int]]:
+        """
+        split the given file into byte ranges aligned to line boundaries
+
+        Args:
+            file_path (str): the path of the JSONL file
+            chunks (int): the number of ranges to aim for
+
+        Returns:
+            List[Tuple[int, int]]: the start and end offsets of the ranges
+        """
+        size = os.path.getsize(file_path)
+        offsets = [0]
+        with open(file_path, "rb") as file:
+            for i in range(1, chunks):
+                position = max(size * i // chunks, offsets[-1])
+                file.seek(position)
+                file.readline()
+                offset = file.tell()
+                if offset >= size:
+                    break
+                if offset > offsets[-1]:
+                    offsets.append(offset)
+        offsets.append(size)
+        ranges = list(zip(offsets[:-1], offsets[1:]))
+        return ranges
+
+    @classmethod
+    def iter_entries(cls, file_path: str, workers: int = 1) -> Iterator[Tuple]:
+        """
+        iterate over the parsed entries of the given file in file order
+
+        Args:
+            file_path (str): the path of the JSONL file
+            workers (int): the number of processes for parsing chunks in parallel -
+                1 parses the file sequentially as a stream as do compressed files
+
+        Yields:
+            Tuple: the parsed entries
+        """
+        if workers and workers > 1 and not CompressedFile.is_compressed(file_path):
+            ranges = cls.chunk_ranges(file_path, workers * 4)
+            with ProcessPoolExecutor(max_workers=workers) as executor:
+                futures = [
+                    executor.submit(cls.parse_chunk, file_path, start, end)
+                    for start, end in ranges
+                ]
+                for future in futures:
+                    yield from future.result()
+        else:
+            with CompressedFile.open(file_path, "rb") as file:
+                for line in file:
+                    entry = cls.parse_line(line)
+                    if entry is not None:
+                        yield entry
+
+    @classmethod
+    def load(cls, file_path: str, workers: int = 1) -> Book:
+        """
+        load a Book from the given JSONL file
+
+        Args:
+            file_path (str): the path of the JSONL file
+            workers (int): the number of processes for parsing chunks in parallel
+
+        Returns:
+            Book: the loaded book
+        """
+        book = Book()
+        book_fields = {f.name for f in fields(book)}
+        for entry in cls.iter_entries(file_path, workers):
+            kind = entry[0]
+            if kind == "transaction":
+                book.transactions[entry[1]] = entry[2]
+            elif kind == "account":
+                book.add_account(entry[1])
+            elif kind in ("header", "book"):
+                for key, value in entry[1].items():
+                    if key in book_fields and key != "file_type":
+                        setattr(book, key, value)
+                if kind == "header":
+                    for account in entry[2]:
+                        book.add_account(account)
+        book.touch()
+        return book
+
+    @classmethod
+    def save(cls, book: Book, file_path: str):
+        """
+        save the given book as a JSONL file
+
+        Args:
+            book (Book): the book to save
+            file_path (str): the path of the JSONL file
+        """
+        with BookJsonlWriter.open(file_path) as writer:
+            writer.write_book(book)
+
+
+class BookJsonlWriter(BookListener):
+    """
+    incremental writer of a NOMINA-LEDGER-BOOK-JSONL file - as a Book listener
+    the accounts and transactions are written while the book is being converted
+    """
+
+    def __init__(self, stream: IO[str], header_written: bool = False):
+        """
+        constructor
+
+        Args:
+            stream (IO[str]): the output stream
+            header_written (bool): True if the stream already has a header e.g. when appending
+        """
+        self.stream = stream
+        self.header_written = header_written
+        self.header: Optional[Dict[str, Any]] = None
+        # True if accounts or transactions have been written as they were added
+        self.streamed = False
+
+    @classmethod
+    def open(cls, file_path: str, append: bool = False) -> "BookJsonlWriter":
+        """
+        open a writer for the given file
+
+        Args:
+            file_path (str): the path of the JSONL file
+            append (bool): if True append to an existing file without rewriting it
+
+        Returns:
+            BookJsonlWriter: the writer
+        """
+        append = append and os.path.exists(file_path) and os.path.getsize(file_path) > 0
+        stream = CompressedFile.open(file_path, "a" if append else "w")
+        writer = cls(stream, header_written=append)
+        return writer
+
+    def __enter__(self) -> "BookJsonlWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        close the output stream
+        """
+        self.stream.close()
+
+    def _write(self, record: Dict[str, Any]):
+        self.stream.write(json.dumps(record, ensure_ascii=False))
+        self.stream.write("\n")
+
+    def write_header(self, book: Book):
+        """
+        write the header line with the book fields and the current accounts
+        """
+        self.header = BookJsonl.header_fields(book)
+        record = dict(self.header)
+        record["accounts"] = [asdict(account) for account in book.accounts.values()]
+        self._write(record)
+        self.header_written = True
+
+    def write_account(self, account: Account):
+        """
+        write an account line
+        """
+        self._write({"account": asdict(account)})
+
+    def write_transaction(self, transaction_id: str, transaction: Transaction):
+        """
+        write a transaction line
+        """
+        self._write(BookJsonl.transaction_record(transaction_id, transaction))
+
+    def write_book(self, book: Book):
+        """
+        write the complete given book
+        """
+        if self.header_written:
+            self.write_fields(book)
+            for account in book.accounts.values():
+                self.write_account(account)
+        else:
+            self.write_header(book)
+        for transaction_id, transaction in book.transactions.items():
+            self.write_transaction(transaction_id, transaction)
+
+    def write_fields(self, book: Book):
+        """
+        write a book line if the book fields changed since the header
+        """
+        header = BookJsonl.header_fields(book)
+        if header != self.header:
+            self._write({"book": header})
+            self.header = header
+
+    def on_account(self, book: Book, account: Account):
+        self.streamed = True
+        if not self.header_written:
+            # the header includes the account
+            self.write_header(book)
+        else:
+            self.write_account(account)
+
+    def on_transaction(self, book: Book, transaction_id: str, transaction: Transaction):
+        self.streamed = True
+        if not self.header_written:
+            self.write_header(book)
+        self.write_transaction(transaction_id, transaction)
+
+    def on_finished(self, book: Book):
+        if not self.streamed:
+            # the book was not built via add_account/add_transaction
+            self.write_book(book)
+        else:
+            self.write_fields(book)
@@ -0,0 +1,457 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import mmap
+import struct
+from dataclasses import asdict, fields
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+from nomina.amount import Amount
+from nomina.date_utils import DateUtils
+from nomina.ledger import Account, Book, Split, Transaction
+from nomina.split_store import SplitStore, StringTable
+
+
+class SnapshotStrings:
+    """
+    the string table of a snapshot: NUL separated UTF-8 strings with byte offsets
+    """
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.codes: Dict[str, int] = {}
+        self.strings: List[str] = []
+
+    def intern(self, value: Optional[str]) -> int:
+        """
+        get the code of the given string adding it to the table if need be
+
+        Args:
+            value (str): the string
+
+        Returns:
+            int: the code or -1 for None
+        """
+        if value is None:
+            return -1
+        code = self.codes.get(value)
+        if code is None:
+            if "\0" in value:
+                raise ValueError(f"NUL character in string {value!r}")
+            code = len(self.strings)
+            self.codes[value] = code
+            self.strings.append(value)
+        return code
+
+    def to_columns(self) -> Dict[str, np.ndarray]:
+        """
+        get the string data and offsets columns
+        """
+        encoded = [s.encode("utf-8") for s in self.strings]
+        lengths = np.array([len(e) + 1 for e in encoded], dtype=np.int64)
+        offsets = np.concatenate(([0], np.cumsum(lengths))).astype(np.int64)
+        data = np.frombuffer(b"".join(e + b"\0" for e in encoded), dtype=np.uint8)
+        return {"string_offsets": offsets, "string_data": data}
+
+
+class BookSnapshot:
+    """
+    binary snapshot of a ledger Book with fixed-width column blocks and a string table
+    that is opened via mmap and used without parsing
+
+    layout: the magic line, the little endian uint64 length of a JSON header
+    with the book fields, accounts, the scale of the split amounts and the
+    column directory followed by the 8 byte aligned column blocks.
+    The split amounts are exact int64 minor units as in the SplitStore at the scale
+    of the book that represents every amount exactly.
+    """
+
+    magic = b"NOMINA-LEDGER-BOOK-BIN 2\n"
+    alignment = 8
+    # split flags
+    RECONCILED = 1
+    NONE_SPLIT = 2
+    NONE_AMOUNT = 4
+
+    def __init__(self, header: Dict[str, Any], columns: Dict[str, np.ndarray]):
+        """
+        constructor
+
+        Args:
+            header (Dict[str, Any]): the decoded JSON header
+            columns (Dict[str, np.ndarray]): the column arrays
+        """
+        self.header = header
+        self.columns = columns
+        self.mmap = None
+        self._strings = None
+
+    @classmethod
+    def from_book(cls, book: Book) -> "BookSnapshot":
+        """
+        create a snapshot of the given book
+
+        Args:
+            book (Book): the ledger book
+
+        Returns:
+            BookSnapshot: the snapshot
+        """
+        strings = SnapshotStrings()
+        scale = book.get_scale()
+        account_index = {account_id: i for i, account_id in enumerate(book.accounts)}
+        tx_id_idx = []
+        tx_isodate_idx = []
+        tx_description_idx = []
+        tx_payee_idx = []
+        tx_memo_idx = []
+        tx_split_start = [0]
+        split_amount = []
+        split_account_idx = []
+        split_memo_idx = []
+        split_flags = []
+        unknown_accounts = {}
+        for transaction_id, tx in book.transactions.items():
+            tx_id_idx.append(strings.intern(transaction_id))
+            tx_isodate_idx.append(strings.intern(tx.isodate))
+            tx_description_idx.append(strings.intern(tx.description))
+            tx_payee_idx.append(strings.intern(tx.payee))
+            tx_memo_idx.append(strings.intern(tx.memo))
+            for split in tx.splits:
+                if split is None:
+                    split_amount.append(0)
+                    split_account_idx.append(-1)
+                    split_memo_idx.append(-1)
+                    split_flags.append(cls.NONE_SPLIT)
+                    continue
+                flags = cls.RECONCILED if split.reconciled else 0
+                if split.amount is None:
+                    flags |= cls.NONE_AMOUNT
+                aidx = account_index.get(split.account_id, -1)
+                if aidx < 0:
+                    unknown_accounts[len(split_account_idx)] = split.account_id
+                minor = Amount.to_minor(split.amount, scale)
+                if (
+                    split.amount is not None
+                    and Amount.from_minor(minor, scale) != split.amount
+                ):
+                    raise ValueError(
+                        f"amount {split.amount!r} can not be stored exactly with scale {scale}"
+                    )
+                split_amount.append(minor)
+                split_account_idx.append(aidx)
+                split_memo_idx.append(strings.intern(split.memo))
+                split_flags.append(flags)
+            tx_split_start.append(len(split_amount))
+        columns = {
+            "tx_id_idx": np.array(tx_id_idx, dtype=np.int32),
+            "tx_isodate_idx": np.array(tx_isodate_idx, dtype=np.int32),
+            "tx_description_idx": np.array(tx_description_idx, dtype=np.int32),
+            "tx_payee_idx": np.array(tx_payee_idx, dtype=np.int32),
+            "tx_memo_idx": np.array(tx_memo_idx, dtype=np.int32),
+            "tx_split_start": np.array(tx_split_start, dtype=np.int64),
+            "split_amount": np.array(split_amount, dtype=np.int64),
+            "split_account_idx": np.array(split_account_idx, dtype=np.int32),
+            "split_memo_idx": np.array(split_memo_idx, dtype=np.int32),
+            "split_flags": np.array(split_flags, dtype=np.uint8),
+        }
+        columns.update(strings.to_columns())
+        header = {
+            "fields": {
+                f.name: getattr(book, f.name)
+                for f in fields(book)
+                if f.name not in ("accounts", "transactions")
+            },
+            "accounts": [asdict(account) for account in book.accounts.values()],
+            "scale": scale,
+            "unknown_accounts": {str(k): v for k, v in unknown_accounts.items()},
+        }
+        snapshot = cls(header, columns)
+        snapshot._strings = strings.strings
+        return snapshot
+
+    def save(self, file_path: str):
+        """
+        save this snapshot to the given file
+
+        Args:
+            file_path (str): the path of the snapshot file
+        """
+        directory = {}
+        offset = 0
+        for name, column in self.columns.items():
+            directory[name] = {
+                "dtype": column.dtype.str,
+                "offset": offset,
+                "count": len(column),
+            }
+            size = column.nbytes
+            offset += size + (-size % self.alignment)
+        header = dict(self.header)
+        header["columns"] = directory
+        header_bytes = json.dumps(header, default=str).encode("utf-8")
+        prefix_len = len(self.magic) + 8 + len(header_bytes)
+        header_bytes += b" " * (-prefix_len % self.alignment)
+        with open(file_path, "wb") as file:
+            file.write(self.magic)
+            file.write(struct.pack("<Q", len(header_bytes)))
+            file.write(header_bytes)
+            for column in self.columns.values():
+                data = np.ascontiguousarray(column).tobytes()
+                file.write(data)
+                file.write(b"\0" * (-len(data) % self.alignment))
+
+    @classmethod
+    def open(cls, file_path: str) -> "BookSnapshot":
+        """
+        open the snapshot file with the given path via mmap - the columns
+        are zero-copy views of the mapped file
+
+        Args:
+            file_path (str): the path of the snapshot file
+
+        Returns:
+            BookSnapshot: the snapshot
+        """
+        with open(file_path, "rb") as file:
+            mapped = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+        if mapped[: len(cls.magic)] != cls.magic:
+            mapped.close()
+            raise ValueError(
+                f"{file_path} is not a NOMINA-LEDGER-BOOK-BIN version 2 file"
+            )
+        pos = len(cls.magic)
+        (header_len,) = struct.unpack_from("<Q", mapped, pos)
+        pos += 8
+        header = json.loads(mapped[pos : pos + header_len].decode("utf-8"))
+        data_start = pos + header_len
+        columns = {}
+        for name, entry in header.pop("columns").items():
+            columns[name] = np.frombuffer(
+                mapped,
+                dtype=np.dtype(entry["dtype"]),
+                count=entry["count"],
+                offset=data_start + entry["offset"],
+            )
+        snapshot = cls(header, columns)
+        snapshot.mmap = mapped
+        return snapshot
+
+    @property
+    def strings(self) -> List[str]:
+        """
+        the decoded string table - decoded in bulk on first access
+        """
+        if self._strings is None:
+            data = self.columns["string_data"]
+            if len(data) == 0:
+                self._strings = []
+            else:
+                # the table ends with a NUL separator
+                self._strings = data.tobytes()[:-1].decode("utf-8").split("\0")
+        return self._strings
+
+    def get_string(self, code: int) -> Optional[str]:
+        """
+        get a single string without decoding the whole table
+
+        Args:
+            code (int): the code of the string
+
+        Returns:
+            Optional[str]: the string or None for code -1
+        """
+        if code < 0:
+            return None
+        if self._strings is not None:
+            return self._strings[code]
+        offsets = self.columns["string_offsets"]
+        start = int(offsets[code])
+        end = int(offsets[code + 1]) - 1
+        return self.columns["string_data"][start:end].tobytes().decode("utf-8")
+
+    @property
+    def scale(self) -> int:
+        """
+        the number of decimal places of the minor unit split amounts
+        """
+        return self.header["scale"]
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self.columns["tx_id_idx"])
+
+    @property
+    def split_count(self) -> int:
+        return len(self.columns["split_amount"])
+
+    def get_accounts(self) -> Dict[str, Account]:
+        """
+        get the accounts of the snapshot
+        """
+        accounts = {}
+        for record in self.header["accounts"]:
+            account = Account(**record)
+            accounts[account.account_id] = account
+        return accounts
+
+    def to_book(self, book: Optional[Book] = None) -> Book:
+        """
+        materialize the ledger book
+
+        Args:
+            book (Book): the empty book to fill e.g. with listeners attached -
+                a new book if None
+
+        Returns:
+            Book: the book with all accounts and transactions
+        """
+        if book is None:
+            book = Book(**self.header["fields"])
+        else:
+            for key, value in self.header["fields"].items():
+                setattr(book, key, value)
+        for account in self.get_accounts().values():
+            book.add_account(account)
+        strings = self.strings
+        account_ids = list(book.accounts.keys())
+        unknown_accounts = {
+            int(row): account_id
+            for row, account_id in self.header["unknown_accounts"].items()
+        }
+        c = self.columns
+        # the listeners of the book e.g. of a converter see each transaction
+        listeners = bool(book.listeners)
+        scale = self.scale
+        split_amount = c["split_amount"].tolist()
+        split_account_idx = c["split_account_idx"].tolist()
+        split_memo_idx = c["split_memo_idx"].tolist()
+        split_flags = c["split_flags"].tolist()
+        tx_split_start = c["tx_split_start"].tolist()
+
+        def lookup(code: int) -> Optional[str]:
+            return strings[code] if code >= 0 else None
+
+        for t, (id_idx, date_idx, desc_idx, payee_idx, memo_idx) in enumerate(
+            zip(
+                c["tx_id_idx"].tolist(),
+                c["tx_isodate_idx"].tolist(),
+                c["tx_description_idx"].tolist(),
+                c["tx_payee_idx"].tolist(),
+                c["tx_memo_idx"].tolist(),
+            )
+        ):
+            splits = []
+            for i in range(tx_split_start[t], tx_split_start[t + 1]):
+                flags = split_flags[i]
+                if flags & self.NONE_SPLIT:
+                    splits.append(None)
+                    continue
+                aidx = split_account_idx[i]
+                splits.append(
+                    Split(
+                        amount=(
+                            None
+                            if flags & self.NONE_AMOUNT
+                            else Amount.from_minor(split_amount[i], scale)
+                        ),
+                        account_id=(
+                            account_ids[aidx] if aidx >= 0 else unknown_accounts.get(i)
+                        ),
+                        memo=lookup(split_memo_idx[i]),
+                        reconciled=bool(flags & self.RECONCILED),
+                    )
+                )
+            transaction = Transaction(
+                isodate=lookup(date_idx),
+                description=lookup(desc_idx),
+                splits=splits,
+                payee=lookup(payee_idx),
+                memo=lookup(memo_idx),
+            )
+            if listeners:
+                book.add_transaction(strings[id_idx], transaction)
+            else:
+                book.transactions[strings[id_idx]] = transaction
+        book.touch()
+        return book
+
+    def to_split_store(self) -> SplitStore:
+        """
+        create a columnar split store directly from the snapshot columns
+        without materializing the transactions
+
+        Returns:
+            SplitStore: the split store
+        """
+        accounts = self.get_accounts()
+        strings = self.strings
+        c = self.columns
+        split_minor = c["split_amount"]
+        store = SplitStore(
+            list(accounts.keys()),
+            [strings[code] for code in c["tx_id_idx"].tolist()],
+            scale=self.scale,
+        )
+        # the snapshot string table serves all string columns
+        table = StringTable.of(strings)
+        store.memos = store.payees = store.descriptions = store.isodates = table
+        flags = c["split_flags"]
+        split_counts = np.diff(c["tx_split_start"])
+        # convert each distinct date only once
+        date_codes, date_pos = np.unique(c["tx_isodate_idx"], return_inverse=True)
+        ordinals = np.array(
+            [
+                DateUtils.iso_to_ordinal(strings[code] if code >= 0 else None)
+                for code in date_codes.tolist()
+            ],
+            dtype=np.int32,
+        )
+        store.tx_dates = ordinals[date_pos]
+        store.tx_split_start = c["tx_split_start"]
+        store.tx_payee_idx = c["tx_payee_idx"]
+        store.tx_memo_idx = c["tx_memo_idx"]
+        store.tx_description_idx = c["tx_description_idx"]
+        store.tx_isodate_idx = c["tx_isodate_idx"]
+        store.amounts = split_minor
+        store.account_idx = c["split_account_idx"]
+        store.tx_idx = np.repeat(
+            np.arange(self.transaction_count, dtype=np.int32), split_counts
+        )
+        store.dates = store.tx_dates[store.tx_idx]
+        store.memo_idx = c["split_memo_idx"]
+        store.reconciled = (flags & self.RECONCILED) != 0
+        store.valid = flags & (self.NONE_SPLIT | self.NONE_AMOUNT) == 0
+        store.unknown_account_ids = {
+            int(row): account_id
+            for row, account_id in self.header["unknown_accounts"].items()
+        }
+        return store
+
+    def close(self):
+        """
+        close the memory map - if column views e.g. of a split store are still
+        in use the map is closed as soon as the last view is released
+        """
+        self.columns = {}
+        if self.mmap is not None:
+            try:
+                self.mmap.close()
+            except BufferError:
+                # exported column views keep the map alive
+                pass
+            self.mmap = None
+
+    def __enter__(self) -> "BookSnapshot":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
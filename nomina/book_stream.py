@@ -0,0 +1,373 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from dataclasses import fields
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, Optional, Tuple
+
+import yaml
+from yaml.events import (
+    AliasEvent,
+    DocumentEndEvent,
+    DocumentStartEvent,
+    MappingEndEvent,
+    MappingStartEvent,
+    ScalarEvent,
+    SequenceEndEvent,
+    SequenceStartEvent,
+    StreamEndEvent,
+    StreamStartEvent,
+)
+from yaml.nodes import MappingNode, Node, ScalarNode, SequenceNode
+
+from nomina.compressed_file import CompressedFile
+from nomina.stats import Stats
+
+if TYPE_CHECKING:
+    from nomina.ledger import Book, Transaction
+
+# use the libyaml based parser if available
+Loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+
+
+class BookStreamLoader:
+    """
+    streaming loader for NOMINA-LEDGER-BOOK-YAML files based on YAML events
+
+    the header fields and accounts are loaded eagerly while the transactions
+    are materialized lazily one at a time - transactions outside of a date window
+    are skipped without building them
+    """
+
+    def __init__(self, stream: IO):
+        """
+        constructor
+
+        Args:
+            stream (IO): the YAML text stream to read from
+        """
+        self.loader = Loader(stream)
+        self.anchors: Dict[str, Node] = {}
+        self.book = None
+        # the top level key the parser is positioned at
+        self.pending_key: Optional[str] = None
+        self.header_read = False
+        self.transactions_read = False
+        # True if the end of the top level mapping has been reached
+        self.finished = False
+
+    @classmethod
+    def open(cls, file_path: str) -> "BookStreamLoader":
+        """
+        open a streaming loader for the given - possibly compressed - file
+        """
+        return cls(CompressedFile.open(file_path, "r"))
+
+    def close(self):
+        """
+        close the underlying stream
+        """
+        self.loader.dispose()
+        stream = getattr(self.loader, "stream", None)
+        if stream is not None and hasattr(stream, "close"):
+            stream.close()
+
+    def __enter__(self) -> "BookStreamLoader":
+        return self
+
+    def __exit__(self, *_args):
+        self.close()
+
+    def _compose(self) -> Node:
+        """
+        compose the node starting with the next event
+        """
+        event = self.loader.get_event()
+        if isinstance(event, AliasEvent):
+            return self.anchors[event.anchor]
+        if isinstance(event, ScalarEvent):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = self.loader.resolve(ScalarNode, event.value, event.implicit)
+            node = ScalarNode(
+                tag, event.value, event.start_mark, event.end_mark, style=event.style
+            )
+        elif isinstance(event, SequenceStartEvent):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = self.loader.resolve(SequenceNode, None, event.implicit)
+            node = SequenceNode(tag, [], event.start_mark, None)
+            while not self.loader.check_event(SequenceEndEvent):
+                node.value.append(self._compose())
+            node.end_mark = self.loader.get_event().end_mark
+        elif isinstance(event, MappingStartEvent):
+            tag = event.tag
+            if tag is None or tag == "!":
+                tag = self.loader.resolve(MappingNode, None, event.implicit)
+            node = MappingNode(tag, [], event.start_mark, None)
+            while not self.loader.check_event(MappingEndEvent):
+                key_node = self._compose()
+                value_node = self._compose()
+                node.value.append((key_node, value_node))
+            node.end_mark = self.loader.get_event().end_mark
+        else:
+            raise ValueError(f"unexpected YAML event {event}")
+        if event.anchor is not None:
+            self.anchors[event.anchor] = node
+        return node
+
+    def _construct(self, node: Node) -> Any:
+        """
+        construct the Python value of the given node
+        """
+        value = self.loader.construct_document(node)
+        return value
+
+    @staticmethod
+    def _as_str(value: Any) -> Optional[str]:
+        """
+        convert the given scalar to a string the way the dataclass decoding does
+        e.g. for unquoted YAML dates and numbers
+        """
+        if value is None or isinstance(value, str):
+            return value
+        return str(value)
+
+    def _next_key(self) -> Optional[str]:
+        """
+        get the next top level key or None at the end of the document
+        """
+        if self.loader.check_event(MappingEndEvent):
+            self.loader.get_event()
+            return None
+        return self._construct(self._compose())
+
+    def _skip_to_document(self) -> bool:
+        """
+        skip to the top level mapping of the document
+
+        Returns:
+            bool: False if the stream is empty
+        """
+        while self.loader.check_event(StreamStartEvent, DocumentStartEvent):
+            self.loader.get_event()
+        if self.loader.check_event(StreamEndEvent, DocumentEndEvent):
+            return False
+        if not self.loader.check_event(MappingStartEvent):
+            raise ValueError("NOMINA-LEDGER-BOOK-YAML must be a mapping")
+        self.loader.get_event()
+        return True
+
+    def _read_top_level(self, stop_at_transactions: bool):
+        """
+        read the top level keys into the book
+
+        Args:
+            stop_at_transactions (bool): if True stop when reaching the transactions
+        """
+        from nomina.ledger import Account
+
+        book_fields = {f.name for f in fields(self.book)}
+        account_fields = {f.name for f in fields(Account)}
+        while True:
+            key = self.pending_key if self.pending_key else self._next_key()
+            self.pending_key = None
+            if key is None:
+                self.transactions_read = True
+                self.finished = True
+                break
+            if key == "transactions":
+                if stop_at_transactions:
+                    self.pending_key = key
+                    break
+                for transaction_id, transaction in self._iter_transactions():
+                    self.book.add_transaction(transaction_id, transaction)
+            elif key == "accounts":
+                accounts = self._construct(self._compose()) or {}
+                for account_id, record in accounts.items():
+                    record = {
+                        k: self._as_str(v)
+                        for k, v in record.items()
+                        if k in account_fields
+                    }
+                    record.setdefault("account_id", self._as_str(account_id))
+                    self.book.add_account(Account(**record))
+            elif key in book_fields:
+                setattr(self.book, key, self._as_str(self._construct(self._compose())))
+            else:
+                # skip unknown keys
+                self._compose()
+
+    def read_header(self) -> "Book":
+        """
+        read the header fields and accounts stopping at the transactions
+
+        Returns:
+            Book: the book with its accounts but without transactions
+        """
+        from nomina.ledger import Book
+
+        if not self.header_read:
+            self.book = Book()
+            self.header_read = True
+            if self._skip_to_document():
+                self._read_top_level(stop_at_transactions=True)
+            else:
+                self.transactions_read = True
+                self.finished = True
+        return self.book
+
+    @staticmethod
+    def _isodate_of(node: Node) -> Optional[str]:
+        """
+        get the raw isodate scalar of the given transaction node
+        """
+        if isinstance(node, MappingNode):
+            for key_node, value_node in node.value:
+                if key_node.value == "isodate" and isinstance(value_node, ScalarNode):
+                    if value_node.tag.endswith(":null"):
+                        return None
+                    return value_node.value
+        return None
+
+    @staticmethod
+    def to_transaction(record: Dict[str, Any]) -> "Transaction":
+        """
+        create a transaction from the given record without the
+        generic dataclass decoding
+
+        Args:
+            record (Dict[str, Any]): the transaction record as loaded from YAML
+
+        Returns:
+            Transaction: the transaction
+        """
+        from nomina.ledger import Split, Transaction
+
+        as_str = BookStreamLoader._as_str
+        splits = []
+        for split_record in record.get("splits") or []:
+            if split_record is None:
+                splits.append(None)
+            else:
+                amount = split_record.get("amount")
+                splits.append(
+                    Split(
+                        amount=None if amount is None else float(amount),
+                        account_id=as_str(split_record.get("account_id")),
+                        memo=as_str(split_record.get("memo", "")),
+                        reconciled=split_record.get("reconciled", False),
+                    )
+                )
+        transaction = Transaction(
+            isodate=as_str(record.get("isodate")),
+            description=as_str(record.get("description")),
+            splits=splits,
+            payee=as_str(record.get("payee")),
+            memo=as_str(record.get("memo", "")),
+        )
+        return transaction
+
+    def _iter_transactions(
+        self, start_date: str = None, end_date: str = None
+    ) -> Iterator[Tuple[str, "Transaction"]]:
+        """
+        iterate over the transactions mapping at the current position
+        """
+        event = self.loader.get_event()
+        if not isinstance(event, MappingStartEvent):
+            # e.g. an empty transactions entry
+            return
+        while not self.loader.check_event(MappingEndEvent):
+            transaction_id = self._construct(self._compose())
+            node = self._compose()
+            if start_date or end_date:
+                isodate = self._isodate_of(node)
+                date_key = isodate[:10] if isodate else None
+                if date_key is None:
+                    continue
+                if start_date and date_key < start_date:
+                    continue
+                if end_date and date_key > end_date:
+                    continue
+            record = self._construct(node) or {}
+            yield str(transaction_id), self.to_transaction(record)
+        self.loader.get_event()
+
+    def iter_transactions(
+        self, start_date: str = None, end_date: str = None
+    ) -> Iterator[Tuple[str, "Transaction"]]:
+        """
+        lazily iterate over the transactions - the caller may stop at any time
+
+        Args:
+            start_date (str): the optional start date in 'YYYY-MM-DD' format
+            end_date (str): the optional end date in 'YYYY-MM-DD' format
+
+        Yields:
+            Tuple[str, Transaction]: the transaction id and transaction
+            of the dated transactions within the window or of all
+            transactions if no window is given
+        """
+        self.read_header()
+        if self.transactions_read:
+            return
+        self.pending_key = None
+        self.transactions_read = True
+        yield from self._iter_transactions(start_date, end_date)
+
+    def load(self, start_date: str = None, end_date: str = None) -> "Book":
+        """
+        load the book
+
+        Args:
+            start_date (str): the optional start date in 'YYYY-MM-DD' format
+            end_date (str): the optional end date in 'YYYY-MM-DD' format
+
+        Returns:
+            Book: the book with the transactions within the window
+        """
+        book = self.read_header()
+        for transaction_id, transaction in self.iter_transactions(start_date, end_date):
+            book.add_transaction(transaction_id, transaction)
+        if not self.finished:
+            # keys after the transactions
+            self._read_top_level(stop_at_transactions=False)
+        return book
+
+    def scan_stats(self) -> Stats:
+        """
+        get the statistics of the book by only scanning the transaction dates
+        without building the transactions
+
+        Returns:
+            Stats: the statistics
+        """
+        book = self.read_header()
+        count = 0
+        min_date = max_date = None
+        if not self.transactions_read:
+            self.pending_key = None
+            self.transactions_read = True
+            if self.loader.check_event(MappingStartEvent):
+                self.loader.get_event()
+                while not self.loader.check_event(MappingEndEvent):
+                    self._compose()
+                    isodate = self._isodate_of(self._compose())
+                    count += 1
+                    if isodate:
+                        date_key = isodate[:10]
+                        if min_date is None or date_key < min_date:
+                            min_date = date_key
+                        if max_date is None or date_key > max_date:
+                            max_date = date_key
+                self.loader.get_event()
+            else:
+                self._compose()
+        stats = book.calc_stats()
+        stats.transactions = count
+        stats.start_date = min_date
+        stats.end_date = max_date
+        return stats
@@ -51,7 +51,7 @@ class BookView:
                     return
 
                 if self.file_format.acronym == "LB-YAML":
-                    self.book = LedgerBook.load_from_yaml_file(self.file_path)
+                    self.book = LedgerBook.load_streaming(self.file_path)
                 elif self.file_format.acronym == "BEAN":
                     bc2lg = BeancountToLedgerConverter()
                     _beancount = bc2lg.load(self.file_path)
@@ -9,13 +9,13 @@ import json
 import os
 from collections import Counter
 from dataclasses import dataclass, field
-from datetime import datetime
 from typing import Dict, List, Optional
 
-from dacite import from_dict
 from basemkit.yamlable import lod_storable
+from dacite import from_dict
 from tabulate import tabulate
 
+from nomina.date_utils import DateUtils
 from nomina.stats import Stats
 
 
@@ -132,11 +132,10 @@ class Book:
         Returns:
             Stats: An object containing various statistics about the Book.
         """
-        dates = [
-            datetime.strptime(tx.BookgDt, "%Y-%m-%d")
-            for tx in self.transactions
-            if tx.BookgDt
-        ]
+        iso_dates = DateUtils.parse_dates(
+            [tx.BookgDt for tx in self.transactions], ["%Y-%m-%d"]
+        )
+        dates = [iso_date for iso_date in iso_dates if iso_date]
 
         currencies = {}
         categories = set()
@@ -148,8 +147,8 @@ class Book:
         return Stats(
             accounts=len(self.accounts),
             transactions=len(self.batches),
-            start_date=min(dates).strftime("%Y-%m-%d") if dates else None,
-            end_date=max(dates).strftime("%Y-%m-%d") if dates else None,
+            start_date=min(dates) if dates else None,
+            end_date=max(dates) if dates else None,
             categories=len(categories),
             currencies=currencies,
             other={"name": self.name, "owner": self.owner},
@@ -8,6 +8,7 @@ import re
 from pathlib import Path
 from typing import List
 
+from nomina.amount import Amount
 from nomina.bzv import Account
 from nomina.bzv import Book as BzvBook
 from nomina.bzv import Transaction as BzvTransaction
@@ -75,7 +76,10 @@ class BankingZVToLedgerConverter(BaseToLedgerConverter):
         """
         create the ledger split
         """
-        amount = float(transaction.Amt)
+        # parse the decimal string exactly instead of via float
+        scale = Amount.scale(transaction.AmtCcy)
+        minor, _amount_float = Amount.parse(str(transaction.Amt), scale)
+        amount = Amount.from_minor(minor, scale)
         # CRDT or DBIT?
         if transaction.CdtDbtInd == "DBIT":
             amount = -amount
@@ -138,13 +142,13 @@ class BankingZVToLedgerConverter(BaseToLedgerConverter):
         """
         convert my Banking ZV book to a ledger book
         """
-        ledger_book = LedgerBook(
+        ledger_book = self.new_book(
             owner=self.bzv_book.owner, url=self.bzv_book.url, name=self.bzv_book.name
         )
 
         for bzv_account in self.bzv_book.accounts.values():
             ledger_account = self.create_ledger_account(bzv_account)
-            ledger_book.accounts[ledger_account.account_id] = ledger_account
+            ledger_book.add_account(ledger_account)
 
         # Process all batches (including single-transaction "batches")
         for batch_id, batch_transactions in self.bzv_book.batches.items():
@@ -152,7 +156,7 @@ class BankingZVToLedgerConverter(BaseToLedgerConverter):
                 batch_id, batch_transactions
             )
             transaction_id = f"{ledger_transaction.isodate}:{batch_id}"
-            ledger_book.transactions[transaction_id] = ledger_transaction
+            ledger_book.add_transaction(transaction_id, ledger_transaction)
 
         self.target = ledger_book
         return ledger_book
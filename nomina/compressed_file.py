@@ -0,0 +1,180 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import bz2
+import gzip
+import lzma
+import os
+from dataclasses import dataclass
+from typing import IO, Callable, List, Optional
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - the zstd extra is not installed
+    zstandard = None
+
+
+@dataclass
+class Compression:
+    """
+    a compression codec detected by its magic bytes on read
+    and selected by its file suffix on write
+    """
+
+    name: str
+    suffix: str
+    magic: bytes
+    # open(file_path, mode, encoding=...) function of the codec
+    open_file: Callable[..., IO]
+
+
+def _open_zstd(file_path: str, mode: str, **kwargs) -> IO:
+    """
+    open a zstd file - zstandard is an optional dependency
+    """
+    if zstandard is None:
+        raise ImportError(
+            "zstd compression needs zstandard - install with pip install pynomina[zstd]"
+        )
+    return zstandard.open(file_path, mode, **kwargs)
+
+
+class CompressedFile:
+    """
+    transparent streaming (de)compression of the pyNomina file formats
+    """
+
+    compressions: List[Compression] = [
+        Compression("gzip", ".gz", b"\x1f\x8b", gzip.open),
+        Compression("bz2", ".bz2", b"BZh", bz2.open),
+        Compression("xz", ".xz", b"\xfd7zXZ\x00", lzma.open),
+        Compression("zstd", ".zst", b"\x28\xb5\x2f\xfd", _open_zstd),
+    ]
+
+    @classmethod
+    def sniff(cls, head: bytes) -> Optional[Compression]:
+        """
+        get the compression of the given leading bytes
+
+        Args:
+            head (bytes): the first bytes of a file
+
+        Returns:
+            Optional[Compression]: the compression or None for uncompressed content
+        """
+        for compression in cls.compressions:
+            if head.startswith(compression.magic):
+                return compression
+        return None
+
+    @classmethod
+    def detect(cls, file_path: str) -> Optional[Compression]:
+        """
+        detect the compression of the given file by its magic bytes
+
+        Args:
+            file_path (str): the path of the file
+
+        Returns:
+            Optional[Compression]: the compression or None for uncompressed files
+        """
+        with open(file_path, "rb") as file:
+            head = file.read(6)
+        return cls.sniff(head)
+
+    @classmethod
+    def by_suffix(cls, file_path: str) -> Optional[Compression]:
+        """
+        get the compression selected by the suffix of the given file name
+
+        Args:
+            file_path (str): the path of the file e.g. 'book.yaml.gz'
+
+        Returns:
+            Optional[Compression]: the compression or None for uncompressed files
+        """
+        _name, suffix = os.path.splitext(str(file_path))
+        for compression in cls.compressions:
+            if suffix.lower() == compression.suffix:
+                return compression
+        return None
+
+    @classmethod
+    def strip_suffix(cls, file_path: str) -> str:
+        """
+        remove a compression suffix from the given file name
+
+        Args:
+            file_path (str): the path of the file e.g. 'book.yaml.gz'
+
+        Returns:
+            str: the path without compression suffix e.g. 'book.yaml'
+        """
+        file_path = str(file_path)
+        if cls.by_suffix(file_path):
+            file_path, _suffix = os.path.splitext(file_path)
+        return file_path
+
+    @classmethod
+    def open(
+        cls,
+        file_path: str,
+        mode: str = "r",
+        encoding: Optional[str] = "utf-8",
+        errors: Optional[str] = None,
+    ) -> IO:
+        """
+        open the given file - compressed files are decompressed on read
+        based on their magic bytes and compressed on write based on their suffix
+
+        Args:
+            file_path (str): the path of the file
+            mode (str): 'r', 'w', 'a' optionally with 'b' for binary streams
+            encoding (str): the encoding of text streams
+            errors (str): the handling of encoding errors of text streams e.g. 'replace'
+
+        Returns:
+            IO: the text or binary stream
+        """
+        if "r" in mode:
+            compression = cls.detect(file_path)
+        else:
+            compression = cls.by_suffix(file_path)
+        binary = "b" in mode
+        if compression is None:
+            if binary:
+                return open(file_path, mode)
+            return open(file_path, mode, encoding=encoding, errors=errors)
+        if binary:
+            return compression.open_file(file_path, mode)
+        # the codecs open binary streams by default
+        text_mode = mode.replace("t", "") + "t"
+        return compression.open_file(
+            file_path, text_mode, encoding=encoding, errors=errors
+        )
+
+    @classmethod
+    def read_text(cls, file_path: str, encoding: str = "utf-8") -> str:
+        """
+        read the complete text of the given possibly compressed file
+
+        Args:
+            file_path (str): the path of the file
+            encoding (str): the encoding of the text
+
+        Returns:
+            str: the text
+        """
+        with cls.open(file_path, "r", encoding=encoding) as file:
+            text = file.read()
+        return text
+
+    @classmethod
+    def is_compressed(cls, file_path: str) -> bool:
+        """
+        check whether the given file is compressed
+        """
+        return cls.detect(file_path) is not None
@@ -5,19 +5,29 @@ Created on 2024-10-06
 """
 
 from pathlib import Path
-from typing import Dict, Type
+from typing import Any, Dict, Type
 
 from nomina.beancount_ledger import (
     BeancountToLedgerConverter,
     LedgerToBeancountConverter,
 )
 from nomina.bzv_ledger import BankingZVToLedgerConverter
+from nomina.compressed_file import CompressedFile
 from nomina.file_formats import AccountingFileFormats
-from nomina.gnc_ledger import GnuCashToLedgerConverter, LedgerToGnuCashConverter
+from nomina.gnc_ledger import (
+    GnuCashSqliteToLedgerConverter,
+    GnuCashToLedgerConverter,
+    LedgerToGnuCashConverter,
+    LedgerToGnuCashSqliteConverter,
+)
+from nomina.jsonl_ledger import JsonlToLedgerConverter, LedgerToJsonlConverter
 from nomina.ledger import Book
 from nomina.msmoney_ledger import MicrosoftMoneyToLedgerConverter
 from nomina.nomina_converter import BaseFromLedgerConverter, BaseToLedgerConverter
-from nomina.qif_ledger import QifToLedgerConverter
+from nomina.parquet_ledger import LedgerToParquetConverter, ParquetToLedgerConverter
+from nomina.qif_ledger import LedgerToQifConverter, QifToLedgerConverter
+from nomina.snapshot_ledger import LedgerToSnapshotConverter, SnapshotToLedgerConverter
+from nomina.sqlite_ledger import LedgerToSqliteConverter, SqliteToLedgerConverter
 
 
 class Converter:
@@ -30,16 +40,27 @@ class Converter:
         self.detector = AccountingFileFormats()
         self.to_ledger: Dict[str, Type[BaseToLedgerConverter]] = {
             "GC-XML": GnuCashToLedgerConverter,
+            "GC-SQLITE": GnuCashSqliteToLedgerConverter,
             "QIF": QifToLedgerConverter,
             "BEAN": BeancountToLedgerConverter,
             "BZV-YAML": BankingZVToLedgerConverter,
             "MONEY": MicrosoftMoneyToLedgerConverter,
             "LB-YAML": None,
+            "LB-BIN": SnapshotToLedgerConverter,
+            "LB-SQLITE": SqliteToLedgerConverter,
+            "LB-PARQUET": ParquetToLedgerConverter,
+            "LB-JSONL": JsonlToLedgerConverter,
         }
         self.from_ledger: Dict[str, Type[BaseFromLedgerConverter]] = {
             "GC-XML": LedgerToGnuCashConverter,
+            "GC-SQLITE": LedgerToGnuCashSqliteConverter,
             "BEAN": LedgerToBeancountConverter,
+            "QIF": LedgerToQifConverter,
             "LB-YAML": None,
+            "LB-BIN": LedgerToSnapshotConverter,
+            "LB-SQLITE": LedgerToSqliteConverter,
+            "LB-PARQUET": LedgerToParquetConverter,
+            "LB-JSONL": LedgerToJsonlConverter,
         }
 
     def convert(self, input_path: Path = None, output_format: str = None) -> None:
@@ -70,26 +91,59 @@ class Converter:
         to_ledger_cls = self.to_ledger[input_format.acronym]
         from_ledger_cls = self.from_ledger[output_format]
 
+        from_ledger = None
+        if from_ledger_cls is not None:
+            from_ledger = from_ledger_cls(debug=self.args.debug)
+        listener = None
+
         # Convert to LedgerBook
         if to_ledger_cls is not None:
-            to_ledger = to_ledger_cls(debug=self.args.debug)
-            ledger_book = to_ledger.convert_to_ledger(input_path)
+            to_ledger = to_ledger_cls(
+                debug=self.args.debug, **self.to_ledger_options(input_format.acronym)
+            )
+            if from_ledger is not None:
+                # streamable output formats are written while converting
+                listener = from_ledger.open_listener(self.args.output)
+                if listener is not None:
+                    to_ledger.add_listener(listener)
+            try:
+                ledger_book = to_ledger.convert_to_ledger(input_path)
+            finally:
+                if listener is not None:
+                    listener.close()
         else:
             # If input is already LedgerBook, just load it
-            ledger_book = Book.load_from_yaml_file(input_path)
+            ledger_book = Book.load_streaming(input_path)
 
         # Convert from LedgerBook to output format
-        if from_ledger_cls is not None:
-            from_ledger = from_ledger_cls(debug=self.args.debug)
-            _target_object = from_ledger.convert_from_ledger(ledger_book)
-            output_text = from_ledger.to_text()
+        if listener is not None:
+            # already written
             pass
+        elif from_ledger is not None:
+            _target_object = from_ledger.convert_from_ledger(ledger_book)
+            from_ledger.save(self.args.output)
         else:
-            # target is a LedgerBook get the XML markup
+            # target is a LedgerBook get the YAML markup
             output_text = ledger_book.to_yaml()
-        output_stream = self.args.output.open("w")
-        output_stream.write(output_text)
-        output_stream.close()
+            with CompressedFile.open(self.args.output, "w") as output_stream:
+                output_stream.write(output_text)
+
+    def to_ledger_options(self, acronym: str) -> Dict[str, Any]:
+        """
+        get the command line options of the converter for the given input format
+
+        Args:
+            acronym (str): the acronym of the input format
+
+        Returns:
+            Dict[str, Any]: the keyword arguments for the converter constructor
+        """
+        options = {}
+        if acronym == "QIF":
+            options["merge_transfers"] = getattr(self.args, "merge_transfers", False)
+        if acronym in ("QIF", "LB-JSONL"):
+            options["workers"] = getattr(self.args, "workers", 1)
+        return options
 
     def get_supported_formats(self) -> Dict[str, list]:
         """
@@ -4,8 +4,12 @@ Created on 2024-10-02
 @author: wf
 """
 
-from datetime import datetime, timedelta
-from typing import List, Optional, Tuple
+import re
+from collections import Counter
+from datetime import date, datetime, timedelta
+from functools import lru_cache
+from itertools import islice
+from typing import Dict, Iterable, List, Optional, Pattern, Tuple
 
 
 class DateUtils:
@@ -26,6 +30,163 @@ class DateUtils:
         """
         return date.strftime("%Y-%m-%d")
 
+    @staticmethod
+    def format_date(isodate: Optional[str], date_format: str) -> Optional[str]:
+        """
+        Format the date part of an ISO date string with the given format.
+
+        Args:
+            isodate (str): The date e.g. '2024-10-06' or '2024-10-06 10:59:00 +0000'.
+            date_format (str): The strftime format e.g. '%d/%m/%Y'.
+
+        Returns:
+            Optional[str]: The formatted date without time or None if no date is given.
+        """
+        if not isodate:
+            return None
+        return date.fromisoformat(isodate[:10]).strftime(date_format)
+
+    @staticmethod
+    def iso_to_ordinal(isodate: Optional[str]) -> int:
+        """
+        Convert an ISO date string (optionally followed by a time part) to a proleptic
+        Gregorian ordinal.
+
+        Args:
+            isodate (str): The date in 'YYYY-MM-DD' format, e.g. '2024-10-06' or '2024-10-06 00:00:00 +0000'.
+
+        Returns:
+            int: The day ordinal or 0 if no date is given.
+        """
+        if not isodate:
+            return 0
+        return date.fromisoformat(isodate.split()[0]).toordinal()
+
+    @staticmethod
+    def ordinal_to_iso(ordinal: int) -> Optional[str]:
+        """
+        Convert a proleptic Gregorian ordinal back to an ISO date string.
+
+        Args:
+            ordinal (int): The day ordinal - 0 means no date.
+
+        Returns:
+            Optional[str]: The date in 'YYYY-MM-DD' format or None.
+        """
+        if not ordinal:
+            return None
+        return date.fromordinal(int(ordinal)).isoformat()
+
+    # the formats tried by parse_date in order
+    default_formats: Tuple[str, ...] = (
+        # "%m.%d.%y",
+        "%d.%m.%y",
+        # "%m/%d/%y",
+        "%d/%m/%y",
+        "%d/%m/%Y",  # 23/10/2013
+        "%Y-%m-%d",
+        "%Y/%m/%d",
+        "%Y-%m-%d %H:%M:%S %z",  # Added to handle the GnuCash XML format
+        "%m/%d/%y %H:%M:%S",  # Microsoft Money
+    )
+
+    # the regular expressions of the strptime directives supported by the fast path
+    directive_patterns: Dict[str, str] = {
+        "d": r"(?P<d>3[01]|[12]\d|0[1-9]|[1-9]| [1-9])",
+        "m": r"(?P<m>1[0-2]|0[1-9]|[1-9])",
+        "y": r"(?P<y>\d\d)",
+        "Y": r"(?P<Y>\d\d\d\d)",
+        "H": r"(?:2[0-3]|[0-1]\d|\d)",
+        "M": r"(?:[0-5]\d|\d)",
+        "S": r"(?:6[0-1]|[0-5]\d|\d)",
+        "z": r"(?:[+-]\d\d:?[0-5]\d(?::?[0-5]\d(?:\.\d{1,6})?)?|(?-i:Z))",
+    }
+
+    # compiled patterns by date format - None if the format needs strptime
+    _compiled: Dict[str, Optional[Pattern]] = {}
+
+    @classmethod
+    def compile_format(cls, date_format: str) -> Optional[Pattern]:
+        """
+        compile the given strptime format to a regular expression
+        accepting the same strings as strptime
+
+        Args:
+            date_format (str): the strptime format e.g. '%d.%m.%y'
+
+        Returns:
+            Optional[Pattern]: the compiled pattern or None if the format
+            has directives not supported by the fast path
+        """
+        if date_format in cls._compiled:
+            return cls._compiled[date_format]
+        regex = ""
+        supported = True
+        parts = iter(date_format)
+        for char in parts:
+            if char == "%":
+                directive = next(parts, "")
+                if directive not in cls.directive_patterns:
+                    supported = False
+                    break
+                regex += cls.directive_patterns[directive]
+            elif char.isspace():
+                regex += r"\s+"
+            else:
+                regex += re.escape(char)
+        pattern = re.compile(regex, re.IGNORECASE) if supported else None
+        cls._compiled[date_format] = pattern
+        return pattern
+
+    @classmethod
+    def match_format(cls, date_str: str, date_format: str) -> Optional[str]:
+        """
+        parse the given date string with the given format
+
+        Args:
+            date_str (str): the date string to parse
+            date_format (str): the strptime format
+
+        Returns:
+            Optional[str]: the date in ISO format (YYYY-MM-DD) or None if the format does not match
+        """
+        pattern = cls.compile_format(date_format)
+        if pattern is None:
+            try:
+                return cls.iso_date(datetime.strptime(date_str, date_format))
+            except ValueError:
+                return None
+        match = pattern.fullmatch(date_str)
+        if match is None:
+            return None
+        groups = match.groupdict()
+        if groups.get("Y"):
+            year = int(groups["Y"])
+        elif groups.get("y"):
+            # same pivot as strptime
+            year = int(groups["y"])
+            year += 2000 if year <= 68 else 1900
+        else:
+            year = 1900
+        month = int(groups["m"]) if groups.get("m") else 1
+        day = int(groups["d"]) if groups.get("d") else 1
+        try:
+            return date(year, month, day).isoformat()
+        except ValueError:
+            return None
+
+    @staticmethod
+    @lru_cache(maxsize=65536)
+    def _parse_date_memo(date_str: str, date_formats: Tuple[str, ...]) -> Optional[str]:
+        """
+        memoized parsing of the given date string - bank files repeat dates heavily
+        """
+        for date_format in date_formats:
+            iso_date_str = DateUtils.match_format(date_str, date_format)
+            if iso_date_str is not None:
+                return iso_date_str
+        return None
+
     @classmethod
     def parse_date(
         cls, date_str: str, date_formats: Optional[List[str]] = None
@@ -42,27 +203,74 @@ class DateUtils:
             Optional[str]: The parsed date in ISO format (YYYY-MM-DD) or None if parsing fails.
         """
         if date_formats is None:
-            date_formats = [
-                #"%m.%d.%y",
-                "%d.%m.%y",
-                #"%m/%d/%y",
-                "%d/%m/%y",
-                "%d/%m/%Y", # 23/10/2013
-                "%Y-%m-%d",
-                "%Y/%m/%d",
-                "%Y-%m-%d %H:%M:%S %z",  # Added to handle the GnuCash XML format
-                "%m/%d/%y %H:%M:%S",  # Microsoft Money
-            ]
+            date_formats = cls.default_formats
+        return cls._parse_date_memo(date_str, tuple(date_formats))
 
-        for date_format in date_formats:
-            try:
-                date_obj = datetime.strptime(date_str, date_format)
-                iso_date_str= cls.iso_date(date_obj)
-                return iso_date_str
-            except ValueError:
-                continue
+    @classmethod
+    def sniff_format(
+        cls,
+        date_strs: Iterable[Optional[str]],
+        date_formats: Optional[List[str]] = None,
+        sample_size: int = 100,
+    ) -> Optional[str]:
+        """
+        detect the dominant format of the given date strings from a sample
 
-        return None
+        Args:
+            date_strs (Iterable[Optional[str]]): the date strings e.g. of a file
+            date_formats (List[str], optional): the formats to try - default: default_formats
+            sample_size (int): the number of date strings to sample
+
+        Returns:
+            Optional[str]: the format matching most of the sampled date strings or None
+        """
+        if date_formats is None:
+            date_formats = cls.default_formats
+        counter = Counter()
+        for date_str in islice((d for d in date_strs if d), sample_size):
+            for date_format in date_formats:
+                if cls.match_format(date_str, date_format) is not None:
+                    counter[date_format] += 1
+                    break
+        dominant = counter.most_common(1)[0][0] if counter else None
+        return dominant
+
+    @classmethod
+    def parse_dates(
+        cls,
+        date_strs: List[Optional[str]],
+        date_formats: Optional[List[str]] = None,
+        sample_size: int = 100,
+    ) -> List[Optional[str]]:
+        """
+        parse a whole list of date strings in one call - the dominant format
+        is sniffed from a sample and tried first
+
+        Args:
+            date_strs (List[Optional[str]]): the date strings to parse
+            date_formats (List[str], optional): the formats to try - default: default_formats
+            sample_size (int): the number of date strings to sample for the dominant format
+
+        Returns:
+            List[Optional[str]]: the dates in ISO format (YYYY-MM-DD) - None for empty
+            or unparseable date strings
+        """
+        if date_formats is None:
+            date_formats = cls.default_formats
+        date_formats = tuple(date_formats)
+        dominant = cls.sniff_format(date_strs, date_formats, sample_size)
+        if dominant is not None:
+            date_formats = (dominant,) + tuple(f for f in date_formats if f != dominant)
+        parsed: Dict[str, Optional[str]] = {}
+        iso_dates = []
+        for date_str in date_strs:
+            if not date_str:
+                iso_dates.append(None)
+                continue
+            if date_str not in parsed:
+                parsed[date_str] = cls._parse_date_memo(date_str, date_formats)
+            iso_dates.append(parsed[date_str])
+        return iso_dates
 
     @classmethod
     def split_date_range(
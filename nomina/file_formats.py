@@ -12,6 +12,8 @@ from typing import Dict, List, Optional
 
 import chardet
 
+from nomina.compressed_file import CompressedFile
+
 
 @dataclass
 class AccountingFileFormat:
@@ -26,6 +28,8 @@ class AccountingFileFormat:
     content_pattern: str
     pattern_file: Optional[str] = None
     encoding: str = "utf-8"
+    # leading bytes of binary formats
+    magic: Optional[bytes] = None
 
 
 class AccountingFileFormats:
@@ -56,6 +60,7 @@ class AccountingFileFormats:
                 ext=".gnucash",
                 wikidata_id="Q130445392",
                 content_pattern=r"SQLite format 3",
+                magic=b"SQLite format 3\x00",
             ),
             AccountingFileFormat(
                 name="Microsoft Money - Zipped JSON dumps",
@@ -81,6 +86,38 @@ class AccountingFileFormats:
                 wikidata_id="Q281876",
                 content_pattern=r"file_type:\s*NOMINA-LEDGER-BOOK-YAML",
             ),
+            AccountingFileFormat(
+                name="pyNomina Ledger Book binary snapshot",
+                acronym="LB-BIN",
+                ext=".lbb",
+                wikidata_id="Q281876",
+                content_pattern=r"^NOMINA-LEDGER-BOOK-BIN",
+                magic=b"NOMINA-LEDGER-BOOK-BIN",
+            ),
+            AccountingFileFormat(
+                name="pyNomina Ledger Book SQLite",
+                acronym="LB-SQLITE",
+                ext=".sqlite",
+                wikidata_id="Q281876",
+                content_pattern=r"SQLite format 3",
+                magic=b"SQLite format 3\x00",
+            ),
+            AccountingFileFormat(
+                name="pyNomina Ledger Book Parquet dataset",
+                acronym="LB-PARQUET",
+                ext=".parquet",
+                wikidata_id="Q281876",
+                pattern_file="_nomina_book.parquet",
+                content_pattern=r"^PAR1",
+                magic=b"PAR1",
+            ),
+            AccountingFileFormat(
+                name="pyNomina Ledger Book JSON Lines",
+                acronym="LB-JSONL",
+                ext=".jsonl",
+                wikidata_id="Q281876",
+                content_pattern=r'^\{"file_type":\s*"NOMINA-LEDGER-BOOK-JSONL"',
+            ),
             AccountingFileFormat(
                 name="FinanzmanagerDeluxe",
                 acronym="FMD",
@@ -127,7 +164,9 @@ class AccountingFileFormats:
         """
         _, file_extension = os.path.splitext(file_path)
 
-        if file_extension.lower() == ".zip":
+        if os.path.isdir(file_path):
+            return self._detect_from_directory(file_path)
+        elif file_extension.lower() == ".zip":
             return self._detect_from_zip(file_path)
         else:
             return self._detect_from_regular_file(file_path)
@@ -152,6 +191,20 @@ class AccountingFileFormats:
                         return fformat
         return None
 
+    def _detect_from_directory(self, dir_path: str) -> Optional[AccountingFileFormat]:
+        """
+        Detect a dataset directory format by the magic bytes of its pattern file.
+        """
+        _name, ext = os.path.splitext(str(dir_path).rstrip(os.sep))
+        for fformat in self.formats:
+            if fformat.pattern_file and fformat.magic and ext.lower() == fformat.ext:
+                pattern_path = os.path.join(dir_path, fformat.pattern_file)
+                if os.path.isfile(pattern_path):
+                    with open(pattern_path, "rb") as file:
+                        if file.read(len(fformat.magic)) == fformat.magic:
+                            return fformat
+        return None
+
     def _extract_file_content_from_zip(
         self, zip_file: zipfile.ZipFile, pattern_file: str
     ) -> Optional[str]:
@@ -166,15 +219,24 @@ class AccountingFileFormats:
         self, file_path: str
     ) -> Optional[AccountingFileFormat]:
         """
-        Detect accounting file format from a regular non-zip file.
+        Detect accounting file format from a regular non-zip file -
+        compressed files are detected by their decompressed content
+        and the extension before the compression suffix.
         """
-        with open(file_path, "rb") as file:
+        _name, ext = os.path.splitext(CompressedFile.strip_suffix(file_path))
+        with CompressedFile.open(file_path, "rb") as file:
             raw_data = file.read(10000)  # Read the first 10000 bytes
-            content = self._decode_content(raw_data)
+        # binary formats are detected by their magic bytes
+        for fformat in self.formats:
+            if fformat.magic and ext.lower() == fformat.ext.lower():
+                if raw_data.startswith(fformat.magic):
+                    return fformat
+        content = self._decode_content(raw_data)
 
         if content:
             for fformat in self.formats:
-                _name, ext = os.path.splitext(file_path)
+                if fformat.magic:
+                    continue
                 if ext.lower() == fformat.ext.lower():
                     match = self._match_pattern(content, fformat.content_pattern)
                     if match:
@@ -186,7 +248,8 @@ class AccountingFileFormats:
         Detect the encoding of the raw data and decode it into a string.
         """
         result = chardet.detect(raw_data)
-        encoding = result.get("encoding", "utf-8")
+        # binary content has no detectable encoding
+        encoding = result.get("encoding") or "utf-8"
         try:
             return raw_data.decode(encoding)
         except UnicodeDecodeError:
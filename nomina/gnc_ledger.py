@@ -5,8 +5,10 @@ Created on 2024-10-04
 """
 
 import uuid
+from pathlib import Path
 from typing import Dict
 
+from nomina.amount import Amount
 from nomina.gnucash import (
     Account,
     Book,
@@ -22,6 +24,7 @@ from nomina.gnucash import (
     TsDate,
     Value,
 )
+from nomina.gnucash_sqlite import GnuCashSqlite
 from nomina.ledger import Account as LedgerAccount
 from nomina.ledger import Book as LedgerBook
 from nomina.ledger import Split as LedgerSplit
@@ -74,9 +77,11 @@ class GnuCashToLedgerConverter(BaseToLedgerConverter):
 
     def create_ledger_split(self, gnc_split: Split) -> LedgerSplit:
         """Create a Ledger split from a GnuCash split."""
-        amount = (
-            float(gnc_split.value.split("/")[0]) / 100
-        )  # Convert from cents to float
+        account = self.account_map.get(gnc_split.account.value)
+        scale = Amount.scale(account.currency if account else None)
+        # exact conversion of the num/denom value to minor units
+        minor = Amount.from_fraction(gnc_split.value, scale)
+        amount = Amount.from_minor(minor, scale)
         return LedgerSplit(
             amount=amount,
             account_id=gnc_split.account.value,
@@ -100,12 +105,12 @@ class GnuCashToLedgerConverter(BaseToLedgerConverter):
 
     def convert_to_target(self) -> LedgerBook:
         """Convert the GnuCash V2 structure to a Ledger Book."""
-        ledger_book = LedgerBook()
+        ledger_book = self.new_book()
 
         # Convert accounts
         for gnc_account in self.gnc_v2.book.accounts:
             ledger_account = self.create_ledger_account(gnc_account)
-            ledger_book.accounts[ledger_account.account_id] = ledger_account
+            ledger_book.add_account(ledger_account)
 
         # Convert transactions
         for gnc_transaction in self.gnc_v2.book.transactions:
@@ -114,7 +119,7 @@ class GnuCashToLedgerConverter(BaseToLedgerConverter):
             transaction_id = (
                 f"{ledger_transaction.isodate}:{ledger_transaction.description}"
             )
-            ledger_book.transactions[transaction_id] = ledger_transaction
+            ledger_book.add_transaction(transaction_id, ledger_transaction)
 
         return ledger_book
 
@@ -126,6 +131,111 @@ class GnuCashToLedgerConverter(BaseToLedgerConverter):
         return yaml_str
 
 
+class GnuCashSqliteToLedgerConverter(BaseToLedgerConverter):
+    """
+    Convert a GnuCash SQLite Book to a Ledger Book
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(from_format_acronym="GC-SQLITE", debug=debug)
+        self.gnc_sqlite: GnuCashSqlite = None
+        self.account_map: Dict[str, LedgerAccount] = {}
+
+    def load(self, input_path: str) -> GnuCashSqlite:
+        """
+        open the GnuCash SQLite file - the rows are read while converting
+
+        Args:
+            input_path (str): the path of the GnuCash SQLite file
+
+        Returns:
+            GnuCashSqlite: the opened GnuCash SQLite book
+        """
+        self.gnc_sqlite = GnuCashSqlite(str(input_path))
+        return self.gnc_sqlite
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        stream the accounts and transactions of the GnuCash SQLite book into a Ledger Book
+        """
+        ledger_book = self.new_book()
+        for (
+            guid,
+            name,
+            account_type,
+            description,
+            currency,
+            parent_guid,
+        ) in self.gnc_sqlite.iter_accounts():
+            ledger_account = LedgerAccount(
+                account_id=guid,
+                name=name,
+                account_type=account_type,
+                description=description or "",
+                currency=currency or "EUR",
+                parent_account_id=parent_guid,
+            )
+            self.account_map[guid] = ledger_account
+            ledger_book.add_account(ledger_account)
+        for (
+            tx_guid,
+            post_date,
+            description,
+            fraction,
+            split_rows,
+        ) in self.gnc_sqlite.iter_transactions():
+            # the values are in the transaction currency not the account commodity
+            tx_scale = (
+                Amount.scale_of_denom(fraction) if fraction else Amount.default_scale
+            )
+            splits = []
+            for (
+                account_guid,
+                memo,
+                reconcile_state,
+                value_num,
+                value_denom,
+            ) in split_rows:
+                # a finer value_denom than the currency fraction is kept exactly
+                scale = max(tx_scale, Amount.scale_of_denom(value_denom))
+                minor = Amount.from_num_denom(value_num, value_denom, scale)
+                splits.append(
+                    LedgerSplit(
+                        amount=Amount.from_minor(minor, scale),
+                        account_id=account_guid,
+                        memo=memo or "",
+                        reconciled=reconcile_state == "y",
+                    )
+                )
+            ledger_transaction = LedgerTransaction(
+                isodate=GnuCashSqlite.isodate(post_date),
+                description=description,
+                splits=splits,
+                memo=description,
+            )
+            # the guid is unique other than the date and description
+            ledger_book.add_transaction(tx_guid, ledger_transaction)
+        self.gnc_sqlite.close()
+        return ledger_book
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the target book - the source is closed after converting
+        """
+        if self.debug:
+            self.target.get_stats().show()
+
+    def to_text(self) -> str:
+        """
+        create the output text
+        """
+        yaml_str = self.target.to_yaml()
+        return yaml_str
+
+
 class LedgerToGnuCashConverter(BaseFromLedgerConverter):
     """
     Convert Ledger Book to GnuCash Book
@@ -152,7 +262,7 @@ class LedgerToGnuCashConverter(BaseFromLedgerConverter):
         Returns:
             LedgerBook: the ledger book
         """
-        lbook = LedgerBook.load_from_yaml_file(input_path)
+        lbook = LedgerBook.load_streaming(input_path)
         self.set_source(lbook)
         return lbook
 
@@ -171,7 +281,7 @@ class LedgerToGnuCashConverter(BaseFromLedgerConverter):
             id=Id(type_value="guid", value=self.generate_guid()),
             type=laccount.account_type,
             commodity=Commodity(space="CURRENCY", id=laccount.currency),
-            commodity_scu=100,
+            commodity_scu=10 ** Amount.scale(laccount.currency),
             parent=(
                 Id(
                     type_value="guid",
@@ -193,13 +303,23 @@ class LedgerToGnuCashConverter(BaseFromLedgerConverter):
         split = None
         if lsplit and lsplit.amount:
             if lsplit.account_id in self.account_map:
-                account_id = self.account_map[lsplit.account_id].id.value
+                gnc_account = self.account_map[lsplit.account_id]
+                account_id = gnc_account.id.value
+                # amounts finer than the commodity get a finer denominator
+                value_scale = Amount.scale_of_amounts(
+                    [lsplit.amount], Amount.scale(transaction_currency)
+                )
+                quantity_scale = Amount.scale_of_amounts(
+                    [lsplit.amount], Amount.scale(gnc_account.commodity.id)
+                )
+                value = Amount.to_minor(lsplit.amount, value_scale)
+                quantity = Amount.to_minor(lsplit.amount, quantity_scale)
                 split = Split(
                     id=Id(type_value="guid", value=self.generate_guid()),
                     memo=lsplit.memo,
                     reconciled_state="n",
-                    value=f"{int(lsplit.amount * 100)}/100",
-                    quantity=f"{int(lsplit.amount * 100)}/100",
+                    value=Amount.to_fraction(value, value_scale),
+                    quantity=Amount.to_fraction(quantity, quantity_scale),
                     account=Id(type_value="guid", value=account_id),
                 )
             else:
@@ -274,3 +394,37 @@ class LedgerToGnuCashConverter(BaseFromLedgerConverter):
         """
         xml_string = self.gcxml.to_text(self.target)
         return xml_string
+
+
+class LedgerToGnuCashSqliteConverter(BaseFromLedgerConverter):
+    """
+    Convert a Ledger Book to a GnuCash SQLite Book
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(to_format_acronym="GC-SQLITE", debug=debug)
+
+    def set_source(self, source: LedgerBook):
+        self.source = source
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        the rows are bulk inserted on save
+        """
+        return self.source
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the source book
+        """
+        if self.debug:
+            self.source.get_stats().show()
+
+    def save(self, output_path: Path):
+        """
+        save the Ledger Book as GnuCash SQLite file
+        """
+        GnuCashSqlite.save(self.source, str(output_path))
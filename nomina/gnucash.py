@@ -16,6 +16,7 @@ from xsdata.formats.dataclass.serializers import XmlSerializer
 from xsdata.formats.dataclass.serializers.config import SerializerConfig
 from xsdata.models.datatype import XmlDate
 
+from nomina.compressed_file import CompressedFile
 from nomina.date_utils import DateUtils
 from nomina.stats import Stats
 
@@ -399,16 +400,17 @@ class GncV2:
         """
         Get statistics for the GncV2 object.
         """
-        dates = []
         currency_usage = {}
 
-        # Collect dates and currencies from transactions
+        # Collect dates in one batch and currencies from transactions
+        iso_dates = DateUtils.parse_dates(
+            [
+                transaction.date_posted.date if transaction.date_posted else None
+                for transaction in self.book.transactions
+            ]
+        )
+        dates = [iso_date for iso_date in iso_dates if iso_date]
         for transaction in self.book.transactions:
-            if transaction.date_posted and transaction.date_posted.date:
-                parsed_date = DateUtils.parse_date(transaction.date_posted.date)
-                if parsed_date:
-                    dates.append(parsed_date)
-
             if transaction.currency and transaction.currency.id:
                 currency = transaction.currency.id
                 if currency in currency_usage:
@@ -474,10 +476,11 @@ class GnuCashXml:
 
     def parse_gnucash_xml(self, xml_file: str) -> GncV2:
         """
-        parse the given gnucash xml file
+        parse the given - possibly compressed - gnucash xml file
         """
         parser = XmlParser(config=ParserConfig(fail_on_unknown_properties=False))
-        return parser.parse(xml_file, GncV2)
+        with CompressedFile.open(xml_file, "rb") as source:
+            return parser.parse(source, GncV2)
 
     def xml_format(self, xml_string: str) -> str:
         """
@@ -542,5 +545,5 @@ class GnuCashXml:
         xml_string = self.to_text(gnucash_data)
 
         # Write the formatted XML string to the file
-        with open(output_file, "w", encoding="UTF-8") as f:
+        with CompressedFile.open(output_file, "w", encoding="UTF-8") as f:
             f.write(xml_string)
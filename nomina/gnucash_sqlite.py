@@ -0,0 +1,781 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import re
+import sqlite3
+import uuid
+from datetime import datetime, timezone
+from itertools import count, groupby
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from nomina.amount import Amount
+from nomina.ledger import Book
+from nomina.stats import Stats
+
+
+class GnuCashSqlite:
+    """
+    access to the accounts, transactions, splits and commodities tables
+    of a GnuCash SQLite book with bulk SQL joins - the rows are streamed
+    from cursors instead of being mapped by an ORM
+    """
+
+    # the accounts of the template root for scheduled transactions
+    template_cte = """WITH RECURSIVE template(guid) AS (
+        SELECT root_template_guid FROM books
+        UNION ALL
+        SELECT a.guid FROM accounts a JOIN template t ON a.parent_guid = t.guid
+    )"""
+
+    accounts_sql = f"""{template_cte}
+    SELECT a.guid, a.name, a.account_type, a.description, c.mnemonic, a.parent_guid
+    FROM accounts a
+    LEFT JOIN commodities c ON c.guid = a.commodity_guid
+    WHERE a.guid NOT IN (SELECT guid FROM template)
+    ORDER BY a.rowid"""
+
+    splits_sql = f"""{template_cte}
+    SELECT t.guid, t.post_date, t.description, c.fraction,
+        s.account_guid, s.memo, s.reconcile_state, s.value_num, s.value_denom
+    FROM transactions t
+    LEFT JOIN commodities c ON c.guid = t.currency_guid
+    JOIN splits s ON s.tx_guid = t.guid
+    WHERE t.guid NOT IN (
+        SELECT tx_guid FROM splits WHERE account_guid IN (SELECT guid FROM template)
+    )
+    ORDER BY t.post_date, t.rowid, s.rowid"""
+
+    # the schema of GnuCash 5 - the indexes are created after a bulk load
+    ddl = [
+        """CREATE TABLE gnclock (
+            Hostname varchar(255),
+            PID int
+        )""",
+        """CREATE TABLE versions (
+            table_name text(50) PRIMARY KEY NOT NULL,
+            table_version integer NOT NULL
+        )""",
+        """CREATE TABLE books (
+            guid text(32) PRIMARY KEY NOT NULL,
+            root_account_guid text(32) NOT NULL,
+            root_template_guid text(32) NOT NULL
+        )""",
+        """CREATE TABLE commodities (
+            guid text(32) PRIMARY KEY NOT NULL,
+            namespace text(2048) NOT NULL,
+            mnemonic text(2048) NOT NULL,
+            fullname text(2048),
+            cusip text(2048),
+            fraction integer NOT NULL,
+            quote_flag integer NOT NULL,
+            quote_source text(2048),
+            quote_tz text(2048)
+        )""",
+        """CREATE TABLE accounts (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(2048) NOT NULL,
+            account_type text(2048) NOT NULL,
+            commodity_guid text(32),
+            commodity_scu integer NOT NULL,
+            non_std_scu integer NOT NULL,
+            parent_guid text(32),
+            code text(2048),
+            description text(2048),
+            hidden integer,
+            placeholder integer
+        )""",
+        """CREATE TABLE budgets (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(2048) NOT NULL,
+            description text(2048),
+            num_periods integer NOT NULL
+        )""",
+        """CREATE TABLE budget_amounts (
+            id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+            budget_guid text(32) NOT NULL,
+            account_guid text(32) NOT NULL,
+            period_num integer NOT NULL,
+            amount_num bigint NOT NULL,
+            amount_denom bigint NOT NULL
+        )""",
+        """CREATE TABLE prices (
+            guid text(32) PRIMARY KEY NOT NULL,
+            commodity_guid text(32) NOT NULL,
+            currency_guid text(32) NOT NULL,
+            date text(19) NOT NULL,
+            source text(2048),
+            type text(2048),
+            value_num bigint NOT NULL,
+            value_denom bigint NOT NULL
+        )""",
+        """CREATE TABLE transactions (
+            guid text(32) PRIMARY KEY NOT NULL,
+            currency_guid text(32) NOT NULL,
+            num text(2048) NOT NULL,
+            post_date text(19),
+            enter_date text(19),
+            description text(2048)
+        )""",
+        """CREATE TABLE splits (
+            guid text(32) PRIMARY KEY NOT NULL,
+            tx_guid text(32) NOT NULL,
+            account_guid text(32) NOT NULL,
+            memo text(2048) NOT NULL,
+            action text(2048) NOT NULL,
+            reconcile_state text(1) NOT NULL,
+            reconcile_date text(19),
+            value_num bigint NOT NULL,
+            value_denom bigint NOT NULL,
+            quantity_num bigint NOT NULL,
+            quantity_denom bigint NOT NULL,
+            lot_guid text(32)
+        )""",
+        """CREATE TABLE slots (
+            id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+            obj_guid text(32) NOT NULL,
+            name text(4096) NOT NULL,
+            slot_type integer NOT NULL,
+            int64_val bigint,
+            string_val text(4096),
+            double_val float8,
+            timespec_val text(19),
+            guid_val text(32),
+            numeric_val_num bigint,
+            numeric_val_denom bigint,
+            gdate_val text(8)
+        )""",
+        """CREATE TABLE recurrences (
+            id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+            obj_guid text(32) NOT NULL,
+            recurrence_mult integer NOT NULL,
+            recurrence_period_type text(2048) NOT NULL,
+            recurrence_period_start text(8) NOT NULL,
+            recurrence_weekend_adjust text(2048) NOT NULL
+        )""",
+        """CREATE TABLE schedxactions (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(2048),
+            enabled integer NOT NULL,
+            start_date text(8),
+            end_date text(8),
+            last_occur text(8),
+            num_occur integer NOT NULL,
+            rem_occur integer NOT NULL,
+            auto_create integer NOT NULL,
+            auto_notify integer NOT NULL,
+            adv_creation integer NOT NULL,
+            adv_notify integer NOT NULL,
+            instance_count integer NOT NULL,
+            template_act_guid text(32) NOT NULL
+        )""",
+        """CREATE TABLE lots (
+            guid text(32) PRIMARY KEY NOT NULL,
+            account_guid text(32),
+            is_closed integer NOT NULL
+        )""",
+        """CREATE TABLE billterms (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(2048) NOT NULL,
+            description text(2048) NOT NULL,
+            refcount integer NOT NULL,
+            invisible integer NOT NULL,
+            parent text(32),
+            type text(2048) NOT NULL,
+            duedays integer,
+            discountdays integer,
+            discount_num bigint,
+            discount_denom bigint,
+            cutoff integer
+        )""",
+        """CREATE TABLE customers (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(2048) NOT NULL,
+            id text(2048) NOT NULL,
+            notes text(2048) NOT NULL,
+            active integer NOT NULL,
+            discount_num bigint NOT NULL,
+            discount_denom bigint NOT NULL,
+            credit_num bigint NOT NULL,
+            credit_denom bigint NOT NULL,
+            currency text(32) NOT NULL,
+            tax_override integer NOT NULL,
+            addr_name text(1024),
+            addr_addr1 text(1024),
+            addr_addr2 text(1024),
+            addr_addr3 text(1024),
+            addr_addr4 text(1024),
+            addr_phone text(128),
+            addr_fax text(128),
+            addr_email text(256),
+            shipaddr_name text(1024),
+            shipaddr_addr1 text(1024),
+            shipaddr_addr2 text(1024),
+            shipaddr_addr3 text(1024),
+            shipaddr_addr4 text(1024),
+            shipaddr_phone text(128),
+            shipaddr_fax text(128),
+            shipaddr_email text(256),
+            terms text(32),
+            tax_included integer,
+            taxtable text(32)
+        )""",
+        """CREATE TABLE employees (
+            guid text(32) PRIMARY KEY NOT NULL,
+            username text(2048) NOT NULL,
+            id text(2048) NOT NULL,
+            language text(2048) NOT NULL,
+            acl text(2048) NOT NULL,
+            active integer NOT NULL,
+            currency text(32) NOT NULL,
+            ccard_guid text(32),
+            workday_num bigint NOT NULL,
+            workday_denom bigint NOT NULL,
+            rate_num bigint NOT NULL,
+            rate_denom bigint NOT NULL,
+            addr_name text(1024),
+            addr_addr1 text(1024),
+            addr_addr2 text(1024),
+            addr_addr3 text(1024),
+            addr_addr4 text(1024),
+            addr_phone text(128),
+            addr_fax text(128),
+            addr_email text(256)
+        )""",
+        """CREATE TABLE entries (
+            guid text(32) PRIMARY KEY NOT NULL,
+            date text(19) NOT NULL,
+            date_entered text(19),
+            description text(2048),
+            action text(2048),
+            notes text(2048),
+            quantity_num bigint,
+            quantity_denom bigint,
+            i_acct text(32),
+            i_price_num bigint,
+            i_price_denom bigint,
+            i_discount_num bigint,
+            i_discount_denom bigint,
+            invoice text(32),
+            i_disc_type text(2048),
+            i_disc_how text(2048),
+            i_taxable integer,
+            i_taxincluded integer,
+            i_taxtable text(32),
+            b_acct text(32),
+            b_price_num bigint,
+            b_price_denom bigint,
+            bill text(32),
+            b_taxable integer,
+            b_taxincluded integer,
+            b_taxtable text(32),
+            b_paytype integer,
+            billable integer,
+            billto_type integer,
+            billto_guid text(32),
+            order_guid text(32)
+        )""",
+        """CREATE TABLE invoices (
+            guid text(32) PRIMARY KEY NOT NULL,
+            id text(2048) NOT NULL,
+            date_opened text(19),
+            date_posted text(19),
+            notes text(2048) NOT NULL,
+            active integer NOT NULL,
+            currency text(32) NOT NULL,
+            owner_type integer,
+            owner_guid text(32),
+            terms text(32),
+            billing_id text(2048),
+            post_txn text(32),
+            post_lot text(32),
+            post_acc text(32),
+            billto_type integer,
+            billto_guid text(32),
+            charge_amt_num bigint,
+            charge_amt_denom bigint
+        )""",
+        """CREATE TABLE jobs (
+            guid text(32) PRIMARY KEY NOT NULL,
+            id text(2048) NOT NULL,
+            name text(2048) NOT NULL,
+            reference text(2048) NOT NULL,
+            active integer NOT NULL,
+            owner_type integer,
+            owner_guid text(32)
+        )""",
+        """CREATE TABLE orders (
+            guid text(32) PRIMARY KEY NOT NULL,
+            id text(2048) NOT NULL,
+            notes text(2048) NOT NULL,
+            reference text(2048) NOT NULL,
+            active integer NOT NULL,
+            date_opened text(19) NOT NULL,
+            date_closed text(19) NOT NULL,
+            owner_type integer NOT NULL,
+            owner_guid text(32) NOT NULL
+        )""",
+        """CREATE TABLE taxtables (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(50) NOT NULL,
+            refcount bigint NOT NULL,
+            invisible integer NOT NULL,
+            parent text(32)
+        )""",
+        """CREATE TABLE taxtable_entries (
+            id integer PRIMARY KEY AUTOINCREMENT NOT NULL,
+            taxtable text(32) NOT NULL,
+            account text(32) NOT NULL,
+            amount_num bigint NOT NULL,
+            amount_denom bigint NOT NULL,
+            type integer NOT NULL
+        )""",
+        """CREATE TABLE vendors (
+            guid text(32) PRIMARY KEY NOT NULL,
+            name text(2048) NOT NULL,
+            id text(2048) NOT NULL,
+            notes text(2048) NOT NULL,
+            currency text(32) NOT NULL,
+            active integer NOT NULL,
+            tax_override integer NOT NULL,
+            addr_name text(1024),
+            addr_addr1 text(1024),
+            addr_addr2 text(1024),
+            addr_addr3 text(1024),
+            addr_addr4 text(1024),
+            addr_phone text(128),
+            addr_fax text(128),
+            addr_email text(256),
+            terms text(32),
+            tax_inc text(2048),
+            tax_table text(32)
+        )""",
+    ]
+    indexes = [
+        "CREATE INDEX tx_post_date_index ON transactions(post_date)",
+        "CREATE INDEX splits_tx_guid_index ON splits(tx_guid)",
+        "CREATE INDEX splits_account_guid_index ON splits(account_guid)",
+        "CREATE INDEX slots_guid_index ON slots(obj_guid)",
+    ]
+    versions = [
+        ("Gnucash", 5000009),
+        ("Gnucash-Resave", 19920),
+        ("books", 1),
+        ("commodities", 1),
+        ("accounts", 1),
+        ("budgets", 1),
+        ("budget_amounts", 1),
+        ("prices", 3),
+        ("transactions", 4),
+        ("splits", 5),
+        ("slots", 4),
+        ("recurrences", 2),
+        ("schedxactions", 1),
+        ("lots", 2),
+        ("billterms", 2),
+        ("customers", 2),
+        ("employees", 2),
+        ("entries", 4),
+        ("invoices", 4),
+        ("jobs", 1),
+        ("orders", 1),
+        ("taxtables", 2),
+        ("taxtable_entries", 3),
+        ("vendors", 1),
+    ]
+    # the number of columns of the tables that are bulk loaded
+    columns = {
+        "books": 3,
+        "commodities": 9,
+        "accounts": 11,
+        "transactions": 6,
+        "splits": 12,
+    }
+    slot_columns = (
+        "obj_guid, name, slot_type, int64_val, string_val, double_val,"
+        " timespec_val, guid_val, numeric_val_num, numeric_val_denom, gdate_val"
+    )
+    null_date = "1970-01-01 00:00:00"
+    guid_pattern = re.compile(r"[0-9a-f]{32}")
+
+    def __init__(self, db_path: str, readonly: bool = True):
+        """
+        constructor
+
+        Args:
+            db_path (str): the path of the GnuCash SQLite file
+            readonly (bool): if True open the file read only
+        """
+        self.db_path = db_path
+        if readonly:
+            self.connection = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+        else:
+            self.connection = sqlite3.connect(db_path)
+        self.guid_prefix = uuid.uuid4().hex[:16]
+        self.guid_counter = count(1)
+
+    @classmethod
+    def create(cls, db_path: str) -> "GnuCashSqlite":
+        """
+        create a new GnuCash SQLite file prepared for a bulk load: the tables
+        are created without their indexes, the journal is written ahead and
+        not synced and all rows are inserted in a single transaction
+        until finish is called
+
+        Args:
+            db_path (str): the path of the GnuCash SQLite file - an existing file is replaced
+
+        Returns:
+            GnuCashSqlite: the writable GnuCash SQLite book
+        """
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        gnc_sqlite = cls(db_path, readonly=False)
+        connection = gnc_sqlite.connection
+        connection.execute("PRAGMA locking_mode=EXCLUSIVE")
+        connection.execute("PRAGMA journal_mode=WAL")
+        connection.execute("PRAGMA synchronous=OFF")
+        # keep the pages of the load in memory instead of spilling them to the WAL
+        connection.execute("PRAGMA cache_size=-262144")
+        connection.execute("BEGIN")
+        for ddl in cls.ddl:
+            connection.execute(ddl)
+        connection.executemany("INSERT INTO versions VALUES (?, ?)", cls.versions)
+        return gnc_sqlite
+
+    def insert(self, table: str, rows: Iterable[Tuple]):
+        """
+        bulk insert the given rows into the given table
+
+        Args:
+            table (str): the name of the table e.g. 'splits'
+            rows (Iterable[Tuple]): the rows with all columns - for slots without the id
+        """
+        if table == "slots":
+            columns = f"({self.slot_columns})"
+            params = ", ".join(["?"] * 11)
+        else:
+            columns = ""
+            params = ", ".join(["?"] * self.columns[table])
+        self.connection.executemany(
+            f"INSERT INTO {table}{columns} VALUES ({params})", rows
+        )
+
+    def new_guid(self) -> str:
+        """
+        get a new guid - a random prefix per file with a counter is
+        unique within the book and much cheaper than a uuid per row
+        """
+        return f"{self.guid_prefix}{next(self.guid_counter):016x}"
+
+    def guid_of(self, ledger_id: Optional[str]) -> str:
+        """
+        get the guid for the given ledger id - ids that are
+        GnuCash guids already e.g. of a converted GnuCash book are kept
+        """
+        if ledger_id and self.guid_pattern.fullmatch(ledger_id):
+            return ledger_id
+        return self.new_guid()
+
+    @classmethod
+    def save(cls, book: Book, db_path: str, batch_size: int = 10000) -> int:
+        """
+        save the given Ledger Book as GnuCash SQLite file with bulk inserts
+        of batches of transactions within a single database transaction
+
+        Args:
+            book (Book): the Ledger Book to save
+            db_path (str): the path of the GnuCash SQLite file - an existing file is replaced
+            batch_size (int): the number of transactions per executemany batch
+
+        Returns:
+            int: the number of transactions written
+        """
+        gnc_sqlite = cls.create(db_path)
+        book_guid = gnc_sqlite.new_guid()
+        template_guid = gnc_sqlite.new_guid()
+        roots = [
+            account
+            for account in book.accounts.values()
+            if account.account_type == "ROOT" and not account.parent_account_id
+        ]
+        account_guids = {
+            account_id: gnc_sqlite.guid_of(account_id) for account_id in book.accounts
+        }
+        empty_account = ("", "", 0, 0)
+        account_rows = [
+            (template_guid, "Template Root", "ROOT", None, 0, 0, None) + empty_account
+        ]
+        if len(roots) == 1:
+            root_guid = account_guids[roots[0].account_id]
+        else:
+            root_guid = gnc_sqlite.new_guid()
+            account_rows.append(
+                (root_guid, "Root Account", "ROOT", None, 0, 0, None) + empty_account
+            )
+        currencies = sorted(
+            {
+                account.currency or "EUR"
+                for account in book.accounts.values()
+                if account.account_type != "ROOT"
+            }
+            or {"EUR"}
+        )
+        commodity_guids = {currency: gnc_sqlite.new_guid() for currency in currencies}
+        commodity_rows = [
+            (guid, "CURRENCY", currency, "", "", 10 ** Amount.scale(currency), 1)
+            + ("currency", "")
+            for currency, guid in commodity_guids.items()
+        ]
+        account_currencies: Dict[str, str] = {}
+        for account_id, account in book.accounts.items():
+            guid = account_guids[account_id]
+            if account.account_type == "ROOT" and guid == root_guid:
+                row = (guid, account.name, "ROOT", None, 0, 0, None)
+            else:
+                currency = account.currency or "EUR"
+                account_currencies[guid] = currency
+                parent_guid = account_guids.get(account.parent_account_id, root_guid)
+                row = (
+                    guid,
+                    account.name,
+                    account.account_type,
+                    commodity_guids[currency],
+                    10 ** Amount.scale(currency),
+                    0,
+                    parent_guid,
+                )
+            account_rows.append(row + ("", account.description or "", 0, 0))
+        gnc_sqlite.insert("books", [(book_guid, root_guid, template_guid)])
+        gnc_sqlite.insert("commodities", commodity_rows)
+        gnc_sqlite.insert("accounts", account_rows)
+        features_guid = gnc_sqlite.new_guid()
+        feature = "ISO-8601 formatted date strings in SQLite3 databases."
+        book_slots = [
+            (book_guid, "features", 9, 0, None, None)
+            + (cls.null_date, features_guid, 0, 1, None),
+            (features_guid, f"features/{feature}", 4, 0)
+            + (
+                "Use ISO formatted date-time strings in SQLite3 databases"
+                " (requires at least GnuCash 2.6.20)",
+                None,
+            )
+            + (cls.null_date, None, 0, 1, None),
+        ]
+        gnc_sqlite.insert("slots", book_slots)
+        scales = {
+            guid: Amount.scale(currency)
+            for guid, currency in account_currencies.items()
+        }
+        # the dates of a book repeat - convert each date once
+        post_dates: Dict[str, Tuple[str, str]] = {}
+        transaction_rows = []
+        split_rows = []
+        slot_rows = []
+        written = 0
+        for transaction_id, transaction in book.transactions.items():
+            tx_guid = gnc_sqlite.guid_of(transaction_id)
+            isodate = transaction.isodate or ""
+            dates = post_dates.get(isodate)
+            if dates is None:
+                dates = (cls.post_date(isodate), isodate[:10].replace("-", ""))
+                post_dates[isodate] = dates
+            post_date, gdate = dates
+            currency = None
+            for si, split in enumerate(transaction.splits, start=1):
+                # zero value splits e.g. of fees are kept
+                if split is None or split.amount is None:
+                    continue
+                account_guid = account_guids.get(split.account_id)
+                if account_guid not in scales:
+                    # GnuCash has no splits of unknown or ROOT accounts
+                    msg = (
+                        f"split {si} of transaction {transaction_id} has unknown"
+                        f" or ROOT account {split.account_id}"
+                    )
+                    if book.lenient:
+                        book.log.log("⚠️", "split", msg)
+                    else:
+                        raise ValueError(msg)
+                    continue
+                if currency is None:
+                    currency = account_currencies[account_guid]
+                    value_scale = scales[account_guid]
+                # amounts finer than the commodity get a finer denominator
+                split_value_scale = Amount.scale_of_amounts([split.amount], value_scale)
+                quantity_scale = Amount.scale_of_amounts(
+                    [split.amount], scales[account_guid]
+                )
+                value = Amount.to_minor(split.amount, split_value_scale)
+                if quantity_scale == split_value_scale:
+                    quantity = value
+                else:
+                    quantity = Amount.to_minor(split.amount, quantity_scale)
+                split_rows.append(
+                    (
+                        gnc_sqlite.new_guid(),
+                        tx_guid,
+                        account_guid,
+                        split.memo or "",
+                        "",
+                        "y" if split.reconciled else "n",
+                        cls.null_date,
+                        value,
+                        10**split_value_scale,
+                        quantity,
+                        10**quantity_scale,
+                        None,
+                    )
+                )
+            currency_guid = commodity_guids[currency or currencies[0]]
+            transaction_rows.append(
+                (
+                    tx_guid,
+                    currency_guid,
+                    "",
+                    post_date,
+                    post_date,
+                    transaction.description,
+                )
+            )
+            slot_rows.append(
+                (tx_guid, "date-posted", 10, 0, None, None)
+                + (cls.null_date, None, 0, 1, gdate)
+            )
+            if len(transaction_rows) >= batch_size:
+                written += len(transaction_rows)
+                gnc_sqlite.insert_transactions(transaction_rows, split_rows, slot_rows)
+        written += len(transaction_rows)
+        gnc_sqlite.insert_transactions(transaction_rows, split_rows, slot_rows)
+        gnc_sqlite.finish()
+        return written
+
+    def insert_transactions(
+        self,
+        transaction_rows: List[Tuple],
+        split_rows: List[Tuple],
+        slot_rows: List[Tuple],
+    ):
+        """
+        bulk insert a batch of transactions with their splits and slots
+        and clear the given row lists for the next batch
+        """
+        self.insert("transactions", transaction_rows)
+        self.insert("splits", split_rows)
+        self.insert("slots", slot_rows)
+        transaction_rows.clear()
+        split_rows.clear()
+        slot_rows.clear()
+
+    def finish(self):
+        """
+        finish a bulk load by creating the indexes, committing and
+        switching back to a rollback journal that GnuCash expects
+        """
+        for index in self.indexes:
+            self.connection.execute(index)
+        self.connection.commit()
+        self.connection.execute("PRAGMA journal_mode=DELETE")
+        self.connection.execute("PRAGMA synchronous=FULL")
+        self.close()
+
+    @classmethod
+    def post_date(cls, isodate: Optional[str]) -> Optional[str]:
+        """
+        convert a ledger isodate to a GnuCash SQLite post_date in UTC
+
+        Args:
+            isodate (str): e.g. '2024-10-06' or '2014-01-02 10:59:00 +0000'
+
+        Returns:
+            Optional[str]: e.g. '2024-10-06 10:59:00' - GnuCash uses 10:59 UTC
+            for dates without a time
+        """
+        if not isodate:
+            return None
+        if len(isodate) == 10:
+            return f"{isodate} 10:59:00"
+        try:
+            date_time = datetime.strptime(isodate, "%Y-%m-%d %H:%M:%S %z")
+            return date_time.astimezone(timezone.utc).strftime("%Y-%m-%d %H:%M:%S")
+        except ValueError:
+            return isodate[:19]
+
+    def close(self):
+        """
+        close the database connection
+        """
+        self.connection.close()
+
+    @classmethod
+    def isodate(cls, post_date: Optional[str]) -> Optional[str]:
+        """
+        convert a GnuCash SQLite post_date to the date format of GnuCash XML
+
+        Args:
+            post_date (str): '2014-01-02 10:59:00' or '20140102105900' for
+                books written before GnuCash 2.6.20
+
+        Returns:
+            Optional[str]: e.g. '2014-01-02 10:59:00 +0000'
+        """
+        if not post_date:
+            return None
+        if len(post_date) == 14 and post_date.isdigit():
+            d = post_date
+            post_date = f"{d[0:4]}-{d[4:6]}-{d[6:8]} {d[8:10]}:{d[10:12]}:{d[12:14]}"
+        return f"{post_date} +0000"
+
+    def iter_accounts(self) -> Iterator[Tuple]:
+        """
+        iterate over the accounts without the scheduled transaction templates
+
+        Yields:
+            Tuple: guid, name, account_type, description, currency mnemonic, parent_guid
+        """
+        yield from self.connection.execute(self.accounts_sql)
+
+    def iter_transactions(
+        self,
+    ) -> Iterator[Tuple[str, Optional[str], str, Optional[int], List[Tuple]]]:
+        """
+        iterate over the transactions ordered by post date with their splits
+        from a single join - one transaction is in memory at a time
+
+        Yields:
+            Tuple[str, Optional[str], str, Optional[int], List[Tuple]]: guid,
+            post_date, description, the fraction of the transaction currency
+            the values are in and the split rows account_guid, memo,
+            reconcile_state, value_num, value_denom
+        """
+        cursor = self.connection.execute(self.splits_sql)
+        for (tx_guid, post_date, description, fraction), rows in groupby(
+            cursor, key=lambda row: row[:4]
+        ):
+            splits = [row[4:] for row in rows]
+            yield tx_guid, post_date, description, fraction, splits
+
+    def get_stats(self) -> Stats:
+        """
+        get the statistics of the book with aggregate queries
+        """
+        accounts = sum(1 for _row in self.iter_accounts())
+        transactions, start_date, end_date = self.connection.execute(
+            "SELECT COUNT(*), MIN(post_date), MAX(post_date) FROM transactions"
+        ).fetchone()
+        currencies = dict(
+            self.connection.execute("""SELECT c.mnemonic, COUNT(*) FROM transactions t
+                JOIN commodities c ON c.guid = t.currency_guid
+                GROUP BY c.mnemonic""")
+        )
+        stats = Stats(
+            accounts=accounts,
+            transactions=transactions,
+            start_date=self.isodate(start_date)[:10] if start_date else None,
+            end_date=self.isodate(end_date)[:10] if end_date else None,
+            currencies=currencies,
+        )
+        return stats
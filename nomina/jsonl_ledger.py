@@ -0,0 +1,105 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from pathlib import Path
+from typing import Optional
+
+from nomina.book_jsonl import BookJsonl, BookJsonlWriter
+from nomina.ledger import Book as LedgerBook
+from nomina.ledger import BookListener
+from nomina.nomina_converter import BaseFromLedgerConverter, BaseToLedgerConverter
+
+
+class JsonlToLedgerConverter(BaseToLedgerConverter):
+    """
+    Convert a JSON Lines Ledger Book to a Ledger Book
+    """
+
+    def __init__(self, debug: bool = False, workers: int = 1):
+        """
+        constructor
+
+        Args:
+            debug (bool): If True, enable debug output
+            workers (int): the number of processes for parsing chunks in parallel
+        """
+        super().__init__(from_format_acronym="LB-JSONL", debug=debug)
+        self.workers = workers
+
+    def load(self, input_path: str) -> LedgerBook:
+        """
+        load the JSON Lines file
+
+        Args:
+            input_path (str): the path of the JSONL file
+
+        Returns:
+            LedgerBook: the loaded Ledger Book
+        """
+        self.source = BookJsonl.load(str(input_path), workers=self.workers)
+        return self.source
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        the loaded book is the target
+        """
+        ledger_book = self.source
+        return ledger_book
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the target book
+        """
+        if self.debug:
+            self.target.get_stats().show()
+
+    def to_text(self) -> str:
+        """
+        create the output text
+        """
+        yaml_str = self.target.to_yaml()
+        return yaml_str
+
+
+class LedgerToJsonlConverter(BaseFromLedgerConverter):
+    """
+    Convert a Ledger Book to JSON Lines
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(to_format_acronym="LB-JSONL", debug=debug)
+
+    def set_source(self, source: LedgerBook):
+        self.source = source
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        the lines are written on save
+        """
+        return self.source
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the source book
+        """
+        if self.debug:
+            self.source.get_stats().show()
+
+    def open_listener(self, output_path: Path) -> Optional[BookListener]:
+        """
+        open a writer that writes the lines while the book is being converted
+        """
+        writer = BookJsonlWriter.open(str(output_path))
+        return writer
+
+    def save(self, output_path: Path):
+        """
+        save the Ledger Book as JSON Lines
+        """
+        BookJsonl.save(self.source, str(output_path))
@@ -4,19 +4,45 @@ Created on 04.10.2024
 @author: wf
 """
 
+import sys
+from bisect import bisect_left, bisect_right
 from copy import deepcopy
-from dataclasses import field
-from datetime import datetime
-from typing import Dict, List, Optional
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Optional, Tuple
 
+import numpy as np
 from basemkit.persistent_log import Log
 from basemkit.yamlable import lod_storable
+from dataclasses_json import dataclass_json
 
-from nomina.date_utils import DateUtils
+from nomina.account_tree import AccountTree
+from nomina.amount import Amount
+from nomina.balance_checkpoints import BalanceCheckpoints
+from nomina.running_balances import RegisterEntry, RunningBalances
+from nomina.split_store import SplitStore
 from nomina.stats import Stats
 
 
-@lod_storable
+def compact_storable(cls):
+    """
+    Decorator for the compact records of a Book:
+    a dataclass with __slots__ instead of a per-instance __dict__
+    with JSON/dict serialization - the YAML serialization is
+    done by the lod_storable Book the records belong to.
+    """
+    cls = dataclass(cls, slots=True)
+    cls = dataclass_json(cls)
+    return cls
+
+
+def intern(value: Optional[str]) -> Optional[str]:
+    """
+    intern the given string so that repeated values share a single object
+    """
+    return sys.intern(value) if type(value) is str else value
+
+
+@compact_storable
 class Account:
     """
     Represents a ledger account.
@@ -24,13 +50,19 @@ class Account:
 
     account_id: str
     name: str
-    account_type: str # e.g. beancount compatible "Assets", "Liabilities", "Equity", "Income", "Expenses"
+    account_type: str  # e.g. beancount compatible "Assets", "Liabilities", "Equity", "Income", "Expenses"
     description: Optional[str] = ""
     currency: str = "EUR"  # Default to EUR
     parent_account_id: Optional[str] = None
 
+    def __post_init__(self):
+        self.account_id = intern(self.account_id)
+        self.account_type = intern(self.account_type)
+        self.currency = intern(self.currency)
+        self.parent_account_id = intern(self.parent_account_id)
 
-@lod_storable
+
+@compact_storable
 class Split:
     """
     Represents a split in a transaction.
@@ -41,26 +73,69 @@ class Split:
     memo: Optional[str] = ""
     reconciled: bool = False
 
+    def __post_init__(self):
+        self.account_id = intern(self.account_id)
+        self.memo = intern(self.memo)
 
-@lod_storable
+
+@compact_storable
 class Transaction:
     """
     Represents a transaction in the ledger.
     """
 
-    isodate: str=None
+    isodate: str = None
     description: Optional[str] = None
     splits: List[Split] = field(default_factory=list)
     payee: Optional[str] = None
     memo: Optional[str] = ""
 
+    def __post_init__(self):
+        self.isodate = intern(self.isodate)
+        self.description = intern(self.description)
+        self.payee = intern(self.payee)
+        self.memo = intern(self.memo)
+
     def total_amount(self) -> float:
         """
         Calculates the total amount of the transaction.
         Returns:
-            float: The sum of all split amounts.
+            float: The sum of all split amounts - summed up exactly in minor units.
         """
-        return sum(split.amount for split in self.splits)
+        return Amount.sum(split.amount for split in self.splits)
+
+
+class BookListener:
+    """
+    listener for the accounts and transactions added to a Book
+    e.g. for writing a book incrementally while it is being converted
+    """
+
+    def on_account(self, book: "Book", account: Account):
+        """
+        the given account has been added to the given book
+        """
+        pass
+
+    def on_transaction(
+        self, book: "Book", transaction_id: str, transaction: Transaction
+    ):
+        """
+        the given transaction has been added to the given book
+        """
+        pass
+
+    def on_finished(self, book: "Book"):
+        """
+        the given book is complete
+        """
+        pass
+
+    def close(self):
+        """
+        release the resources of this listener
+        """
+        pass
 
 
 @lod_storable
@@ -71,7 +146,7 @@ class Book:
 
     file_type: str = "NOMINA-LEDGER-BOOK-YAML"
     version: str = "0.1"
-    lenient=bool=False
+    lenient = bool = False
     name: Optional[str] = None
     owner: Optional[str] = None
     since: Optional[str] = None
@@ -84,6 +159,519 @@ class Book:
         post construct actions
         """
         self.log = Log()
+        # revision counters bumped on every mutation
+        self.revision = 0
+        self.accounts_revision = 0
+        self._account_tree = None
+        self._account_tree_key = None
+        # scale of the minor units of the amounts
+        self._scale = None
+        self._scale_key = None
+        # if True use the columnar split store for bulk operations
+        self.columnar = False
+        self._split_store = None
+        self._split_store_key = None
+        # account_id -> list of (transaction_id, split position)
+        self._postings = None
+        self._postings_key = None
+        # sorted transaction dates and the matching transaction ids
+        self._date_keys = None
+        self._date_tx_ids = None
+        self._date_index_key = None
+        # per account registers with running balances
+        self._running_balances = None
+        self._running_balances_key = None
+        # per granularity balance checkpoints at the period ends
+        self._checkpoints: Dict[str, BalanceCheckpoints] = {}
+        self._checkpoints_key = None
+        # memoized statistics
+        self._stats = None
+        self._stats_key = None
+        # listeners for added accounts and transactions
+        self.listeners: List[BookListener] = []
+
+    @classmethod
+    def load_streaming(
+        cls, file_path: str, start_date: str = None, end_date: str = None
+    ) -> "Book":
+        """
+        Load a Book from the given NOMINA-LEDGER-BOOK-YAML file with the event based
+        streaming loader - much faster than load_from_yaml_file for large files.
+
+        Args:
+            file_path (str): the path of the YAML file
+            start_date (str): only load transactions from this 'YYYY-MM-DD' date on
+            end_date (str): only load transactions up to this 'YYYY-MM-DD' date
+
+        Returns:
+            Book: the loaded book
+        """
+        from nomina.book_stream import BookStreamLoader
+
+        with BookStreamLoader.open(file_path) as loader:
+            book = loader.load(start_date, end_date)
+        return book
+
+    def cache_key(self) -> tuple:
+        """
+        get the key for validating caches derived from this book
+
+        the sizes are part of the key to also catch direct
+        modifications of the accounts and transactions dicts
+
+        Returns:
+            tuple: revision, number of accounts and number of transactions
+        """
+        key = (self.revision, len(self.accounts), len(self.transactions))
+        return key
+
+    def touch(self, accounts: bool = False):
+        """
+        mark this book as modified e.g. after changing
+        accounts or transactions directly
+
+        Args:
+            accounts (bool): if True the accounts have been modified
+        """
+        self.revision += 1
+        if accounts:
+            self.accounts_revision += 1
+
+    def get_account_tree(self) -> AccountTree:
+        """
+        get the account tree of this book - the tree is cached and
+        only rebuilt after the accounts have been modified
+
+        Returns:
+            AccountTree: the precomputed account hierarchy
+        """
+        key = (self.accounts_revision, len(self.accounts))
+        if self._account_tree is None or self._account_tree_key != key:
+            self._account_tree = AccountTree(self.accounts)
+            self._account_tree_key = key
+        return self._account_tree
+
+    def get_scale(self) -> int:
+        """
+        get the scale of the minor units that represents all amounts of this book
+        exactly - the finest of the account currencies and of the split amounts
+        e.g. 8 for a book with satoshi amounts
+
+        Returns:
+            int: the number of decimal places of the minor unit
+        """
+        key = self.cache_key()
+        if self._scale is None or self._scale_key != key:
+            amounts = (
+                split.amount
+                for transaction in self.transactions.values()
+                for split in transaction.splits
+                if split is not None
+            )
+            self._scale = Amount.scale_of_amounts(
+                amounts, self.get_account_tree().scale
+            )
+            self._scale_key = key
+        return self._scale
+
+    def get_split_store(self) -> SplitStore:
+        """
+        get the columnar split store for this book - the store is cached,
+        extended by add_transaction and only rebuilt after other modifications
+
+        Returns:
+            SplitStore: the columnar representation of my splits
+        """
+        key = self.cache_key()
+        if self._split_store is None or self._split_store_key != key:
+            self._split_store = SplitStore.from_book(self)
+            self._split_store_key = key
+        self._split_store.flush()
+        return self._split_store
+
+    def set_split_store(self, split_store: SplitStore):
+        """
+        set the given split store as the valid columnar representation of this book
+
+        Args:
+            split_store (SplitStore): the store matching my accounts and transactions
+        """
+        self._split_store = split_store
+        self._split_store_key = self.cache_key()
+
+    def get_posting_index(self) -> Dict[str, List[Tuple[str, int]]]:
+        """
+        get the posting index of this book - the index is maintained
+        incrementally by add_account and add_transaction and only rebuilt
+        after other modifications
+
+        Returns:
+            Dict[str, List[Tuple[str, int]]]: map of account_id to the list
+            of (transaction_id, split position) postings of the account
+        """
+        if self._postings is None or self._postings_key != self.cache_key():
+            self._postings = {account_id: [] for account_id in self.accounts}
+            for transaction_id, transaction in self.transactions.items():
+                self._add_postings(transaction_id, transaction)
+            self._postings_key = self.cache_key()
+        return self._postings
+
+    def get_postings(self, account_id: str) -> List[Tuple[str, int]]:
+        """
+        get the postings of the given account
+
+        Args:
+            account_id (str): the id of the account
+
+        Returns:
+            List[Tuple[str, int]]: the (transaction_id, split position) postings
+            in transaction order
+        """
+        postings = self.get_posting_index().get(account_id, [])
+        return postings
+
+    def _add_postings(self, transaction_id: str, transaction: Transaction):
+        """
+        add the postings of the given transaction to the posting index
+        """
+        for pos, split in enumerate(transaction.splits):
+            if split is not None:
+                self._postings.setdefault(split.account_id, []).append(
+                    (transaction_id, pos)
+                )
+
+    def _remove_postings(self, transaction_id: str, transaction: Transaction):
+        """
+        remove the postings of the given transaction from the posting index
+        """
+        for split in transaction.splits:
+            if split is not None:
+                postings = self._postings.get(split.account_id)
+                if postings:
+                    postings[:] = [p for p in postings if p[0] != transaction_id]
+
+    def get_date_index(self) -> Tuple[List[str], List[str]]:
+        """
+        get the date index of this book - the index is maintained
+        incrementally by add_transaction and only rebuilt after other modifications
+
+        Returns:
+            Tuple[List[str], List[str]]: the sorted 'YYYY-MM-DD' dates of the dated
+            transactions and the matching transaction ids - transactions of the same
+            date are kept in insertion order
+        """
+        if self._date_keys is None or self._date_index_key != self.cache_key():
+            dated = [
+                (transaction.isodate.split()[0], transaction_id)
+                for transaction_id, transaction in self.transactions.items()
+                if transaction.isodate
+            ]
+            # sort is stable so same dates keep their insertion order
+            dated.sort(key=lambda entry: entry[0])
+            self._date_keys = [date_key for date_key, _tx_id in dated]
+            self._date_tx_ids = [tx_id for _date_key, tx_id in dated]
+            self._date_index_key = self.cache_key()
+        return self._date_keys, self._date_tx_ids
+
+    def get_transaction_ids_in_range(
+        self, start_date: str = None, end_date: str = None
+    ) -> List[str]:
+        """
+        get the ids of the transactions in the given date range via bisection of the date index
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+
+        Returns:
+            List[str]: the transaction ids in date order
+        """
+        _date_keys, date_tx_ids = self.get_date_index()
+        lo, hi = self.get_date_index_range(start_date, end_date)
+        return date_tx_ids[lo:hi]
+
+    def get_date_index_range(
+        self, start_date: str = None, end_date: str = None
+    ) -> Tuple[int, int]:
+        """
+        bisect the date index for the given date range
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+
+        Returns:
+            Tuple[int, int]: the slice bounds of the range within the date index
+        """
+        date_keys, _date_tx_ids = self.get_date_index()
+        lo = bisect_left(date_keys, start_date) if start_date else 0
+        hi = bisect_right(date_keys, end_date) if end_date else len(date_keys)
+        return lo, hi
+
+    def _add_date(self, transaction_id: str, transaction: Transaction):
+        """
+        add the given transaction to the date index
+        """
+        if transaction.isodate:
+            date_key = transaction.isodate.split()[0]
+            pos = bisect_right(self._date_keys, date_key)
+            self._date_keys.insert(pos, date_key)
+            self._date_tx_ids.insert(pos, transaction_id)
+
+    def _remove_date(self, transaction_id: str, transaction: Transaction):
+        """
+        remove the given transaction from the date index
+        """
+        if transaction.isodate:
+            date_key = transaction.isodate.split()[0]
+            lo = bisect_left(self._date_keys, date_key)
+            hi = bisect_right(self._date_keys, date_key)
+            for pos in range(lo, hi):
+                if self._date_tx_ids[pos] == transaction_id:
+                    del self._date_keys[pos]
+                    del self._date_tx_ids[pos]
+                    break
+
+    def get_running_balances(self) -> RunningBalances:
+        """
+        get the running balances of this book - they are maintained
+        incrementally by add_transaction and remove_transaction and
+        only rebuilt after other modifications
+
+        Returns:
+            RunningBalances: the per account registers with cumulative sums
+        """
+        if (
+            self._running_balances is None
+            or self._running_balances_key != self.cache_key()
+        ):
+            self._running_balances = RunningBalances(self.get_scale())
+            for transaction_id, transaction in self.transactions.items():
+                self._running_balances.add_transaction(transaction_id, transaction)
+            self._running_balances_key = self.cache_key()
+        return self._running_balances
+
+    def balance_as_of(
+        self, account_id: str, isodate: str, with_subaccounts: bool = False
+    ) -> float:
+        """
+        get the balance of the given account at the end of the given date
+
+        Args:
+            account_id (str): the id of the account
+            isodate (str): the date in 'YYYY-MM-DD' format
+            with_subaccounts (bool): if True include the balances of all subaccounts
+
+        Returns:
+            float: the balance
+        """
+        running_balances = self.get_running_balances()
+        account_ids = [account_id]
+        if with_subaccounts:
+            tree = self.get_account_tree()
+            account_ids = [
+                aid
+                for aid in tree.order
+                if aid == account_id or account_id in tree.ancestors[aid]
+            ]
+        balance = sum(
+            running_balances.balance_minor_as_of(aid, isodate) for aid in account_ids
+        )
+        return Amount.from_minor(balance, running_balances.scale)
+
+    def get_checkpoints(self, granularity: str = "month") -> BalanceCheckpoints:
+        """
+        get the balance checkpoints of this book for the given granularity -
+        they are maintained incrementally by add_transaction and remove_transaction
+        and only rebuilt after other modifications
+
+        Args:
+            granularity (str): 'month' or 'year'
+
+        Returns:
+            BalanceCheckpoints: the per account balances at the period ends
+        """
+        key = self.cache_key()
+        if self._checkpoints_key != key:
+            self._checkpoints = {}
+            self._checkpoints_key = key
+        checkpoints = self._checkpoints.get(granularity)
+        if checkpoints is None:
+            checkpoints = BalanceCheckpoints(granularity, self.get_scale())
+            for transaction in self.transactions.values():
+                checkpoints.add_transaction(transaction)
+            self._checkpoints[granularity] = checkpoints
+        return checkpoints
+
+    def get_period_end_balances(
+        self, period: str, with_subaccounts: bool = True
+    ) -> Dict[str, Optional[float]]:
+        """
+        get the balances of all accounts at the end of the given period
+        from the balance checkpoints
+
+        Args:
+            period (str): the month 'YYYY-MM' or the year 'YYYY'
+            with_subaccounts (bool): if True propagate the balances up the account hierarchy
+
+        Returns:
+            Dict[str, Optional[float]]: A dictionary mapping account IDs to their balances
+            or None if there are no postings up to the end of the period.
+        """
+        checkpoints = self.get_checkpoints(BalanceCheckpoints.granularity_of(period))
+        minor_balances = checkpoints.balances_at_end(period)
+        balances = {
+            account_id: minor_balances.get(account_id) for account_id in self.accounts
+        }
+        if with_subaccounts:
+            balances = self.get_account_tree().rollup(balances)
+        balances = {
+            account_id: (
+                None
+                if balance is None
+                else Amount.from_minor(balance, checkpoints.scale)
+            )
+            for account_id, balance in balances.items()
+        }
+        return balances
+
+    def get_period_delta(
+        self,
+        account_id: str,
+        start_period: str,
+        end_period: str = None,
+        with_subaccounts: bool = False,
+    ) -> float:
+        """
+        get the change of the balance of the given account over the given periods
+
+        Args:
+            account_id (str): the id of the account
+            start_period (str): the first month 'YYYY-MM' or year 'YYYY'
+            end_period (str): the last period (inclusive) - defaults to the start period
+            with_subaccounts (bool): if True include the changes of all subaccounts
+
+        Returns:
+            float: the sum of the postings within the periods
+        """
+        if end_period is None:
+            end_period = start_period
+        checkpoints = self.get_checkpoints(
+            BalanceCheckpoints.granularity_of(start_period)
+        )
+        account_ids = [account_id]
+        if with_subaccounts:
+            tree = self.get_account_tree()
+            account_ids = [
+                aid
+                for aid in tree.order
+                if aid == account_id or account_id in tree.ancestors[aid]
+            ]
+        delta = sum(
+            checkpoints.delta(aid, start_period, end_period) for aid in account_ids
+        )
+        return Amount.from_minor(delta, checkpoints.scale)
+
+    def get_register(self, account_id: str) -> List[RegisterEntry]:
+        """
+        get the date ordered register of the given account
+
+        Args:
+            account_id (str): the id of the account
+
+        Returns:
+            List[RegisterEntry]: the postings with their running balances
+        """
+        register = self.get_running_balances().get_register(account_id)
+        entries = list(register.entries()) if register else []
+        return entries
+
+    def _get_synced_indexes(self) -> Dict[str, bool]:
+        """
+        check which of the incrementally maintained indexes are in sync with the book
+
+        Returns:
+            Dict[str, bool]: the sync state by index name
+        """
+        key = self.cache_key()
+        synced = {
+            "postings": self._postings is not None and self._postings_key == key,
+            "dates": self._date_keys is not None and self._date_index_key == key,
+            "running_balances": self._running_balances is not None
+            and self._running_balances_key == key,
+            "checkpoints": self._checkpoints_key == key,
+            "split_store": self._split_store is not None
+            and self._split_store_key == key,
+        }
+        return synced
+
+    def _update_indexes(
+        self,
+        synced: Dict[str, bool],
+        transaction_id: str = None,
+        old_transaction: Optional[Transaction] = None,
+        new_transaction: Optional[Transaction] = None,
+    ):
+        """
+        update the indexes that were in sync before a modification
+
+        Args:
+            synced (Dict[str, bool]): the sync state from before the modification
+            transaction_id (str): the id of the modified transaction (if any)
+            old_transaction (Transaction): the transaction that was replaced or removed
+            new_transaction (Transaction): the transaction that was added
+        """
+        key = self.cache_key()
+        if new_transaction is not None:
+            # amounts finer than the scale of an index need a rebuild
+            scale = Amount.scale_of_amounts(
+                (split.amount for split in new_transaction.splits if split), 0
+            )
+            for name, index in [
+                ("running_balances", self._running_balances),
+                ("split_store", self._split_store),
+            ] + [
+                ("checkpoints", checkpoints)
+                for checkpoints in self._checkpoints.values()
+            ]:
+                if synced[name] and index.scale < scale:
+                    synced[name] = False
+        if (
+            synced["split_store"]
+            and old_transaction is None
+            and new_transaction is not None
+        ):
+            # only new transactions can be appended - other changes rebuild the store
+            self._split_store.add_transaction(transaction_id, new_transaction)
+            self._split_store_key = key
+        if synced["postings"]:
+            if old_transaction is not None:
+                self._remove_postings(transaction_id, old_transaction)
+            if new_transaction is not None:
+                self._add_postings(transaction_id, new_transaction)
+            self._postings_key = key
+        if synced["dates"]:
+            if old_transaction is not None:
+                self._remove_date(transaction_id, old_transaction)
+            if new_transaction is not None:
+                self._add_date(transaction_id, new_transaction)
+            self._date_index_key = key
+        if synced["running_balances"]:
+            if old_transaction is not None:
+                self._running_balances.remove_transaction(
+                    transaction_id, old_transaction
+                )
+            if new_transaction is not None:
+                self._running_balances.add_transaction(transaction_id, new_transaction)
+            self._running_balances_key = key
+        if synced["checkpoints"]:
+            # only the checkpoints of the touched periods are updated
+            for checkpoints in self._checkpoints.values():
+                if old_transaction is not None:
+                    checkpoints.remove_transaction(old_transaction)
+                if new_transaction is not None:
+                    checkpoints.add_transaction(new_transaction)
+            self._checkpoints_key = key
 
     def fq_account_name(self, account: Account, separator: str = ":") -> str:
         """
@@ -96,31 +684,52 @@ class Book:
         Returns:
             str: The fully qualified name of the account.
         """
-        if account.parent_account_id:
-            parent_account = self.lookup_account(account.parent_account_id)
-            if parent_account:
-                parent_account_name = self.fq_account_name(parent_account, separator)
-                return f"{parent_account_name}{separator}{account.name}"
-        return account.name
+        fq_name = self.get_account_tree().fq_name(account.account_id, separator)
+        if fq_name is None:
+            # not one of my accounts
+            fq_name = account.name
+            if account.parent_account_id:
+                parent_account = self.lookup_account(account.parent_account_id)
+                if parent_account:
+                    parent_account_name = self.fq_account_name(
+                        parent_account, separator
+                    )
+                    fq_name = f"{parent_account_name}{separator}{account.name}"
+        return fq_name
 
     def get_stats(self) -> Stats:
         """
         Get statistics about the Book.
 
+        The statistics are memoized and only recalculated after a modification
+        so the returned object is shared and should not be modified.
+
+        Returns:
+            Stats: An object containing various statistics about the Book.
+        """
+        key = self.cache_key()
+        if self._stats is None or self._stats_key != key:
+            self._stats = self.calc_stats()
+            self._stats_key = key
+        return self._stats
+
+    def calc_stats(self) -> Stats:
+        """
+        Calculate the statistics about the Book.
+
         Returns:
             Stats: An object containing various statistics about the Book.
         """
         # Calculate date range
-        dates = [
-            datetime.strptime(tx.isodate.split()[0], "%Y-%m-%d")
-            for tx in self.transactions.values()
-            if tx.isodate
-        ]
-        if dates:
-            min_date = DateUtils.iso_date(min(dates))
-            max_date = DateUtils.iso_date(max(dates))
+        if self.columnar:
+            min_date, max_date = self.get_split_store().date_range()
         else:
-            min_date = max_date = None
+            date_keys, _date_tx_ids = self.get_date_index()
+            if date_keys:
+                min_date = date_keys[0]
+                max_date = date_keys[-1]
+            else:
+                min_date = max_date = None
 
         # Calculate currency counts
         currency_counts = {}
@@ -144,31 +753,70 @@ class Book:
     ) -> "Book":
         """
         Filter the transactions based on the given date range.
+        The range is selected by bisection of the date index and the
+        filtered transactions keep the insertion order of this book.
 
         Args:
             start_date (str): The start date in 'YYYY-MM-DD' format.
             end_date (str): The end date in 'YYYY-MM-DD' format.
 
         Returns:
-            Book: A new Book object with filtered transactions.
+            Book: A copy-on-write BookSlice sharing accounts and transactions with this book.
         """
-        filtered_transactions = {}
+        if self.columnar:
+            return self.filter_columnar(start_date, end_date, remove_unused_accounts)
+        date_keys, date_tx_ids = self.get_date_index()
+        lo, hi = self.get_date_index_range(start_date, end_date)
+        if hi - lo == len(self.transactions):
+            filtered_transactions = dict(self.transactions)
+        else:
+            # keep the insertion order as filter_columnar does
+            selected_ids = set(date_tx_ids[lo:hi])
+            filtered_transactions = {
+                transaction_id: transaction
+                for transaction_id, transaction in self.transactions.items()
+                if transaction_id in selected_ids
+            }
 
-        for transaction_id, transaction in self.transactions.items():
-            if transaction.isodate is not None:
-                transaction_date = transaction.isodate.split()[
-                    0
-                ]  # Extract 'YYYY-MM-DD' part
+        filtered_book = BookSlice.of(self, filtered_transactions)
+        # the date index of the filtered book is a slice of mine
+        filtered_book._date_keys = date_keys[lo:hi]
+        filtered_book._date_tx_ids = date_tx_ids[lo:hi]
+        filtered_book._date_index_key = filtered_book.cache_key()
+        if self._get_synced_indexes()["postings"]:
+            filtered_book.get_posting_index()
+        if remove_unused_accounts:
+            filtered_book.remove_unused_accounts()
+        return filtered_book
 
-                in_range = (not start_date or transaction_date >= start_date) and (
-                    not end_date or transaction_date <= end_date
-                )
+    def filter_columnar(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        remove_unused_accounts: bool = True,
+    ) -> "Book":
+        """
+        Filter the transactions based on the given date range using
+        a vectorized mask over the split store.
 
-                if in_range:
-                    filtered_transactions[transaction_id] = transaction
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
 
-        filtered_book = deepcopy(self)
-        filtered_book.transactions = filtered_transactions
+        Returns:
+            Book: A copy-on-write BookSlice sharing accounts and transactions with this book.
+        """
+        store = self.get_split_store()
+        tx_mask = store.date_mask(start_date, end_date)
+        filtered_store = store.select(tx_mask)
+        filtered_transactions = {
+            transaction_id: self.transactions[transaction_id]
+            for transaction_id in filtered_store.transaction_ids
+        }
+        filtered_book = BookSlice.of(self, filtered_transactions)
+        filtered_book.set_split_store(filtered_store)
+        if self._get_synced_indexes()["postings"]:
+            filtered_book.get_posting_index()
         if remove_unused_accounts:
             filtered_book.remove_unused_accounts()
         return filtered_book
@@ -211,14 +859,83 @@ class Book:
             parent_account_id=parent_account_id,
         )
         self.add_account(account)
+        return account
 
     def add_account(self, account: Account):
         """
         add the given account
         """
+        synced = self._get_synced_indexes()
         self.accounts[account.account_id] = account
+        self.touch(accounts=True)
+        if synced["postings"]:
+            self._postings.setdefault(account.account_id, [])
+        scale = Amount.scale(account.currency)
+        if synced["running_balances"] and self._running_balances.scale < scale:
+            # the minor units of the new account's currency need a finer scale
+            synced["running_balances"] = False
+        if synced["checkpoints"] and any(
+            checkpoints.scale < scale for checkpoints in self._checkpoints.values()
+        ):
+            synced["checkpoints"] = False
+        self._update_indexes(synced)
+        for listener in self.listeners:
+            listener.on_account(self, account)
         return account
 
+    def add_transaction(
+        self, transaction_id: str, transaction: Transaction
+    ) -> Transaction:
+        """
+        add the given transaction
+
+        Args:
+            transaction_id (str): the id of the transaction
+            transaction (Transaction): the transaction to add
+
+        Returns:
+            Transaction: the added transaction
+        """
+        synced = self._get_synced_indexes()
+        old_transaction = self.transactions.get(transaction_id)
+        self.transactions[transaction_id] = transaction
+        self.touch()
+        self._update_indexes(synced, transaction_id, old_transaction, transaction)
+        for listener in self.listeners:
+            listener.on_transaction(self, transaction_id, transaction)
+        return transaction
+
+    def remove_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        remove the transaction with the given id
+
+        Args:
+            transaction_id (str): the id of the transaction
+
+        Returns:
+            Optional[Transaction]: the removed transaction or None if there was none
+        """
+        synced = self._get_synced_indexes()
+        old_transaction = self.transactions.pop(transaction_id, None)
+        if old_transaction is not None:
+            self.touch()
+            self._update_indexes(synced, transaction_id, old_transaction)
+        return old_transaction
+
+    def get_transaction_for_update(self, transaction_id: str) -> Transaction:
+        """
+        get the transaction with the given id for modifying it in place
+
+        Args:
+            transaction_id (str): the id of the transaction
+
+        Returns:
+            Transaction: the transaction to modify
+        """
+        transaction = self.transactions[transaction_id]
+        self.touch()
+        return transaction
+
     def lookup_account(self, account_id: str) -> Optional[Account]:
         """
         Get the account for the given account id.
@@ -235,40 +952,74 @@ class Book:
         """
         Calculate the balances for all accounts, including propagation up the account hierarchy.
         Unused accounts will have a balance of None.
+        The amounts are summed up exactly in integer minor units.
 
         Returns:
             Dict[str, Optional[float]]: A dictionary mapping account IDs to their balances or None if unused.
         """
-        balances = {account_id: None for account_id in self.accounts}
+        if self.columnar:
+            balances = self.calc_balances_columnar()
+        else:
+            tree = self.get_account_tree()
+            scale = self.get_scale()
+            balances = {account_id: None for account_id in self.accounts}
 
-        # First pass: Calculate balances from transactions
-        for ti, transaction in enumerate(self.transactions.values(), start=1):
-            for si, split in enumerate(transaction.splits, start=1):
-                if not split or not split.amount:
-                    msg = f"split {si} (or amount) of transaction {ti} is None"
-                    if self.lenient:
-                        self.log.log("⚠️", "split", msg)
+            # First pass: Calculate balances from transactions
+            for ti, transaction in enumerate(self.transactions.values(), start=1):
+                for si, split in enumerate(transaction.splits, start=1):
+                    if split is None or split.amount is None:
+                        msg = f"split {si} (or amount) of transaction {ti} is None"
+                        if self.lenient:
+                            self.log.log("⚠️", "split", msg)
+                        else:
+                            raise ValueError(msg)
+                        continue
                     else:
-                        raise ValueError(msg)
-                    continue
-                else:
-                    if balances[split.account_id] is None:
-                        balances[split.account_id] = split.amount
-                    else:
-                        balances[split.account_id] += split.amount
+                        amount = Amount.to_minor(split.amount, scale)
+                        if balances[split.account_id] is None:
+                            balances[split.account_id] = amount
+                        else:
+                            balances[split.account_id] += amount
 
-        # Second pass: Propagate balances up the hierarchy
-        for account in self.accounts.values():
-            if account.parent_account_id:
-                child_balance = balances[account.account_id]
-                if child_balance is not None:
-                    if balances[account.parent_account_id] is None:
-                        balances[account.parent_account_id] = child_balance
-                    else:
-                        balances[account.parent_account_id] += child_balance
+            # Second pass: Propagate balances up the hierarchy bottom-up
+            balances = tree.rollup(balances)
+            balances = {
+                account_id: (
+                    None if balance is None else Amount.from_minor(balance, scale)
+                )
+                for account_id, balance in balances.items()
+            }
 
         return balances
 
+    def calc_balances_columnar(self) -> Dict[str, Optional[float]]:
+        """
+        Calculate the balances for all accounts from the split store
+        as a vectorized reduction including propagation up the account hierarchy.
+
+        Returns:
+            Dict[str, Optional[float]]: A dictionary mapping account IDs to their balances or None if unused.
+        """
+        store = self.get_split_store()
+        for ti, si, account_id in store.invalid_splits():
+            if account_id:
+                msg = f"split {si} of transaction {ti} has unknown account {account_id}"
+            else:
+                msg = f"split {si} (or amount) of transaction {ti} is None"
+            if self.lenient:
+                self.log.log("⚠️", "split", msg)
+            else:
+                raise ValueError(msg)
+        sums, counts = store.account_sums()
+        sums, counts = self.get_account_tree().rollup_arrays(
+            store.account_ids, sums, counts
+        )
+        balances = {
+            account_id: Amount.from_minor(sums[i], store.scale) if counts[i] else None
+            for i, account_id in enumerate(store.account_ids)
+        }
+        return balances
+
     def remove_unused_accounts(self) -> None:
         """
         Remove accounts that have not been used in any transactions.
@@ -279,5 +1030,107 @@ class Book:
         accounts_to_remove = [
             account_id for account_id, balance in balances.items() if balance is None
         ]
+        if self.columnar:
+            store = self.get_split_store()
+            keep = np.array(
+                [balances[account_id] is not None for account_id in store.account_ids],
+                dtype=bool,
+            )
+            store = store.retain_accounts(keep)
+        synced = self._get_synced_indexes()
         for account_id in accounts_to_remove:
             del self.accounts[account_id]
+        if accounts_to_remove:
+            self.touch(accounts=True)
+            if self.columnar:
+                self.set_split_store(store)
+            if synced["postings"]:
+                for account_id in accounts_to_remove:
+                    self._postings.pop(account_id, None)
+            self._update_indexes(synced)
+
+
+class BookSlice(Book):
+    """
+    A lightweight copy-on-write view of a part of a parent Book
+    e.g. the result of a filter.
+
+    The slice shares the account and transaction objects with its parent.
+    The accounts dict is only copied when accounts of the slice are added or
+    removed and a transaction is only copied when it is fetched for update.
+
+    The transactions and splits of a slice must therefore only be modified
+    via get_transaction_for_update: a direct modification e.g. of
+    slice.transactions[transaction_id].splits writes through to the parent
+    and leaves the cached indexes of the parent stale.
+    """
+
+    @classmethod
+    def of(cls, parent: Book, transactions: Dict[str, Transaction]) -> "BookSlice":
+        """
+        create a slice of the given parent book
+
+        Args:
+            parent (Book): the book to slice
+            transactions (Dict[str, Transaction]): the transactions of the slice
+
+        Returns:
+            BookSlice: the slice sharing the accounts and transactions of the parent
+        """
+        values = {
+            book_field.name: getattr(parent, book_field.name)
+            for book_field in fields(parent)
+        }
+        values["transactions"] = transactions
+        book_slice = cls(**values)
+        book_slice.lenient = parent.lenient
+        book_slice.columnar = parent.columnar
+        return book_slice
+
+    def __post_init__(self):
+        """
+        post construct actions
+        """
+        super().__post_init__()
+        self._shared_accounts = True
+        self._owned_transaction_ids = set()
+
+    def _own_accounts(self):
+        """
+        make sure my accounts dict is not shared with my parent any more
+        """
+        if self._shared_accounts:
+            self.accounts = dict(self.accounts)
+            self._shared_accounts = False
+
+    def add_account(self, account: Account):
+        """
+        add the given account without modifying the parent's accounts
+        """
+        self._own_accounts()
+        return super().add_account(account)
+
+    def remove_unused_accounts(self) -> None:
+        """
+        Remove accounts that have not been used in any transactions
+        without modifying the parent's accounts.
+        """
+        self._own_accounts()
+        super().remove_unused_accounts()
+
+    def get_transaction_for_update(self, transaction_id: str) -> Transaction:
+        """
+        get a private copy of the transaction with the given id for modifying it in place
+
+        Args:
+            transaction_id (str): the id of the transaction
+
+        Returns:
+            Transaction: the transaction to modify
+        """
+        if transaction_id not in self._owned_transaction_ids:
+            self.transactions[transaction_id] = deepcopy(
+                self.transactions[transaction_id]
+            )
+            self._owned_transaction_ids.add(transaction_id)
+        return super().get_transaction_for_update(transaction_id)
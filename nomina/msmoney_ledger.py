@@ -39,14 +39,12 @@ class MicrosoftMoneyToLedgerConverter(BaseToLedgerConverter):
         """
         convert the microsoft money entries to a Ledger Book
         """
-        book = Book()
+        book = self.new_book()
         book.name = self.ms_money.header.name if self.ms_money.header else "Unknown"
         book.since = self.ms_money.header.date if self.ms_money.header else None
-        nodes= self.ms_money.graph.nodes(data=True)
+        nodes = self.ms_money.graph.nodes(data=True)
         self.log.log("✅", "graph", f"Total nodes: {len(nodes)}")
-        node_types = set(
-            data.get("type", "Unknown") for _, data in nodes
-        )
+        node_types = set(data.get("type", "Unknown") for _, data in nodes)
         self.log.log("✅", "graph", f"Node types: {node_types}")
 
         # Create accounts
@@ -87,7 +85,7 @@ class MicrosoftMoneyToLedgerConverter(BaseToLedgerConverter):
                 )
                 transaction.splits.append(split)
 
-                book.transactions[transaction_id] = transaction
+                book.add_transaction(transaction_id, transaction)
 
         self.log.log(
             "✅", "transactions", f"Transactions created: {len(book.transactions)}"
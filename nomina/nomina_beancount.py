@@ -14,6 +14,7 @@ from beancount import loader
 from beancount.core import amount, data
 from beancount.parser import printer
 
+from nomina.compressed_file import CompressedFile
 from nomina.stats import Stats
 
 
@@ -54,12 +55,15 @@ class Beancount:
 
     def load_file(self, file_path: str) -> None:
         """
-        Load a Beancount file
+        Load a Beancount file - compressed files are loaded from their decompressed text
 
         Args:
             file_path (str): Path to the Beancount file
         """
-        self.entries, self.errors, self.options_map = loader.load_file(file_path)
+        if CompressedFile.is_compressed(file_path):
+            self.load_string(CompressedFile.read_text(file_path))
+        else:
+            self.entries, self.errors, self.options_map = loader.load_file(file_path)
 
     def load_string(self, beancount_string: str) -> None:
         """
@@ -137,7 +141,7 @@ class Beancount:
         Args:
             date (date): Transaction date
             description (str): Transaction description
-            postings (List[Tuple[str, float, str]]): List of (account, amount, currency) tuples
+            postings (List[Tuple[str, float, str]]): List of (account, amount, currency) tuples - exact amounts may be passed as Decimal
             payee (str, optional): Payee name
             metadata (Dict, optional): Transaction metadata
 
@@ -45,10 +45,31 @@ class NominaCmd(WebserverCmd):
         )
         parser.add_argument(
             "--format",
-            choices=["LB-YAML", "GC-XML", "BEAN"],
+            choices=[
+                "LB-YAML",
+                "LB-BIN",
+                "LB-SQLITE",
+                "LB-PARQUET",
+                "LB-JSONL",
+                "GC-XML",
+                "GC-SQLITE",
+                "BEAN",
+                "QIF",
+            ],
             default="LB-YAML",
             help="Output format for conversion [default: %(default)s]",
         )
+        parser.add_argument(
+            "--merge-transfers",
+            action="store_true",
+            help="merge the mirrored halves of transfers of multi-account QIF exports",
+        )
+        parser.add_argument(
+            "--workers",
+            type=int,
+            default=1,
+            help="number of processes for parsing QIF and JSONL input in parallel [default: %(default)s]",
+        )
         parser.add_argument(
             "-o",
             "--output",
@@ -57,7 +78,7 @@ class NominaCmd(WebserverCmd):
         )
         return parser
 
-    def handle_args(self,args) -> bool:
+    def handle_args(self, args) -> bool:
         """
         handle the command line args
         """
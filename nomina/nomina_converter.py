@@ -4,12 +4,14 @@ Created on 2024-10-06
 @author: wf
 """
 
-from typing import Optional, TextIO
+from pathlib import Path
+from typing import List, Optional, TextIO
 
 from basemkit.persistent_log import Log
 
+from nomina.compressed_file import CompressedFile
 from nomina.file_formats import AccountingFileFormat, AccountingFileFormats
-from nomina.ledger import Book
+from nomina.ledger import Book, BookListener
 
 
 class AccountingFileConverter:
@@ -85,12 +87,10 @@ class AccountingFileConverter:
         """
         Display statistics about the source and target objects.
         """
-        source_stats = self.source.get_stats()
         if self.debug:
-            source_stats.show()
-        target_stats = self.target.get_stats()
-        if self.debug:
-            target_stats.show()
+            # only calculate the statistics if they are shown
+            self.source.get_stats().show()
+            self.target.get_stats().show()
 
 
 class BaseToLedgerConverter(AccountingFileConverter):
@@ -107,6 +107,32 @@ class BaseToLedgerConverter(AccountingFileConverter):
             debug (bool): If True, enable debug output
         """
         super().__init__(from_format_acronym, "LB-YAML", debug)
+        self.listeners: List[BookListener] = []
+
+    def add_listener(self, listener: BookListener):
+        """
+        add a listener to be notified of the accounts and transactions
+        of the Ledger Book while it is being converted
+
+        Args:
+            listener (BookListener): the listener to add
+        """
+        self.listeners.append(listener)
+
+    def new_book(self, **kwargs) -> Book:
+        """
+        create the target Ledger Book with my listeners attached -
+        subclasses should use this factory in convert_to_target
+
+        Args:
+            **kwargs: the header fields of the book
+
+        Returns:
+            Book: the new Ledger Book
+        """
+        book = Book(**kwargs)
+        book.listeners.extend(self.listeners)
+        return book
 
     def convert_to_ledger(self, input_path: str) -> Book:
         """
@@ -124,6 +150,8 @@ class BaseToLedgerConverter(AccountingFileConverter):
         if self.debug:
             print(f"Converting {self.from_format.acronym} to {self.to_format.acronym}")
         self.target = self.convert_to_target()
+        for listener in self.listeners:
+            listener.on_finished(self.target)
         self.show_stats()
         return self.target
 
@@ -176,3 +204,29 @@ class BaseFromLedgerConverter(AccountingFileConverter):
             ValueError: If not implemented by a subclass.
         """
         raise ValueError("to_text must be implemented in the subclass")
+
+    def open_listener(self, output_path: Path) -> Optional[BookListener]:
+        """
+        open a listener writing the Ledger Book to the given output file
+        incrementally while it is being converted - subclasses for
+        streamable target formats override this.
+
+        Args:
+            output_path (Path): the path of the output file
+
+        Returns:
+            Optional[BookListener]: the listener or None if the format is not streamable
+        """
+        return None
+
+    def save(self, output_path: Path):
+        """
+        Save the target to the given output file - subclasses
+        with a binary target format override this. The output is
+        compressed if the file name has a compression suffix e.g. '.gz'.
+
+        Args:
+            output_path (Path): the path of the output file
+        """
+        with CompressedFile.open(output_path, "w") as output_stream:
+            output_stream.write(self.to_text())
@@ -0,0 +1,461 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import json
+import os
+import shutil
+from dataclasses import asdict, fields
+from typing import Any, Dict, Optional
+
+import numpy as np
+
+from nomina.account_tree import AccountTree
+from nomina.amount import Amount
+from nomina.date_utils import DateUtils
+from nomina.ledger import Account, Book, Split, Transaction
+from nomina.running_balances import RunningBalances
+from nomina.split_store import SplitStore, StringTable
+
+try:
+    import pyarrow as pa
+    import pyarrow.compute as pc
+    import pyarrow.dataset as ds
+    import pyarrow.parquet as pq
+except ImportError:  # pragma: no cover - the parquet extra is not installed
+    pa = None
+
+
+class ParquetBook:
+    """
+    a ledger Book stored as a Parquet dataset of splits partitioned by year
+
+    every split is a row carrying its transaction's date, payee and memo,
+    the account id and fully qualified account name, the amount, exact minor
+    unit amount and currency. The book header and the accounts are kept in
+    the metadata file of the dataset directory. Transactions without splits
+    are kept as a single row with split_pos -1.
+    """
+
+    file_type = "NOMINA-LEDGER-BOOK-PARQUET"
+    metadata_file = "_nomina_book.parquet"
+
+    def __init__(self, path: str, header: Dict[str, Any], accounts: Dict[str, Account]):
+        """
+        constructor
+
+        Args:
+            path (str): the path of the dataset directory
+            header (Dict[str, Any]): the book header fields
+            accounts (Dict[str, Account]): the accounts of the book
+        """
+        self.path = path
+        self.header = header
+        self.accounts = accounts
+        self.scale = header.get("scale", Amount.scale_of_accounts(accounts.values()))
+
+    @staticmethod
+    def check_available():
+        """
+        make sure the optional pyarrow dependency is installed
+        """
+        if pa is None:
+            raise ImportError(
+                "Parquet support needs pyarrow - install with pip install pynomina[parquet]"
+            )
+
+    @classmethod
+    def partitioning(cls) -> "ds.Partitioning":
+        """
+        the hive style year partitioning of the dataset
+        """
+        return ds.partitioning(pa.schema([("year", pa.int32())]), flavor="hive")
+
+    @classmethod
+    def schema(cls) -> "pa.Schema":
+        """
+        the schema of the split rows
+        """
+        schema = pa.schema(
+            [
+                ("tx_pos", pa.int64()),
+                ("transaction_id", pa.string()),
+                ("isodate", pa.string()),
+                ("date", pa.string()),
+                ("year", pa.int32()),
+                ("description", pa.string()),
+                ("payee", pa.string()),
+                ("tx_memo", pa.string()),
+                ("split_pos", pa.int32()),
+                ("is_none", pa.bool_()),
+                ("account_id", pa.string()),
+                ("account", pa.string()),
+                ("amount", pa.float64()),
+                ("amount_minor", pa.int64()),
+                ("currency", pa.string()),
+                ("memo", pa.string()),
+                ("reconciled", pa.bool_()),
+            ]
+        )
+        return schema
+
+    @classmethod
+    def save(cls, book: Book, path: str) -> "ParquetBook":
+        """
+        save the given book as a Parquet dataset
+
+        Args:
+            book (Book): the ledger book
+            path (str): the path of the dataset directory - an existing dataset is replaced
+
+        Returns:
+            ParquetBook: the saved dataset
+        """
+        cls.check_available()
+        tree = book.get_account_tree()
+        scale = book.get_scale()
+        columns = {name: [] for name in cls.schema().names}
+        for tx_pos, (transaction_id, tx) in enumerate(book.transactions.items()):
+            date_key = RunningBalances.date_key(tx)
+            year = int(date_key[:4]) if date_key[:4].isdigit() else None
+            splits = tx.splits if tx.splits else [None]
+            for split_pos, split in enumerate(splits):
+                if not tx.splits:
+                    split_pos = -1
+                account_id = split.account_id if split else None
+                amount = split.amount if split else None
+                account = book.accounts.get(account_id) if account_id else None
+                columns["tx_pos"].append(tx_pos)
+                columns["transaction_id"].append(transaction_id)
+                columns["isodate"].append(tx.isodate)
+                columns["date"].append(date_key or None)
+                columns["year"].append(year)
+                columns["description"].append(tx.description)
+                columns["payee"].append(tx.payee)
+                columns["tx_memo"].append(tx.memo)
+                columns["split_pos"].append(split_pos)
+                columns["is_none"].append(split is None)
+                columns["account_id"].append(account_id)
+                columns["account"].append(tree.fq_name(account_id) if account else None)
+                columns["amount"].append(amount)
+                columns["amount_minor"].append(
+                    Amount.to_minor(amount, scale) if amount else 0
+                )
+                columns["currency"].append(account.currency if account else None)
+                columns["memo"].append(split.memo if split else None)
+                columns["reconciled"].append(split.reconciled if split else False)
+        table = pa.table(columns, schema=cls.schema())
+        if cls.is_dataset(path):
+            shutil.rmtree(path)
+        ds.write_dataset(
+            table,
+            path,
+            format="parquet",
+            partitioning=cls.partitioning(),
+        )
+        header = {
+            f.name: getattr(book, f.name)
+            for f in fields(book)
+            if f.name not in ("accounts", "transactions")
+        }
+        header["file_type"] = cls.file_type
+        header["scale"] = scale
+        account_rows = [asdict(account) for account in book.accounts.values()]
+        account_fields = [f.name for f in fields(Account)]
+        accounts_table = pa.table(
+            {
+                name: pa.array([row[name] for row in account_rows], type=pa.string())
+                for name in account_fields
+            },
+            metadata={"nomina": json.dumps(header)},
+        )
+        os.makedirs(path, exist_ok=True)
+        pq.write_table(accounts_table, os.path.join(path, cls.metadata_file))
+        parquet_book = cls(path, header, dict(book.accounts))
+        return parquet_book
+
+    @classmethod
+    def open(cls, path: str) -> "ParquetBook":
+        """
+        open the Parquet dataset at the given path
+
+        Args:
+            path (str): the path of the dataset directory
+
+        Returns:
+            ParquetBook: the dataset with its header and accounts loaded
+        """
+        cls.check_available()
+        accounts_table = pq.read_table(os.path.join(path, cls.metadata_file))
+        header = json.loads(accounts_table.schema.metadata[b"nomina"])
+        accounts = {}
+        for row in accounts_table.to_pylist():
+            account = Account(**row)
+            accounts[account.account_id] = account
+        parquet_book = cls(path, header, accounts)
+        return parquet_book
+
+    def read_table(self, start_date: str = None, end_date: str = None) -> "pa.Table":
+        """
+        read the split rows of the dataset - only the year partitions
+        of the given date range are scanned
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+
+        Returns:
+            pa.Table: the split rows in transaction and split order
+        """
+        dataset = ds.dataset(
+            self.path,
+            schema=self.schema(),
+            format="parquet",
+            partitioning=self.partitioning(),
+        )
+        condition = None
+        if start_date or end_date:
+            condition = ds.field("date").is_valid()
+            if start_date:
+                condition &= ds.field("year") >= int(start_date[:4])
+                condition &= ds.field("date") >= start_date
+            if end_date:
+                condition &= ds.field("year") <= int(end_date[:4])
+                condition &= ds.field("date") <= end_date
+        table = dataset.to_table(filter=condition)
+        table = table.sort_by([("tx_pos", "ascending"), ("split_pos", "ascending")])
+        return table
+
+    def _new_book(self) -> Book:
+        """
+        create an empty book with my header fields and accounts
+        """
+        book_fields = {f.name for f in fields(Book)}
+        book = Book(
+            **{
+                key: value
+                for key, value in self.header.items()
+                if key in book_fields
+                and key not in ("file_type", "accounts", "transactions")
+            }
+        )
+        for account in self.accounts.values():
+            book.add_account(account)
+        return book
+
+    def table_to_book(self, table: "pa.Table") -> Book:
+        """
+        materialize a book from the given split rows
+
+        Args:
+            table (pa.Table): split rows in transaction and split order
+
+        Returns:
+            Book: the book with my accounts and the transactions of the rows
+        """
+        book = self._new_book()
+        c = {
+            name: table.column(name).to_pylist()
+            for name in (
+                "transaction_id",
+                "isodate",
+                "description",
+                "payee",
+                "tx_memo",
+                "split_pos",
+                "is_none",
+                "account_id",
+                "amount",
+                "memo",
+                "reconciled",
+            )
+        }
+        tx = None
+        current_id = None
+        for i, transaction_id in enumerate(c["transaction_id"]):
+            if transaction_id != current_id:
+                current_id = transaction_id
+                tx = Transaction(
+                    isodate=c["isodate"][i],
+                    description=c["description"][i],
+                    splits=[],
+                    payee=c["payee"][i],
+                    memo=c["tx_memo"][i],
+                )
+                book.transactions[transaction_id] = tx
+            if c["split_pos"][i] < 0:
+                continue
+            if c["is_none"][i]:
+                tx.splits.append(None)
+                continue
+            tx.splits.append(
+                Split(
+                    amount=c["amount"][i],
+                    account_id=c["account_id"][i],
+                    memo=c["memo"][i],
+                    reconciled=c["reconciled"][i],
+                )
+            )
+        book.touch()
+        return book
+
+    def to_book(self) -> Book:
+        """
+        load the complete book
+
+        Returns:
+            Book: the ledger book
+        """
+        book = self.table_to_book(self.read_table())
+        return book
+
+    def filter(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        remove_unused_accounts: bool = True,
+    ) -> Book:
+        """
+        Filter the transactions based on the given date range
+        scanning only the matching year partitions.
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+
+        Returns:
+            Book: a book with the filtered transactions in insertion order as Book.filter
+        """
+        # read_table keeps the transaction and split order
+        table = self.read_table(start_date, end_date)
+        table = table.filter(pc.is_valid(table.column("date")))
+        book = self.table_to_book(table)
+        if remove_unused_accounts:
+            book.remove_unused_accounts()
+        return book
+
+    def to_split_store(self, table: Optional["pa.Table"] = None) -> SplitStore:
+        """
+        create a columnar split store from the split rows - the numeric
+        columns are handed to NumPy without copying where Arrow allows it
+
+        Args:
+            table (pa.Table): the split rows - defaults to the complete dataset
+
+        Returns:
+            SplitStore: the split store for the vectorized balance calculation
+        """
+        if table is None:
+            table = self.read_table()
+        table = table.combine_chunks()
+        tx_pos = table.column("tx_pos").to_numpy()
+        # first row of every transaction
+        tx_starts = np.flatnonzero(np.diff(tx_pos, prepend=-1) != 0)
+        tx_rows = table.take(pa.array(tx_starts))
+        split_mask = table.column("split_pos").to_numpy() >= 0
+        splits = table.filter(pa.array(split_mask))
+        account_ids = list(self.accounts.keys())
+        store = SplitStore(
+            account_ids,
+            tx_rows.column("transaction_id").to_pylist(),
+            scale=self.scale,
+        )
+        store.descriptions = self._string_table(tx_rows, "description")
+        store.payees = self._string_table(tx_rows, "payee")
+        store.tx_description_idx = self._codes(tx_rows, "description")
+        store.tx_payee_idx = self._codes(tx_rows, "payee")
+        # memos of transactions and splits share one table
+        memos = pa.concat_arrays(
+            [
+                tx_rows.column("tx_memo").combine_chunks(),
+                splits.column("memo").combine_chunks(),
+            ]
+        ).dictionary_encode()
+        store.memos = StringTable.of(memos.dictionary.to_pylist())
+        memo_codes = memos.indices.fill_null(-1).to_numpy().astype(np.int32)
+        store.tx_memo_idx = memo_codes[: len(tx_rows)]
+        store.memo_idx = memo_codes[len(tx_rows) :]
+        # convert each distinct date only once
+        dates = tx_rows.column("date").combine_chunks().dictionary_encode()
+        ordinals = np.array(
+            [DateUtils.iso_to_ordinal(d) for d in dates.dictionary.to_pylist()] + [0],
+            dtype=np.int32,
+        )
+        date_codes = dates.indices.fill_null(len(dates.dictionary)).to_numpy()
+        store.tx_dates = ordinals[date_codes]
+        store.isodates = self._string_table(tx_rows, "isodate")
+        store.tx_isodate_idx = self._codes(tx_rows, "isodate")
+        split_counts = np.bincount(
+            np.searchsorted(tx_starts, np.flatnonzero(split_mask), side="right") - 1,
+            minlength=len(tx_starts),
+        )
+        store.tx_split_start = np.concatenate(([0], np.cumsum(split_counts))).astype(
+            np.int64
+        )
+        store.tx_idx = np.repeat(
+            np.arange(len(tx_starts), dtype=np.int32), split_counts
+        )
+        store.dates = store.tx_dates[store.tx_idx]
+        # amount_minor has no nulls so this is a zero-copy view
+        if splits.num_rows:
+            store.amounts = splits.column("amount_minor").chunk(0).to_numpy()
+        account_column = splits.column("account_id")
+        account_idx = pc.index_in(
+            account_column, value_set=pa.array(account_ids, type=pa.string())
+        )
+        store.account_idx = account_idx.fill_null(-1).to_numpy().astype(np.int32)
+        store.reconciled = splits.column("reconciled").to_numpy()
+        is_none = splits.column("is_none").to_numpy()
+        has_amount = pc.is_valid(splits.column("amount")).to_numpy()
+        store.valid = ~is_none & has_amount
+        account_values = account_column.to_pylist()
+        store.unknown_account_ids = {
+            int(i): account_values[i]
+            for i in np.flatnonzero((store.account_idx < 0) & ~is_none)
+            if account_values[i] is not None
+        }
+        return store
+
+    def _string_table(self, table: "pa.Table", name: str) -> StringTable:
+        """
+        get the string table of the distinct values of the given column
+        """
+        encoded = table.column(name).combine_chunks().dictionary_encode()
+        return StringTable.of(encoded.dictionary.to_pylist())
+
+    def _codes(self, table: "pa.Table", name: str) -> np.ndarray:
+        """
+        get the string table codes of the given column - -1 for None
+        """
+        encoded = table.column(name).combine_chunks().dictionary_encode()
+        return encoded.indices.fill_null(-1).to_numpy().astype(np.int32)
+
+    def calc_balances(self) -> Dict[str, Optional[float]]:
+        """
+        calculate the balances of all accounts from the split columns
+        including propagation up the account hierarchy
+
+        Returns:
+            Dict[str, Optional[float]]: the balances by account id or None if unused
+        """
+        store = self.to_split_store()
+        sums, counts = store.account_sums()
+        tree = AccountTree(self.accounts)
+        sums, counts = tree.rollup_arrays(store.account_ids, sums, counts)
+        balances: Dict[str, Optional[float]] = {}
+        for account_id, total, count in zip(
+            store.account_ids, sums.tolist(), counts.tolist()
+        ):
+            balances[account_id] = (
+                Amount.from_minor(total, self.scale) if count else None
+            )
+        return balances
+
+    @classmethod
+    def is_dataset(cls, path: str) -> bool:
+        """
+        check whether the given path is a Parquet Ledger Book dataset
+        """
+        return os.path.isfile(os.path.join(path, cls.metadata_file))
@@ -0,0 +1,92 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from pathlib import Path
+
+from nomina.ledger import Book as LedgerBook
+from nomina.nomina_converter import BaseFromLedgerConverter, BaseToLedgerConverter
+from nomina.parquet_book import ParquetBook
+
+
+class ParquetToLedgerConverter(BaseToLedgerConverter):
+    """
+    Convert a Parquet Ledger Book dataset to a Ledger Book
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(from_format_acronym="LB-PARQUET", debug=debug)
+        self.parquet_book = None
+
+    def load(self, input_path: str) -> ParquetBook:
+        """
+        open the Parquet dataset
+
+        Args:
+            input_path (str): the path of the dataset directory
+
+        Returns:
+            ParquetBook: the dataset
+        """
+        self.parquet_book = ParquetBook.open(input_path)
+        return self.parquet_book
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        load the Ledger Book from the dataset
+        """
+        ledger_book = self.parquet_book.to_book()
+        return ledger_book
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the target book
+        """
+        if self.debug:
+            self.target.get_stats().show()
+
+    def to_text(self) -> str:
+        """
+        create the output text
+        """
+        yaml_str = self.target.to_yaml()
+        return yaml_str
+
+
+class LedgerToParquetConverter(BaseFromLedgerConverter):
+    """
+    Convert a Ledger Book to a Parquet dataset partitioned by year
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(to_format_acronym="LB-PARQUET", debug=debug)
+
+    def set_source(self, source: LedgerBook):
+        self.source = source
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        the dataset is written on save
+        """
+        return self.source
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the source book
+        """
+        if self.debug:
+            self.source.get_stats().show()
+
+    def save(self, output_path: Path):
+        """
+        save the Ledger Book as a Parquet dataset in the given directory
+        """
+        ParquetBook.save(self.source, str(output_path))
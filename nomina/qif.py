@@ -8,16 +8,30 @@ see https://en.wikipedia.org/wiki/Quicken_Interchange_Format
 @author: wf
 """
 
+import io
 import logging
 import os
 import re
 from collections import Counter
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import dataclass, field
-from datetime import datetime
-from typing import Any, Dict, List, Optional
+from itertools import chain, islice
+from typing import (
+    Any,
+    ClassVar,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Pattern,
+    Tuple,
+)
 
 from basemkit.yamlable import lod_storable
 
+from nomina.amount import Amount
+from nomina.compressed_file import CompressedFile
 from nomina.date_utils import DateUtils
 from nomina.stats import Stats
 
@@ -48,6 +62,8 @@ class SplitCategory:
     has_pipe: bool = False
     has_slash: bool = False
 
+    account_pattern: ClassVar[Pattern] = re.compile(r"\[(?P<account_name>[^\]]+)\]")
+
     def __post_init__(self):
         """
         parse my target string
@@ -57,10 +73,8 @@ class SplitCategory:
         # qif holds the markup which still needs processing
         qif = self.markup
 
-        pattern = r"\[(?P<account_name>[^\]]+)\]"
-
-        # Search for the pattern in the split_category string
-        match = re.search(pattern, self.markup)
+        # Search for the account pattern in the split_category string
+        match = self.account_pattern.search(self.markup) if "[" in qif else None
 
         if match:
             # Extract the account name from the named group
@@ -145,23 +159,29 @@ class Transaction(ParseRecord):
         extract details
         """
         self.amount_float: Optional[float] = None
+        self.amount_minor: Optional[int] = None
         self.split_amounts_float: List[float] = []
+        self.split_amounts_minor: List[int] = []
         self.normalize()
         pass
 
-    def normalize(self):
+    def normalize(self, date_formats: Optional[List[str]] = None):
         """
         Normalize the transaction data, converting string amounts to floats.
+
+        Args:
+            date_formats (List[str], optional): the date formats to try e.g. with the
+                dominant format of the file first - default: DateUtils.default_formats
         """
         try:
             if self.isodate:
-                self.isodate = DateUtils.parse_date(self.isodate)
+                self.isodate = DateUtils.parse_date(self.isodate, date_formats)
         except Exception as ex:
             self.errors["date"] = ex
 
         try:
             if self.amount:
-                self.amount_float = self.parse_amount(self.amount)
+                self.amount_minor, self.amount_float = Amount.parse(self.amount)
         except Exception as ex:
             self.errors["amount"] = ex
 
@@ -171,25 +191,27 @@ class Transaction(ParseRecord):
             else:
                 self.memo = self.name
 
-        self.split_amounts_float = []
-        for i, amount in enumerate(self.split_amounts):
-            try:
-                self.split_amounts_float.append(self.parse_amount(amount))
-            except Exception as ex:
-                self.errors[f"split{i}"].append(ex)
-
-    def parse_amount(self, amount_str: str) -> float:
-        # Remove any currency symbols and whitespace
-        cleaned_str = re.sub(r"[^\d,.-]", "", amount_str)
-        # Replace comma with dot if comma is used as decimal separator
-        if "," in cleaned_str and "." not in cleaned_str:
-            cleaned_str = cleaned_str.replace(",", ".")
-        elif "," in cleaned_str and "." in cleaned_str:
-            cleaned_str = cleaned_str.replace(",", "")
         try:
-            return float(cleaned_str)
+            self.split_amounts_minor, self.split_amounts_float = Amount.parse_many(
+                self.split_amounts
+            )
         except ValueError:
-            raise ValueError(f"Unable to parse amount: {amount_str}")
+            # keep the parseable split amounts and record the others as errors
+            self.split_amounts_minor, self.split_amounts_float = [], []
+            for i, amount in enumerate(self.split_amounts):
+                try:
+                    minor, amount_float = Amount.parse(amount)
+                    self.split_amounts_minor.append(minor)
+                    self.split_amounts_float.append(amount_float)
+                except ValueError as ex:
+                    self.errors[f"split{i}"] = ex
+
+    def parse_amount(self, amount_str: str) -> float:
+        """
+        parse the given amount string to a float
+        """
+        _minor, amount_float = Amount.parse(amount_str)
+        return amount_float
 
     def total_split_amount(self) -> float:
         """
@@ -200,6 +222,7 @@ class Transaction(ParseRecord):
         """
         return sum(self.split_amounts_float)
 
+
 class QifField:
     """
     A QIF field with possible
@@ -208,10 +231,10 @@ class QifField:
     marker meaning might also be unclear - denoted by a None field_name
 
     """
-    def __init__(self,
-        marker: str,
-        field_name: str = None,
-        context_fields: Dict[str, str] = None):
+
+    def __init__(
+        self, marker: str, field_name: str = None, context_fields: Dict[str, str] = None
+    ):
         """
         Args:
             marker: QIF marker character
@@ -227,7 +250,9 @@ class QifField:
         field_name = self.context_fields.get(record_type, self.field_name)
         return field_name
 
-    def add_line_value_to_record(self, line: str, record_type: str, current_record: dict):
+    def add_line_value_to_record(
+        self, line: str, record_type: str, current_record: dict
+    ):
         """
         handle a QIF line for this field by adding the value
         to the record with the field being resolved according
@@ -249,6 +274,7 @@ class QifField:
         else:
             current_record[key] = value
 
+
 @lod_storable
 class SimpleQifParser:
     """
@@ -258,7 +284,17 @@ class SimpleQifParser:
     name: Optional[str] = None
     currency: str = "EUR"
     default_account_type = "EXPENSE"
+    # the section types of the transactions of an account
+    transaction_types = {"Bank", "Cash", "CCard", "Invst", "Oth A", "Oth L"}
+    # the Transaction list fields of the S, E and $ split lines
+    split_fields = {
+        "split_category": "split_categories",
+        "split_memo": "split_memos",
+        "split_amount": "split_amounts",
+    }
     default_category = "UndefinedCategory"
+    # the number of lines at the start of a file to sniff the dominant date format from
+    sniff_lines = 1000
     options: Dict[str, str] = field(default_factory=dict)
     classes: Dict[str, QifClass] = field(default_factory=dict)
     categories: Dict[str, Category] = field(default_factory=dict)
@@ -269,6 +305,10 @@ class SimpleQifParser:
 
     def __post_init__(self):
         self.current_account = None
+        # if False the parsed transactions are only yielded and not kept
+        self.keep_transactions = True
+        # the date formats with the dominant format of the file first
+        self.date_formats: Optional[List[str]] = None
         self.qif_fields = {
             "$": QifField("$", "split_amount"),
             "~": QifField("~"),
@@ -278,7 +318,9 @@ class SimpleQifParser:
             "A": QifField("A", "address"),
             "B": QifField("B"),
             "C": QifField("C", "cleared"),
-            "D": QifField("D", "isodate", {"Cat": "description", "Class": "description"}),
+            "D": QifField(
+                "D", "isodate", {"Cat": "description", "Class": "description"}
+            ),
             "E": QifField("E", "split_memo"),
             "F": QifField("F"),
             "G": QifField("G"),
@@ -295,7 +337,7 @@ class SimpleQifParser:
             "T": QifField("T", "amount", {"Account": "account_type"}),
             "U": QifField("U", "amount_unknown"),
             "V": QifField("V"),
-            "Y": QifField("Y")
+            "Y": QifField("Y"),
         }
 
     def parse_file(
@@ -305,6 +347,7 @@ class SimpleQifParser:
         name: str = None,
         verbose: bool = False,
         debug: bool = False,
+        workers: int = 1,
     ):
         """
         parse a qif file
@@ -315,23 +358,121 @@ class SimpleQifParser:
             name (str): name to set if None use the basename of the qif_file
             verbose (bool): if True give verbose output
             debug (bool): if True show debug output
+            workers (int): if > 1 parse chunks of the file with this number of processes -
+                compressed files are parsed sequentially as a stream
+        """
+        if workers > 1 and not CompressedFile.is_compressed(qif_file):
+            self.name = name if name else os.path.basename(qif_file)
+            self.parse_parallel(
+                qif_file,
+                workers=workers,
+                encoding=encoding,
+                verbose=verbose,
+                debug=debug,
+            )
+            return
+        for _key, _record in self.iter_file(
+            qif_file,
+            encoding=encoding,
+            name=name,
+            keep_transactions=True,
+            verbose=verbose,
+            debug=debug,
+        ):
+            pass
+
+    def iter_file(
+        self,
+        qif_file: str,
+        encoding="iso-8859-1",
+        name: str = None,
+        keep_transactions: bool = False,
+        verbose: bool = False,
+        debug: bool = False,
+    ) -> Iterator[Tuple[str, ParseRecord]]:
+        """
+        parse a qif file as a stream yielding each record as soon as it is complete
+
+        Args:
+            qif_file (str): Path to the input QIF file.
+            encoding (str): File encoding. Defaults to 'iso-8859-1'.
+            name (str): name to set if None use the basename of the qif_file
+            keep_transactions (bool): if True also keep the transactions - accounts,
+                classes and categories are always kept for lookups
+            verbose (bool): if True give verbose output
+            debug (bool): if True show debug output
+
+        Yields:
+            Tuple[str, ParseRecord]: the key and the Account, QifClass, Category or Transaction
         """
         if name is None:
             name = os.path.basename(qif_file)
         self.name = name
-        with open(qif_file, "r", encoding=encoding) as file:
-            content = file.readlines()
-        self.parse(content, verbose=verbose, debug=debug)
+        self.keep_transactions = keep_transactions
+        with CompressedFile.open(qif_file, "r", encoding=encoding) as file:
+            lines = self.sniff_date_formats(file)
+            yield from self.iter_records(lines, verbose=verbose, debug=debug)
 
     def parse(self, lines: List[str], verbose: bool = False, debug: bool = False):
         """
         parse the given list of lines
         """
+        lines = self.sniff_date_formats(lines)
+        for _key, _record in self.iter_records(lines, verbose=verbose, debug=debug):
+            pass
+
+    def sniff_date_formats(self, lines: Iterable[str]) -> Iterator[str]:
+        """
+        sniff the dominant date format of a file once from the D lines
+        at its start so that the dates are parsed with it first
+
+        Args:
+            lines (Iterable[str]): the lines e.g. an open file
+
+        Returns:
+            Iterator[str]: all lines including the sniffed ones
+        """
+        lines = iter(lines)
+        head = list(islice(lines, self.sniff_lines))
+        stripped = (line.strip() for line in head)
+        dominant = DateUtils.sniff_format(
+            line[1:] for line in stripped if line.startswith("D")
+        )
+        if dominant is not None:
+            self.date_formats = [dominant] + [
+                date_format
+                for date_format in DateUtils.default_formats
+                if date_format != dominant
+            ]
+        return chain(head, lines)
+
+    def iter_records(
+        self,
+        lines: Iterable[str],
+        verbose: bool = False,
+        debug: bool = False,
+        first_line: int = 1,
+        record_type: Optional[str] = None,
+    ) -> Iterator[Tuple[str, ParseRecord]]:
+        """
+        parse the given lines yielding each record as soon as its
+        terminating ^ or the next section header is reached
+
+        Args:
+            lines (Iterable[str]): the lines e.g. a list or an open file
+            verbose (bool): if True give verbose output
+            debug (bool): if True show debug output
+            first_line (int): the line number of the first line e.g. of a chunk
+            record_type (str): the record type of the section the lines start in
+
+        Yields:
+            Tuple[str, ParseRecord]: the key and the Account, QifClass, Category or Transaction
+        """
         current_record = {}
-        record_type = None
-        start_line = 1
+        start_line = first_line
+        line_num = first_line - 1
 
-        for line_num, line in enumerate(lines, 1):
+        for line_num, line in enumerate(lines, first_line):
             line = line.strip()
             if not line:
                 continue
@@ -349,7 +490,7 @@ class SimpleQifParser:
                 self.options[option] = False
             elif line.startswith("!Type:") or line.startswith("!Account"):
                 if current_record:
-                    self._add_record(
+                    yield from self._add_record(
                         record_type, current_record, start_line, line_num - 1
                     )
                 if line.startswith("!Account"):
@@ -361,7 +502,9 @@ class SimpleQifParser:
                 start_line = line_num + 1
             elif line == "^":
                 if current_record:
-                    self._add_record(record_type, current_record, start_line, line_num)
+                    yield from self._add_record(
+                        record_type, current_record, start_line, line_num
+                    )
                 current_record = {}
                 start_line = line_num + 1
 
@@ -377,7 +520,208 @@ class SimpleQifParser:
                 self.errors.append(error)
 
         if current_record:
-            self._add_record(record_type, current_record, start_line, len(lines))
+            yield from self._add_record(
+                record_type, current_record, start_line, line_num
+            )
+
+    def parse_parallel(
+        self,
+        qif_file: str,
+        workers: int = os.cpu_count(),
+        encoding: str = "iso-8859-1",
+        verbose: bool = False,
+        debug: bool = False,
+    ):
+        """
+        parse the given file in chunks split at ^ record boundaries
+        with a process pool and merge the results in file order - each
+        worker reads its own byte range of the file
+
+        Args:
+            qif_file (str): Path to the uncompressed input QIF file.
+            workers (int): the number of worker processes
+            encoding (str): File encoding. Defaults to 'iso-8859-1'.
+            verbose (bool): if True give verbose output
+            debug (bool): if True show debug output
+        """
+        with open(qif_file, "r", encoding=encoding) as file:
+            self.sniff_date_formats(file)
+        chunks = self.get_chunks(qif_file, workers * 4, encoding=encoding)
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            futures = [
+                executor.submit(
+                    SimpleQifParser.parse_chunk,
+                    qif_file,
+                    *chunk,
+                    date_formats=self.date_formats,
+                    encoding=encoding,
+                    verbose=verbose,
+                    debug=debug,
+                )
+                for chunk in chunks
+            ]
+            for future in futures:
+                self.merge(future.result())
+
+    def get_chunks(
+        self, qif_file: str, count: int, encoding: str = "iso-8859-1"
+    ) -> List[Tuple[int, int, int, Optional[str], List[str], str]]:
+        """
+        split the given file into about count byte ranges ending after ^ lines
+        together with the parse context at the start of each range - the file
+        is scanned once without keeping its lines
+
+        Args:
+            qif_file (str): Path to the uncompressed input QIF file.
+            count (int): the number of chunks to aim for
+            encoding (str): File encoding. Defaults to 'iso-8859-1'.
+
+        Returns:
+            List[Tuple[int, int, int, Optional[str], List[str], str]]: the start and
+            end offset, the line number of the first line, the record type, the lines
+            of the current !Account section and the currency
+        """
+        size = os.path.getsize(qif_file)
+        euro = "€".encode(encoding, errors="ignore") or None
+        targets = [size * i // count for i in range(1, count)]
+        chunks = []
+        # the context at the start of the current chunk
+        chunk_start = (0, 1, None, [], self.currency)
+        record_type = None
+        account_lines: List[str] = []
+        in_account = False
+        currency = self.currency
+        offset = 0
+        with open(qif_file, "rb") as file:
+            for line_num, line in enumerate(file, 1):
+                offset += len(line)
+                stripped = line.strip()
+                if stripped.startswith(b"!Type:") or stripped.startswith(b"!Account"):
+                    header = stripped.decode(encoding)
+                    in_account = header.startswith("!Account")
+                    record_type = "Account" if in_account else header[6:]
+                    account_lines = (
+                        [line.decode(encoding)] if in_account else account_lines
+                    )
+                elif in_account:
+                    account_lines.append(line.decode(encoding))
+                if stripped.startswith(b"$"):
+                    currency = "USD"
+                elif euro and stripped.startswith(euro):
+                    currency = "EUR"
+                if (
+                    stripped == b"^"
+                    and targets
+                    and offset > targets[0]
+                    and offset < size
+                ):
+                    chunks.append((chunk_start[0], offset) + chunk_start[1:])
+                    chunk_start = (
+                        offset,
+                        line_num + 1,
+                        record_type,
+                        list(account_lines),
+                        currency,
+                    )
+                    while targets and targets[0] < offset:
+                        targets.pop(0)
+        chunks.append((chunk_start[0], size) + chunk_start[1:])
+        return chunks
+
+    @classmethod
+    def parse_chunk(
+        cls,
+        qif_file: str,
+        start: int,
+        end: int,
+        first_line: int,
+        record_type: Optional[str],
+        account_lines: List[str],
+        currency: str,
+        date_formats: Optional[List[str]] = None,
+        encoding: str = "iso-8859-1",
+        verbose: bool = False,
+        debug: bool = False,
+    ) -> "SimpleQifParser":
+        """
+        parse the given byte range of a file in the given context - runs in a worker process
+
+        Args:
+            qif_file (str): Path to the uncompressed input QIF file.
+            start (int): the offset of the first byte
+            end (int): the offset after the last byte
+            first_line (int): the line number of the first line
+            record_type (str): the record type of the section the chunk starts in
+            account_lines (List[str]): the lines of the !Account section the chunk belongs to
+            currency (str): the currency at the start of the chunk
+            date_formats (List[str], optional): the date formats sniffed from the whole file
+            encoding (str): File encoding. Defaults to 'iso-8859-1'.
+            verbose (bool): if True give verbose output
+            debug (bool): if True show debug output
+
+        Returns:
+            SimpleQifParser: the parser with the records of the chunk
+        """
+        with open(qif_file, "rb") as file:
+            file.seek(start)
+            data = file.read(end - start)
+        parser = cls()
+        if account_lines:
+            # only establish the current account - the account itself is part of another chunk
+            for _record in parser.iter_records(account_lines):
+                pass
+            parser.accounts = {}
+        parser.currency = currency
+        parser.date_formats = date_formats
+        lines = io.TextIOWrapper(io.BytesIO(data), encoding=encoding)
+        for _record in parser.iter_records(
+            lines,
+            verbose=verbose,
+            debug=debug,
+            first_line=first_line,
+            record_type=record_type,
+        ):
+            pass
+        return parser
+
+    def merge(self, other: "SimpleQifParser"):
+        """
+        merge the records parsed by the given chunk parser into mine
+
+        Args:
+            other (SimpleQifParser): the parser of the next chunk
+        """
+        self.options.update(other.options)
+        self.accounts.update(other.accounts)
+        self.classes.update(other.classes)
+        self.categories.update(other.categories)
+        self.errors.extend(other.errors)
+        for tx_id, tx in other.transactions.items():
+            if tx.account is not None:
+                # refer to the merged account
+                tx.account = self.accounts.get(tx.account.name, tx.account)
+            self.transactions[tx_id] = tx
+        self.currency = other.currency
+        if other.current_account is not None:
+            self.current_account = self.accounts.get(
+                other.current_account.name, other.current_account
+            )
+
+    def iter_parsed(self) -> Iterator[Tuple[str, ParseRecord]]:
+        """
+        iterate over the records kept by a previous parse - the accounts,
+        classes and categories first followed by the transactions
+
+        Yields:
+            Tuple[str, ParseRecord]: the key and the Account, QifClass, Category or Transaction
+        """
+        for records in [
+            self.accounts,
+            self.classes,
+            self.categories,
+            self.transactions,
+        ]:
+            yield from records.items()
 
     def _add_account(
         self,
@@ -386,10 +730,14 @@ class SimpleQifParser:
         description: str,
         start_line,
         end_line,
-    ) -> Account:
+    ) -> List[Tuple[str, Account]]:
         """
         add an account for the given parameters making sure the parent account is created if need be
+
+        Returns:
+            List[Tuple[str, Account]]: the added accounts - the parent first if it was created
         """
+        added = []
         parts = account_name.split(":")
         name = parts[-1]
         parent_name = ":".join(parts[:-1]) if len(parts) > 1 else None
@@ -404,6 +752,7 @@ class SimpleQifParser:
                 start_line=start_line,
                 end_line=end_line,
             )
+            added.append((parent_name, self.accounts[parent_name]))
         account = Account(
             name=name,
             description=description,
@@ -414,13 +763,17 @@ class SimpleQifParser:
             end_line=end_line,
         )
         self.accounts[account.name] = account
-        return account
+        added.append((account.name, account))
+        return added
 
     def _add_record(
         self, record_type: str, record: Dict[str, Any], start_line: int, end_line: int
-    ):
+    ) -> List[Tuple[str, ParseRecord]]:
         """
         add the given record
+
+        Returns:
+            List[Tuple[str, ParseRecord]]: the keys and the added records
         """
         record["_start_line"] = start_line
         record["_end_line"] = end_line
@@ -430,13 +783,14 @@ class SimpleQifParser:
             account_name = record.get("name", "")
             account_type = account_type = record.get("account_type")
             description = record.get("description", "")
-            self.current_account = self._add_account(
+            added = self._add_account(
                 account_name,
                 account_type=account_type,
                 description=description,
                 start_line=start_line,
                 end_line=end_line,
             )
+            self.current_account = added[-1][1]
         elif record_type == "Class":
             qclass = QifClass(
                 name=record.get("name", ""),
@@ -445,6 +799,7 @@ class SimpleQifParser:
                 end_line=end_line,
             )
             self.classes[qclass.name] = qclass
+            added = [(qclass.name, qclass)]
         elif record_type == "Cat":
             cat = Category(
                 name=record.get("name", ""),
@@ -453,16 +808,25 @@ class SimpleQifParser:
                 end_line=end_line,
             )
             self.categories[cat.name] = cat
+            added = [(cat.name, cat)]
         else:
             tx = self.tx_for_record(record)
             if self.current_account:
+                if (
+                    self.current_account.account_type == self.default_account_type
+                    and record_type in self.transaction_types
+                ):
+                    # an !Account record without T gets the type of its transactions
+                    self.current_account.account_type = record_type
                 tx.account = self.current_account
                 account_name = self.current_account.name
                 tx_id = f"{account_name}:{tx.isodate}:{tx.start_line}"
             else:
                 tx_id = f"{tx.isodate}:{tx.start_line}"
-
-            self.transactions[tx_id] = tx
+            if self.keep_transactions:
+                self.transactions[tx_id] = tx
+            added = [(tx_id, tx)]
+        return added
 
     def tx_for_record(self, t):
         """
@@ -473,8 +837,8 @@ class SimpleQifParser:
         for key, value in t.items():
             if key.startswith("_"):
                 continue
-            setattr(transaction, key, value)
-        transaction.normalize()
+            setattr(transaction, self.split_fields.get(key, key), value)
+        transaction.normalize(self.date_formats)
         return transaction
 
     def get_lod(self) -> List[Dict[str, Any]]:
@@ -486,15 +850,15 @@ class SimpleQifParser:
         """
         lod = []
         for tx in self.transactions.values():
-            split_category=None
+            split_category = None
             if tx.split_categories:
-                split_category=",".join(tx.split_categories)
-            split_memo=None
+                split_category = ",".join(sc.markup for sc in tx.split_categories)
+            split_memo = None
             if tx.split_memos:
-                split_memo=",".join(tx.split_memos)
-            split_amount=None
+                split_memo = ",".join(tx.split_memos)
+            split_amount = None
             if tx.split_amounts:
-                split_amount=",".join(map(str, tx.split_amounts))
+                split_amount = ",".join(map(str, tx.split_amounts))
             record = {
                 # "tx_id": f"{self.current_account.name}:{tx.isodate}:{tx.start_line}",
                 # "account": self.current_account.name,
@@ -543,14 +907,13 @@ class SimpleQifParser:
             )
 
     def get_stats(self) -> Stats:
-        dates = [
-            datetime.strptime(tx.isodate, "%Y-%m-%d")
-            for tx in self.transactions.values()
-            if tx.isodate
-        ]
+        iso_dates = DateUtils.parse_dates(
+            [tx.isodate for tx in self.transactions.values()], ["%Y-%m-%d"]
+        )
+        dates = [iso_date for iso_date in iso_dates if iso_date]
         if dates:
-            min_date = min(dates).strftime("%Y-%m-%d")
-            max_date = max(dates).strftime("%Y-%m-%d")
+            min_date = min(dates)
+            max_date = max(dates)
         else:
             min_date = max_date = None
 
@@ -4,11 +4,22 @@ Created on 2024-10-04
 @author: wf
 """
 
-from typing import List
-
-from nomina.ledger import Account, Book, Split, Transaction
-from nomina.nomina_converter import BaseToLedgerConverter
-from nomina.qif import SimpleQifParser, SplitCategory
+import io
+import os
+import shutil
+import tempfile
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import IO, Deque, Dict, List, Optional, Set, Tuple
+
+from nomina.amount import Amount
+from nomina.compressed_file import CompressedFile
+from nomina.date_utils import DateUtils
+from nomina.ledger import Account, Book, BookListener, Split, Transaction
+from nomina.nomina_converter import BaseFromLedgerConverter, BaseToLedgerConverter
+from nomina.qif import Account as QifAccount
+from nomina.qif import Category as QifCategory
+from nomina.qif import ParseRecord, QifClass, SimpleQifParser, SplitCategory
 from nomina.qif import Transaction as QifTransaction
 
 
@@ -17,27 +28,57 @@ class QifToLedgerConverter(BaseToLedgerConverter):
     Convert Quicken QIF file to a Ledger Book.
     """
 
-    def __init__(self, debug: bool = False):
+    # the account type of transfer accounts that are not declared (yet)
+    transfer_account_type = "Bank"
+
+    def __init__(
+        self, debug: bool = False, merge_transfers: bool = False, workers: int = 1
+    ):
         """
         Constructor for QIF to Ledger Book conversion.
 
         Args:
             debug (bool): Whether to enable debug logging.
+            merge_transfers (bool): if True merge the mirrored halves of transfers
+                between accounts of a multi-account export into one transaction -
+                the memo and reconciled state of the second half are not kept
+            workers (int): if > 1 parse chunks of the file with this number of
+                processes before converting instead of streaming the records
         """
         super().__init__(from_format_acronym="QIF", debug=debug)
         self.qif_parser = SimpleQifParser()
+        # the QIF file to be parsed as a stream while converting
+        self.input_path = None
+        # resolution of "[transfer account]" and category names to ledger account ids
+        self.resolution: Dict[str, str] = {}
+        self.merge_transfers = merge_transfers
+        self.workers = workers
+        # unmatched transfer halves by (date, account pair, amount) and side
+        self.transfer_index: Dict[Tuple, Deque[str]] = defaultdict(deque)
+        self.merged_transfers = 0
 
     def load(self, input_path: str):
         """
-        Load the content from the input stream.
+        Prepare streaming the given QIF file - the records are parsed
+        while converting so that only accounts, classes and categories are kept.
         """
-        self.qif_parser.parse_file(input_path)
         self.set_source(self.qif_parser)
+        self.input_path = input_path
+        self.qif_parser.name = os.path.basename(input_path)
         return self.qif_parser
 
     def set_source(self, source: SimpleQifParser):
         self.qif_parser = source
         self.source = source
+        self.input_path = None
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the target book - the streamed
+        transactions are not kept by the parser
+        """
+        if self.debug:
+            self.target.get_stats().show()
 
     def to_text(self) -> str:
         """
@@ -45,46 +86,206 @@ class QifToLedgerConverter(BaseToLedgerConverter):
         """
         return self.target.to_yaml()
 
-    def create_account_lookup(self, ledger_book: Book):
+    def register_account(self, account: Account):
         """
-        Create a lookup of account names to Account objects from the QIF data.
+        Add the resolution entries for the given ledger account:
+        "[account_id]" for transfers and the account_id for categories
+        with "Category:<name>" accounts as fallback for the plain category name.
 
         Args:
-            ledger_book (Book): The ledger book to populate with accounts to use
-            for lookup
+            account (Account): the ledger account
         """
-        # Create root accounts for classes and categories
-        ledger_book.create_account("Class", account_type="CLASS",description="root class")
-        ledger_book.create_account("Category", account_type="CATEGORY",description="root category")
-        ledger_book.create_account("Dangling", account_type="ERROR",description="dangling-error accounts")
+        account_id = account.account_id
+        self.resolution[f"[{account_id}]"] = account_id
+        # regular accounts take precedence over categories
+        self.resolution[account_id] = account_id
+        if account_id.startswith("Category:"):
+            self.resolution.setdefault(account_id[len("Category:") :], account_id)
+
+    def create_root_accounts(self, ledger_book: Book):
+        """
+        Create the root accounts for classes, categories and dangling references.
 
-        # Create accounts from QIF data
-        for account_name, account_data in self.qif_parser.accounts.items():
-            parent_account_id = account_data.parent_account_id
-            ledger_book.create_account(
-                name=account_name,
-                account_type=account_data.account_type,
-                description=account_data.description,
-                parent_account_id=parent_account_id,
+        Args:
+            ledger_book (Book): The ledger book to add the accounts to
+        """
+        self.resolution = {}
+        for name, account_type, description in [
+            ("Class", "CLASS", "root class"),
+            ("Category", "CATEGORY", "root category"),
+            ("Dangling", "ERROR", "dangling-error accounts"),
+        ]:
+            account = ledger_book.create_account(
+                name, account_type=account_type, description=description
             )
+            self.register_account(account)
 
-        # Create accounts for classes
-        for class_name, class_data in self.qif_parser.classes.items():
-            ledger_book.create_account(
-                name=class_name,
+    def add_record_account(self, ledger_book: Book, key: str, record: ParseRecord):
+        """
+        Create the ledger account for the given QIF account, class or category record.
+
+        Args:
+            ledger_book (Book): The ledger book to add the account to
+            key (str): the name of the record
+            record (ParseRecord): the QIF Account, QifClass or Category
+        """
+        account = None
+        if isinstance(record, QifAccount):
+            placeholder = ledger_book.lookup_account(self.ledger_account_id(record))
+            if placeholder is not None:
+                # complete the placeholder of a forward transfer reference
+                placeholder.account_type = record.account_type
+                placeholder.description = record.description
+                ledger_book.add_account(placeholder)
+                return
+            account = ledger_book.create_account(
+                name=key,
+                account_type=record.account_type,
+                description=record.description,
+                parent_account_id=record.parent_account_id,
+            )
+        elif isinstance(record, QifClass):
+            account = ledger_book.create_account(
+                name=key,
                 account_type="CLASS",
-                description=class_data.description,
-                parent_account_id="Class"
+                description=record.description,
+                parent_account_id="Class",
             )
-
-        # Create accounts for categories
-        for category_name, category_data in self.qif_parser.categories.items():
-            ledger_book.create_account(
-                name=category_name,
+        elif isinstance(record, QifCategory):
+            account = ledger_book.create_account(
+                name=key,
                 account_type="CATEGORY",
-                description=category_data.description,
+                description=record.description,
                 parent_account_id="Category",
             )
+        if account is not None:
+            self.register_account(account)
+
+    def resolve_split_account_id(self, split_category: SplitCategory) -> Optional[str]:
+        """
+        Resolve the account id the given split category refers to
+        with a single lookup in the resolution table.
+
+        Args:
+            split_category (SplitCategory): The split category.
+
+        Returns:
+            Optional[str]: the account id or None if it is not known (yet)
+        """
+        if split_category.account:
+            account_id = self.resolution.get(f"[{split_category.account}]")
+        elif split_category.category:
+            account_id = self.resolution.get(split_category.category)
+        else:
+            account_id = None
+        return account_id
+
+    def lookup_split_account(
+        self, split_category: SplitCategory, ledger_book: Book
+    ) -> Optional[Account]:
+        """
+        Look up the account the given split category refers to.
+
+        Args:
+            split_category (SplitCategory): The split category.
+            ledger_book (Book): The ledger book containing accounts.
+
+        Returns:
+            Optional[Account]: the account or None if it is not known (yet)
+        """
+        account_id = self.resolve_split_account_id(split_category)
+        account = ledger_book.lookup_account(account_id) if account_id else None
+        return account
+
+    def target_split_categories(self, qt: QifTransaction) -> List[SplitCategory]:
+        """
+        get the split categories the amounts of the given QIF transaction go to
+
+        Args:
+            qt (QifTransaction): The QIF transaction
+
+        Returns:
+            List[SplitCategory]: the split categories
+        """
+        if qt.split_categories and qt.split_amounts_float:
+            split_categories = list(qt.split_categories)
+        else:
+            split_categories = [
+                SplitCategory(qt.category if qt.category else "Dangling")
+            ]
+        return split_categories
+
+    def ledger_account_id(self, qif_account: QifAccount) -> str:
+        """
+        get the id of the ledger account for the given QIF account
+
+        Args:
+            qif_account (QifAccount): the QIF account e.g. 'Bank' with parent 'Assets'
+
+        Returns:
+            str: the ledger account id e.g. 'Assets:Bank'
+        """
+        if qif_account.parent_account_id:
+            return f"{qif_account.parent_account_id}:{qif_account.name}"
+        return qif_account.name
+
+    def add_forward_accounts(self, qt: QifTransaction, ledger_book: Book):
+        """
+        create placeholder accounts for the accounts the given QIF transaction
+        refers to that are only declared later in the file so that the
+        transaction can be converted right away - the !Account record
+        completes the placeholder when it arrives.
+
+        Forward references are transfers e.g. '[Savings]' and categories
+        naming a sub account of a known account e.g. 'Expenses:Computer'.
+        Other unknown categories go to the Dangling account since the
+        category list precedes the transactions.
+
+        Args:
+            qt (QifTransaction): The QIF transaction
+            ledger_book (Book): The ledger book containing accounts.
+        """
+        for split_category in self.target_split_categories(qt):
+            if self.resolve_split_account_id(split_category) is not None:
+                continue
+            if split_category.account:
+                self.add_placeholder_account(
+                    ledger_book, split_category.account, self.transfer_account_type
+                )
+            elif split_category.category:
+                parent_id = split_category.category.rpartition(":")[0]
+                if parent_id and self.resolution.get(parent_id) == parent_id:
+                    self.add_placeholder_account(ledger_book, split_category.category)
+
+    def add_placeholder_account(
+        self, ledger_book: Book, account_id: str, account_type: str = None
+    ) -> Account:
+        """
+        create a placeholder account with the given id and its missing parents
+
+        Args:
+            ledger_book (Book): The ledger book to add the account to
+            account_id (str): the id of the account e.g. 'Assets:Savings'
+            account_type (str): the account type - defaults to the one of the parser
+
+        Returns:
+            Account: the placeholder account
+        """
+        if account_type is None:
+            account_type = self.qif_parser.default_account_type
+        parent_id, _, name = account_id.rpartition(":")
+        if parent_id and ledger_book.lookup_account(parent_id) is None:
+            self.add_placeholder_account(ledger_book, parent_id, account_type)
+        account = Account(
+            account_id=account_id,
+            name=name,
+            description="",
+            account_type=account_type,
+            parent_account_id=parent_id or None,
+        )
+        ledger_book.add_account(account)
+        self.register_account(account)
+        return account
 
     def add_split(
         self,
@@ -112,36 +313,25 @@ class QifToLedgerConverter(BaseToLedgerConverter):
         Raises:
             ValueError: If the target is not found in the ledger book.
         """
-        qt_msg = str(qt)
-        account=None
         # determine the account
         if split_category is None:
             return
-        else:
-            if split_category.account:
-                account = ledger_book.lookup_account(split_category.account)
-            elif split_category.category:
-                # try regular account first
-                account = ledger_book.lookup_account(split_category.category)
-                # if that does not work fallback to trying lookup the category
-                if not account:
-                    account_name = f"Category:{split_category.category}"
-                    account = ledger_book.lookup_account(account_name)
+        account_id = self.resolve_split_account_id(split_category)
 
-        if account is None:
-            msg = f"invalid split category {split_category} for {qt_msg}"
+        if account_id is None:
+            # the message is only formatted when the warning is emitted
+            msg = f"invalid split category {split_category} for {qt}"
             self.log.log("⚠️", "split", msg)
-            account = ledger_book.lookup_account("Dangling")
-            pass
+            account_id = "Dangling"
 
         if amount is None:
-            self.log.log(f"⚠️", "amount", f"no amount for {qt_msg}")
+            self.log.log(f"⚠️", "amount", f"no amount for {qt}")
             amount = 0.0
 
         if negative:
             amount = -amount
 
-        split = Split(amount=amount, account_id=account.account_id, memo=memo)
+        split = Split(amount=amount, account_id=account_id, memo=memo)
         return split
 
     def calc_splits(self, qt: Transaction, ledger_book: Book) -> List[Split]:
@@ -156,13 +346,18 @@ class QifToLedgerConverter(BaseToLedgerConverter):
             List[Split]: A list of splits for the transaction.
         """
         splits = []
-        transaction_account = ledger_book.lookup_account(qt.account.name)
+        transaction_account = ledger_book.lookup_account(
+            self.ledger_account_id(qt.account)
+        )
 
         if transaction_account is None:
-            qt_msg = str(qt)
-            msg = f"unknown account {qt.account.name} in {qt_msg}"
+            msg = f"unknown account {qt.account.name} in {qt}"
             self.log.log("⚠️", "account", msg)
             return []
+        if transaction_account.account_type != qt.account.account_type:
+            # the type of an !Account record without T is known from its transactions
+            transaction_account.account_type = qt.account.account_type
+            ledger_book.add_account(transaction_account)
 
         # Handle split transactions
         if qt.split_categories and qt.split_amounts_float:
@@ -178,10 +373,10 @@ class QifToLedgerConverter(BaseToLedgerConverter):
             )
 
             # Create credit splits for each split category
-            for i in range(len(qt.split_category)):
-                split_category = qt.split_category[i]
+            for i in range(len(qt.split_categories)):
+                split_category = qt.split_categories[i]
                 split_amount = qt.split_amounts_float[i]
-                split_memo = qt.split_memo[i] if i < len(qt.split_memo) else ""
+                split_memo = qt.split_memos[i] if i < len(qt.split_memos) else ""
 
                 splits.append(
                     self.add_split(
@@ -201,17 +396,14 @@ class QifToLedgerConverter(BaseToLedgerConverter):
             )
             splits.append(debit_split)
             # Create credit split for the category account (source of funds)
-            if not qt.category:
-                category="Dangling"
-            else:
-                category=qt.category
-            split_category=SplitCategory(category)
-            credit_split=self.add_split(qt,
+            split_category = self.target_split_categories(qt)[0]
+            credit_split = self.add_split(
+                qt,
                 ledger_book,
                 amount=qt.amount_float,
                 split_category=split_category,
                 memo=qt.memo,
-                negative=True
+                negative=True,
             )
             splits.append(credit_split)
         return splits
@@ -220,28 +412,491 @@ class QifToLedgerConverter(BaseToLedgerConverter):
         """
         Convert the QIF content to a Ledger Book.
 
+        When loaded from a file the records are consumed as they are parsed
+        and each transaction is converted right away: transfers to accounts
+        that are only declared later get a placeholder account and unknown
+        categories go to the Dangling account.
+
         Returns:
             Book: A ledger book containing accounts and transactions.
         """
         # Create a new Book instance
-        ledger_book = Book()
-        ledger_book.name = self.source.name
+        ledger_book = self.new_book(name=self.source.name)
+        self.create_root_accounts(ledger_book)
+        self.transfer_index.clear()
+        self.merged_transfers = 0
+        if self.input_path and self.workers > 1:
+            self.qif_parser.parse_file(
+                self.input_path, name=self.qif_parser.name, workers=self.workers
+            )
+            records = self.qif_parser.iter_parsed()
+        elif self.input_path:
+            records = self.qif_parser.iter_file(
+                self.input_path, name=self.qif_parser.name
+            )
+        else:
+            records = self.qif_parser.iter_parsed()
+        for key, record in records:
+            if isinstance(record, QifTransaction):
+                self.add_forward_accounts(record, ledger_book)
+                self.add_ledger_transaction(ledger_book, key, record)
+            else:
+                self.add_record_account(ledger_book, key, record)
+        self.target = ledger_book
+        return ledger_book
 
-        # Create accounts map from QIF data
-        self.create_account_lookup(ledger_book)
+    def transfer_key(
+        self, qt: QifTransaction, splits: List[Split]
+    ) -> Optional[Tuple[Tuple, str]]:
+        """
+        get the transfer index key of the given QIF transaction
 
-        # Add transactions to the ledger book
-        for transaction_id, qt in self.qif_parser.transactions.items():
-            splits = self.calc_splits(qt, ledger_book)
+        Args:
+            qt (QifTransaction): the QIF transaction
+            splits (List[Split]): its ledger splits
 
-            ledger_transaction = Transaction(
-                isodate=qt.isodate,
-                description=qt.memo,
-                splits=splits,
-                payee=qt.payee,
-                memo=qt.memo,
+        Returns:
+            Optional[Tuple[Tuple, str]]: the (date, account pair, amount) key with the
+            amount seen from the first account of the pair and the account of the
+            side the transaction was exported from - None if it is not a simple
+            transfer between two accounts
+        """
+        if len(splits) != 2 or qt.split_categories or qt.amount_minor is None:
+            return None
+        split_category = self.target_split_categories(qt)[0]
+        if not split_category.account:
+            return None
+        side, other = splits[0].account_id, splits[1].account_id
+        if side == other or other == "Dangling":
+            return None
+        minor = qt.amount_minor
+        if side < other:
+            key = (qt.isodate, side, other, minor)
+        else:
+            key = (qt.isodate, other, side, -minor)
+        return key, side
+
+    def match_transfer(
+        self, transaction_id: str, qt: QifTransaction, splits: List[Split]
+    ) -> Optional[str]:
+        """
+        match the given QIF transaction against the unmatched transfer halves
+        exported from the other account with a single hash lookup
+
+        Args:
+            transaction_id (str): the id of the transaction
+            qt (QifTransaction): the QIF transaction
+            splits (List[Split]): its ledger splits
+
+        Returns:
+            Optional[str]: the id of the mirrored transaction or None if there is
+            no match yet - the transaction is then indexed as unmatched half
+        """
+        transfer_key = self.transfer_key(qt, splits)
+        if transfer_key is None:
+            return None
+        key, side = transfer_key
+        # the pair of a key is sorted so the other side is the remaining account
+        other_side = key[2] if side == key[1] else key[1]
+        pending = self.transfer_index.get((key, other_side))
+        if pending:
+            # identical transfers on the same day are matched in file order
+            return pending.popleft()
+        self.transfer_index[(key, side)].append(transaction_id)
+        return None
+
+    def add_ledger_transaction(
+        self, ledger_book: Book, transaction_id: str, qt: QifTransaction
+    ) -> Transaction:
+        """
+        Convert the given QIF transaction and add it to the ledger book.
+
+        Args:
+            ledger_book (Book): The ledger book to add the transaction to
+            transaction_id (str): the id of the transaction
+            qt (QifTransaction): The QIF transaction
+
+        Returns:
+            Transaction: the added ledger transaction or the transaction
+            the given mirrored transfer half has been merged into
+        """
+        splits = self.calc_splits(qt, ledger_book)
+        if self.merge_transfers:
+            merged_id = self.match_transfer(transaction_id, qt, splits)
+            if merged_id is not None:
+                self.merged_transfers += 1
+                msg = f"merged transfer {transaction_id} into {merged_id}"
+                self.log.log("✅", "transfer", msg)
+                return ledger_book.transactions[merged_id]
+        ledger_transaction = Transaction(
+            isodate=qt.isodate,
+            description=qt.memo,
+            splits=splits,
+            payee=qt.payee,
+            memo=qt.memo,
+        )
+        ledger_book.add_transaction(transaction_id, ledger_transaction)
+        return ledger_transaction
+
+
+class LedgerQifWriter(BookListener):
+    """
+    incremental writer of a Quicken Interchange Format (QIF) file - as a Book
+    listener each account and transaction record is written as soon as it is
+    added to the book being converted so that only the accounts are kept in memory.
+
+    Accounts below the "Category" root and INCOME and EXPENSE accounts become
+    !Type:Cat records, accounts below the "Class" root !Type:Class records and
+    all other accounts !Account records. The category and class lists are written
+    before the transactions - when streaming the transaction records are spooled
+    to a temporary file until the book is finished. Each transaction is written
+    in the !Account section of its main split - the first split of an !Account
+    account - and the !Account record is written when its first transaction is.
+    """
+
+    # QIF account types of ledger account types
+    account_types = {
+        "ASSET": "Oth A",
+        "BANK": "Bank",
+        "CASH": "Cash",
+        "CREDIT": "CCard",
+        "LIABILITY": "Oth L",
+        "MUTUAL": "Invst",
+        "STOCK": "Invst",
+        "RECEIVABLE": "Oth A",
+        "PAYABLE": "Oth L",
+        "EQUITY": "Oth L",
+    }
+    # QIF account types that are also transaction section types
+    transaction_types = {"Bank", "Cash", "CCard", "Invst", "Oth A", "Oth L"}
+    # the ledger account types written as categories
+    category_types = {"INCOME", "EXPENSE"}
+    # the roots created by the QIF import that are not written
+    roots = {"Category", "Class", "Dangling"}
+    # QIF dates have no time - one of the formats the QIF import parses
+    date_format = "%d/%m/%Y"
+
+    def __init__(self, stream: IO[str]):
+        """
+        constructor
+
+        Args:
+            stream (IO[str]): the output stream
+        """
+        self.stream = stream
+        # the output stream - the stream is a spool file while streaming
+        self.output = stream
+        # the current !Type: or !Account section
+        self.section: Optional[str] = None
+        # the account_id of the current !Account
+        self.current_account_id: Optional[str] = None
+        # True if accounts or transactions are written as they are added
+        self.streamed = False
+        # the accounts added but not written yet by account_id
+        self.pending: Dict[str, Account] = {}
+        # the account_ids of the written records
+        self.written: Set[str] = set()
+
+    @classmethod
+    def open(cls, file_path: str, encoding: str = "iso-8859-1") -> "LedgerQifWriter":
+        """
+        open a writer for the given file
+
+        Args:
+            file_path (str): the path of the QIF file
+            encoding (str): the file encoding - defaults to the encoding of the SimpleQifParser
+
+        Returns:
+            LedgerQifWriter: the writer
+        """
+        stream = CompressedFile.open(
+            file_path, "w", encoding=encoding, errors="replace"
+        )
+        writer = cls(stream)
+        return writer
+
+    def __enter__(self) -> "LedgerQifWriter":
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def close(self):
+        """
+        close the output stream
+        """
+        if self.stream is not self.output:
+            self.stream.close()
+        self.output.close()
+
+    def _write_section(self, section: str):
+        """
+        start the given section if it is not the current one
+        """
+        if section != self.section:
+            header = "!Account" if section == "Account" else f"!Type:{section}"
+            self.stream.write(f"{header}\n")
+            self.section = section
+
+    def _write_record(self, fields: List[Tuple[str, Optional[str]]]):
+        """
+        write a record with the given marker/value fields skipping None values
+        """
+        lines = []
+        for marker, value in fields:
+            if value is not None:
+                # a QIF value may not span lines
+                value = str(value).replace("\r", " ").replace("\n", " ")
+                lines.append(f"{marker}{value}\n")
+        lines.append("^\n")
+        self.stream.write("".join(lines))
+
+    def qif_kind(self, account: Account) -> Tuple[Optional[str], str]:
+        """
+        get the QIF record kind and name of the given ledger account
+
+        Args:
+            account (Account): the ledger account
+
+        Returns:
+            Tuple[Optional[str], str]: 'Cat', 'Class', 'Account' or None for
+            accounts that are not written and the QIF name
+        """
+        account_id = account.account_id
+        if account_id in self.roots:
+            return None, account_id
+        root, _, name = account_id.partition(":")
+        if root == "Category" and name:
+            return "Cat", name
+        if root == "Class" and name:
+            return "Class", name
+        if (account.account_type or "").upper() in self.category_types:
+            return "Cat", account_id
+        return "Account", account_id
+
+    def qif_account_type(self, account: Account) -> str:
+        """
+        get the QIF account type of the given ledger account - one of the
+        transaction types e.g. 'Bank' or 'Oth A'
+        """
+        account_type = (account.account_type or "Bank").upper()
+        qif_type = self.account_types.get(account_type)
+        if qif_type is None:
+            # e.g. 'CCard' or 'Oth L' of a QIF import
+            qif_type = next(
+                (t for t in self.transaction_types if t.upper() == account_type),
+                "Bank",
             )
+        return qif_type
 
-            ledger_book.transactions[transaction_id] = ledger_transaction
-        self.target = ledger_book
-        return ledger_book
+    def write_account(self, account: Account):
+        """
+        write the record for the given ledger account
+        """
+        kind, name = self.qif_kind(account)
+        self.pending.pop(account.account_id, None)
+        if kind is None:
+            return
+        self.written.add(account.account_id)
+        self._write_section(kind)
+        if kind == "Account":
+            self._write_record(
+                [
+                    ("N", name),
+                    ("T", self.qif_account_type(account)),
+                    ("D", account.description or None),
+                ]
+            )
+            self.current_account_id = account.account_id
+        else:
+            fields = [("N", name), ("D", account.description or None)]
+            if kind == "Cat":
+                # the income or expense flag
+                income = (account.account_type or "").upper() == "INCOME"
+                fields.append(("I" if income else "E", ""))
+            self._write_record(fields)
+
+    def add_account(self, account: Account):
+        """
+        add the given account to be written when it is needed - an account
+        that has already been written e.g. as a placeholder is not written again
+        """
+        if account.account_id not in self.written:
+            self.pending[account.account_id] = account
+
+    def write_pending(self, kinds: Tuple[str, ...] = ("Cat", "Class", "Account")):
+        """
+        write the pending records of the given kinds in the order of the kinds
+        """
+        for kind in kinds:
+            for account in list(self.pending.values()):
+                if self.qif_kind(account)[0] == kind:
+                    self.write_account(account)
+
+    def split_target(self, book: Book, split: Split) -> Optional[str]:
+        """
+        get the QIF L/S value for the given split
+
+        Args:
+            book (Book): the book with the accounts
+            split (Split): the split
+
+        Returns:
+            Optional[str]: '[account]' for transfers, the category name or None for dangling splits
+        """
+        account = book.lookup_account(split.account_id)
+        if account is None:
+            return None
+        kind, name = self.qif_kind(account)
+        if kind == "Account":
+            return f"[{name}]"
+        if kind in ("Cat", "Class"):
+            return name
+        return None
+
+    def format_amount(self, amount: Optional[float], account: Account) -> str:
+        """
+        format the given amount exactly with the scale of the currency of the given account -
+        finer amounts e.g. of crypto currencies keep all their decimals
+        """
+        scale = Amount.scale_of_amounts([amount], Amount.scale(account.currency))
+        return str(Amount.to_decimal(Amount.to_minor(amount, scale), scale))
+
+    def write_transaction(self, book: Book, transaction: Transaction):
+        """
+        write the record for the given ledger transaction in the
+        !Account section of its main split - split transactions
+        with more than two splits get S/E/$ lines
+        """
+        splits = [split for split in transaction.splits if split is not None]
+        main_split = None
+        for split in splits:
+            account = book.lookup_account(split.account_id)
+            if account is not None and self.qif_kind(account)[0] == "Account":
+                main_split = split
+                break
+        if main_split is None:
+            # there is no account section to write the transaction to
+            return
+        main_account = book.lookup_account(main_split.account_id)
+        if self.current_account_id != main_account.account_id:
+            self.write_account(main_account)
+        qif_type = self.qif_account_type(main_account)
+        self._write_section(qif_type if qif_type in self.transaction_types else "Bank")
+        memo = transaction.memo or transaction.description or None
+        fields = [
+            ("D", DateUtils.format_date(transaction.isodate, self.date_format)),
+            ("T", self.format_amount(main_split.amount, main_account)),
+            ("P", transaction.payee or None),
+            ("M", memo),
+        ]
+        others = [split for split in splits if split is not main_split]
+        # the QIF import uses the transaction memo for the category split
+        if len(others) == 1 and (others[0].memo or None) == memo:
+            fields.append(("L", self.split_target(book, others[0])))
+        else:
+            for split in others:
+                fields.extend(
+                    [
+                        ("S", self.split_target(book, split) or "Dangling"),
+                        # keep the E lines aligned with the S lines
+                        ("E", split.memo or ""),
+                        # split amounts are from the view of the main account
+                        ("$", self.format_amount(-(split.amount or 0.0), main_account)),
+                    ]
+                )
+        self._write_record(fields)
+
+    def write_book(self, book: Book):
+        """
+        write the complete given book
+        """
+        for account in book.accounts.values():
+            self.add_account(account)
+        self.write_pending(("Cat", "Class"))
+        for transaction in book.transactions.values():
+            self.write_transaction(book, transaction)
+        # the accounts without transactions
+        self.write_pending()
+
+    def start_streaming(self):
+        """
+        spool the transaction records until the lists are complete
+        """
+        if not self.streamed:
+            self.streamed = True
+            self.stream = tempfile.TemporaryFile("w+", encoding="utf-8")
+
+    def on_account(self, book: Book, account: Account):
+        self.start_streaming()
+        self.add_account(account)
+
+    def on_transaction(self, book: Book, transaction_id: str, transaction: Transaction):
+        self.start_streaming()
+        self.write_transaction(book, transaction)
+
+    def on_finished(self, book: Book):
+        if not self.streamed:
+            # the book was not built via add_account/add_transaction
+            self.write_book(book)
+            return
+        spool, spool_section = self.stream, self.section
+        self.stream, self.section = self.output, None
+        # the categories and classes precede the transactions
+        self.write_pending(("Cat", "Class"))
+        spool.seek(0)
+        shutil.copyfileobj(spool, self.stream)
+        spool.close()
+        self.section = spool_section
+        # the accounts without transactions
+        self.write_pending()
+
+
+class LedgerToQifConverter(BaseFromLedgerConverter):
+    """
+    Convert a Ledger Book to a Quicken Interchange Format (QIF) file
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(to_format_acronym="QIF", debug=debug)
+
+    def set_source(self, source: Book):
+        self.source = source
+
+    def convert_to_target(self) -> Book:
+        """
+        the records are written on save
+        """
+        return self.source
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the source book
+        """
+        if self.debug:
+            self.source.get_stats().show()
+
+    def to_text(self) -> str:
+        """
+        get the QIF text of the source book
+        """
+        stream = io.StringIO()
+        LedgerQifWriter(stream).write_book(self.source)
+        return stream.getvalue()
+
+    def open_listener(self, output_path: Path) -> Optional[BookListener]:
+        """
+        open a writer that writes the records while the book is being converted
+        """
+        writer = LedgerQifWriter.open(str(output_path))
+        return writer
+
+    def save(self, output_path: Path):
+        """
+        save the Ledger Book as QIF record by record
+        """
+        with LedgerQifWriter.open(str(output_path)) as writer:
+            writer.write_book(self.source)
@@ -0,0 +1,246 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from itertools import accumulate
+from typing import TYPE_CHECKING, Dict, Iterable, List, Optional, Tuple
+
+from nomina.amount import Amount
+
+if TYPE_CHECKING:
+    from nomina.ledger import Transaction
+
+
+@dataclass
+class RegisterEntry:
+    """
+    a single posting of an account register with its running balance
+    """
+
+    isodate: str
+    transaction_id: str
+    split_pos: int
+    amount: float
+    balance: float
+
+
+class AccountRegister:
+    """
+    the date ordered postings of a single account with an exact
+    cumulative sum in integer minor units
+
+    postings that are not the latest ones are collected and merged with
+    a single sort and cumulative sum when the register is read next so
+    that loading an unsorted file costs O(n log n)
+    """
+
+    def __init__(self, scale: int = Amount.default_scale):
+        """
+        constructor
+
+        Args:
+            scale (int): the number of decimal places of the minor units
+        """
+        self.scale = scale
+        # 'YYYY-MM-DD' date keys - undated postings have an empty key and come first
+        self.dates: List[str] = []
+        self.transaction_ids: List[str] = []
+        self.split_positions: List[int] = []
+        self.amounts: List[int] = []
+        self.balances: List[int] = []
+        # out of order (date_key, transaction_id, split_pos, amount) postings
+        self.pending: List[Tuple[str, str, int, int]] = []
+
+    def __len__(self) -> int:
+        self.merge_pending()
+        return len(self.dates)
+
+    def merge_pending(self):
+        """
+        merge the pending out of order postings with one stable sort
+        and recalculate the cumulative sums
+        """
+        if not self.pending:
+            return
+        postings = list(
+            zip(self.dates, self.transaction_ids, self.split_positions, self.amounts)
+        )
+        postings.extend(self.pending)
+        self.pending = []
+        # postings of the same date keep their insertion order
+        postings.sort(key=lambda posting: posting[0])
+        self.dates = [posting[0] for posting in postings]
+        self.transaction_ids = [posting[1] for posting in postings]
+        self.split_positions = [posting[2] for posting in postings]
+        self.amounts = [posting[3] for posting in postings]
+        self.balances = list(accumulate(self.amounts))
+
+    @property
+    def balance_minor(self) -> int:
+        """
+        the current balance of the account in minor units
+        """
+        self.merge_pending()
+        return self.balances[-1] if self.balances else 0
+
+    @property
+    def balance(self) -> float:
+        """
+        the current balance of the account
+        """
+        return Amount.from_minor(self.balance_minor, self.scale)
+
+    def add(self, date_key: str, transaction_id: str, split_pos: int, amount: int):
+        """
+        add a posting keeping the date order and updating the cumulative sums
+
+        postings of the same date are kept in insertion order - appending
+        the latest postings costs O(1), earlier postings are merged on the next read
+
+        Args:
+            date_key (str): the 'YYYY-MM-DD' date of the posting
+            transaction_id (str): the id of the transaction
+            split_pos (int): the position of the split in the transaction
+            amount (int): the amount in minor units
+        """
+        if self.pending or (self.dates and date_key < self.dates[-1]):
+            self.pending.append((date_key, transaction_id, split_pos, amount))
+            return
+        self.dates.append(date_key)
+        self.transaction_ids.append(transaction_id)
+        self.split_positions.append(split_pos)
+        self.amounts.append(amount)
+        self.balances.append(self.balance_minor + amount)
+
+    def remove(self, date_key: str, transaction_id: str):
+        """
+        remove the postings of the given transaction at the given date
+        """
+        self.merge_pending()
+        lo = bisect_left(self.dates, date_key)
+        hi = bisect_right(self.dates, date_key)
+        for pos in range(hi - 1, lo - 1, -1):
+            if self.transaction_ids[pos] == transaction_id:
+                amount = self.amounts[pos]
+                del self.dates[pos]
+                del self.transaction_ids[pos]
+                del self.split_positions[pos]
+                del self.amounts[pos]
+                del self.balances[pos]
+                for i in range(pos, len(self.balances)):
+                    self.balances[i] -= amount
+
+    def balance_minor_as_of(self, isodate: str) -> int:
+        """
+        get the balance at the end of the given date in minor units
+
+        Args:
+            isodate (str): the date in 'YYYY-MM-DD' format
+
+        Returns:
+            int: the running balance including all postings up to the given date
+        """
+        self.merge_pending()
+        pos = bisect_right(self.dates, isodate)
+        return self.balances[pos - 1] if pos > 0 else 0
+
+    def balance_as_of(self, isodate: str) -> float:
+        """
+        get the balance at the end of the given date
+        """
+        return Amount.from_minor(self.balance_minor_as_of(isodate), self.scale)
+
+    def entries(self) -> Iterable[RegisterEntry]:
+        """
+        iterate over the register entries
+        """
+        self.merge_pending()
+        for i in range(len(self.dates)):
+            yield RegisterEntry(
+                isodate=self.dates[i],
+                transaction_id=self.transaction_ids[i],
+                split_pos=self.split_positions[i],
+                amount=Amount.from_minor(self.amounts[i], self.scale),
+                balance=Amount.from_minor(self.balances[i], self.scale),
+            )
+
+
+class RunningBalances:
+    """
+    per account running balances of a ledger Book
+    maintained incrementally as transactions are added or removed
+    """
+
+    def __init__(self, scale: int = Amount.default_scale):
+        """
+        constructor
+
+        Args:
+            scale (int): the number of decimal places of the minor units
+        """
+        self.scale = scale
+        self.registers: Dict[str, AccountRegister] = {}
+
+    @staticmethod
+    def date_key(transaction: "Transaction") -> str:
+        """
+        get the 'YYYY-MM-DD' date key of the given transaction
+        """
+        date_key = transaction.isodate.split()[0] if transaction.isodate else ""
+        return date_key
+
+    def get_register(self, account_id: str) -> Optional[AccountRegister]:
+        """
+        get the register of the given account
+        """
+        return self.registers.get(account_id)
+
+    def add_transaction(self, transaction_id: str, transaction: "Transaction"):
+        """
+        add the postings of the given transaction - splits without amount are skipped
+        """
+        date_key = self.date_key(transaction)
+        for split_pos, split in enumerate(transaction.splits):
+            if split is not None and split.amount is not None:
+                register = self.registers.get(split.account_id)
+                if register is None:
+                    register = AccountRegister(self.scale)
+                    self.registers[split.account_id] = register
+                amount = Amount.to_minor(split.amount, self.scale)
+                register.add(date_key, transaction_id, split_pos, amount)
+
+    def remove_transaction(self, transaction_id: str, transaction: "Transaction"):
+        """
+        remove the postings of the given transaction
+        """
+        date_key = self.date_key(transaction)
+        account_ids = {split.account_id for split in transaction.splits if split}
+        for account_id in account_ids:
+            register = self.registers.get(account_id)
+            if register is not None:
+                register.remove(date_key, transaction_id)
+
+    def balance(self, account_id: str) -> float:
+        """
+        get the current balance of the given account
+        """
+        register = self.registers.get(account_id)
+        return register.balance if register else 0.0
+
+    def balance_minor_as_of(self, account_id: str, isodate: str) -> int:
+        """
+        get the balance of the given account at the end of the given date in minor units
+        """
+        register = self.registers.get(account_id)
+        return register.balance_minor_as_of(isodate) if register else 0
+
+    def balance_as_of(self, account_id: str, isodate: str) -> float:
+        """
+        get the balance of the given account at the end of the given date
+        """
+        register = self.registers.get(account_id)
+        return register.balance_as_of(isodate) if register else 0.0
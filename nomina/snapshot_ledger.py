@@ -0,0 +1,94 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from pathlib import Path
+
+from nomina.book_snapshot import BookSnapshot
+from nomina.ledger import Book as LedgerBook
+from nomina.nomina_converter import BaseFromLedgerConverter, BaseToLedgerConverter
+
+
+class SnapshotToLedgerConverter(BaseToLedgerConverter):
+    """
+    Convert a binary Ledger Book snapshot to a Ledger Book
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(from_format_acronym="LB-BIN", debug=debug)
+        self.snapshot = None
+
+    def load(self, input_path: str) -> BookSnapshot:
+        """
+        open the snapshot file
+
+        Args:
+            input_path (str): the path of the snapshot file
+
+        Returns:
+            BookSnapshot: the memory mapped snapshot
+        """
+        self.snapshot = BookSnapshot.open(input_path)
+        return self.snapshot
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        materialize the Ledger Book from the snapshot
+        """
+        with self.snapshot:
+            ledger_book = self.snapshot.to_book(self.new_book())
+        return ledger_book
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the target book
+        """
+        if self.debug:
+            self.target.get_stats().show()
+
+    def to_text(self) -> str:
+        """
+        create the output text
+        """
+        yaml_str = self.target.to_yaml()
+        return yaml_str
+
+
+class LedgerToSnapshotConverter(BaseFromLedgerConverter):
+    """
+    Convert a Ledger Book to a binary snapshot
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(to_format_acronym="LB-BIN", debug=debug)
+
+    def set_source(self, source: LedgerBook):
+        self.source = source
+
+    def convert_to_target(self) -> BookSnapshot:
+        """
+        create the snapshot of the Ledger Book
+        """
+        snapshot = BookSnapshot.from_book(self.source)
+        return snapshot
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the source book
+        """
+        if self.debug:
+            self.source.get_stats().show()
+
+    def save(self, output_path: Path):
+        """
+        save the snapshot to the given binary file
+        """
+        self.target.save(str(output_path))
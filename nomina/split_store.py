@@ -0,0 +1,434 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from copy import copy
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
+
+import numpy as np
+
+from nomina.amount import Amount
+from nomina.date_utils import DateUtils
+
+if TYPE_CHECKING:
+    from nomina.ledger import Book, Split, Transaction
+
+
+class StringTable:
+    """
+    a table of interned strings addressed by compact integer codes
+    """
+
+    def __init__(self):
+        """
+        constructor
+        """
+        self.strings: List[str] = []
+        self.codes: Dict[str, int] = {}
+
+    def __len__(self) -> int:
+        return len(self.strings)
+
+    @classmethod
+    def of(cls, strings: List[str]) -> "StringTable":
+        """
+        create a string table for the given distinct strings -
+        the codes are only indexed when interning new strings
+
+        Args:
+            strings (List[str]): the strings in code order
+
+        Returns:
+            StringTable: the string table
+        """
+        table = cls()
+        table.strings = strings
+        table.codes = None
+        return table
+
+    def intern(self, value: Optional[str]) -> int:
+        """
+        get the code for the given string adding it to the table if need be
+
+        Args:
+            value (str): the string to intern
+
+        Returns:
+            int: the code of the string or -1 for None
+        """
+        if value is None:
+            return -1
+        if self.codes is None:
+            # the strings given to of may be shared e.g. with a snapshot
+            self.strings = list(self.strings)
+            self.codes = {string: i for i, string in enumerate(self.strings)}
+        code = self.codes.get(value)
+        if code is None:
+            code = len(self.strings)
+            self.codes[value] = code
+            self.strings.append(value)
+        return code
+
+    def lookup(self, code: int) -> Optional[str]:
+        """
+        get the string for the given code
+
+        Args:
+            code (int): the code to look up
+
+        Returns:
+            Optional[str]: the string or None for code -1
+        """
+        if code < 0:
+            return None
+        return self.strings[code]
+
+
+class SplitStore:
+    """
+    columnar, array-backed store of the splits of a ledger Book
+
+    every split is a row in a set of parallel NumPy arrays:
+    amount in int64 minor units, account index, date ordinal and transaction index.
+    Memos, payees, descriptions and ISO dates are kept in interned string tables.
+
+    The store is derived from the accounts and transactions of a Book and kept
+    next to them - it speeds up bulk operations, it does not replace the objects.
+    Added transactions are collected as rows and appended to the columns
+    in one go by flush.
+    """
+
+    # column name -> dtype of the columns that rows are appended to
+    split_columns = {
+        "amounts": np.int64,
+        "account_idx": np.int32,
+        "dates": np.int32,
+        "tx_idx": np.int32,
+        "memo_idx": np.int32,
+        "reconciled": bool,
+        "valid": bool,
+    }
+    transaction_columns = {
+        "tx_dates": np.int32,
+        "tx_split_start": np.int64,
+        "tx_payee_idx": np.int32,
+        "tx_memo_idx": np.int32,
+        "tx_description_idx": np.int32,
+        "tx_isodate_idx": np.int32,
+    }
+
+    def __init__(
+        self,
+        account_ids: List[str],
+        transaction_ids: List[str],
+        scale: int = Amount.default_scale,
+    ):
+        """
+        constructor
+
+        Args:
+            account_ids (List[str]): the account ids in account index order
+            transaction_ids (List[str]): the transaction ids in transaction index order
+            scale (int): the number of decimal places of the minor unit amounts
+        """
+        self.scale = scale
+        self.account_ids = account_ids
+        self.account_index: Dict[str, int] = {
+            account_id: i for i, account_id in enumerate(account_ids)
+        }
+        self.transaction_ids = transaction_ids
+        # string tables
+        self.memos = StringTable()
+        self.payees = StringTable()
+        self.descriptions = StringTable()
+        self.isodates = StringTable()
+        # split columns
+        self.amounts = np.zeros(0, dtype=np.int64)
+        self.account_idx = np.zeros(0, dtype=np.int32)
+        self.dates = np.zeros(0, dtype=np.int32)
+        self.tx_idx = np.zeros(0, dtype=np.int32)
+        self.memo_idx = np.zeros(0, dtype=np.int32)
+        self.reconciled = np.zeros(0, dtype=bool)
+        self.valid = np.zeros(0, dtype=bool)
+        # unknown account ids of splits with account_idx -1
+        self.unknown_account_ids: Dict[int, str] = {}
+        # transaction columns
+        self.tx_dates = np.zeros(0, dtype=np.int32)
+        self.tx_split_start = np.zeros(1, dtype=np.int64)
+        self.tx_payee_idx = np.zeros(0, dtype=np.int32)
+        self.tx_memo_idx = np.zeros(0, dtype=np.int32)
+        self.tx_description_idx = np.zeros(0, dtype=np.int32)
+        self.tx_isodate_idx = np.zeros(0, dtype=np.int32)
+        # column name -> rows added since the last flush
+        self.pending: Dict[str, list] = None
+
+    @property
+    def split_count(self) -> int:
+        return len(self.amounts)
+
+    @property
+    def transaction_count(self) -> int:
+        return len(self.transaction_ids)
+
+    @classmethod
+    def from_book(cls, book: "Book") -> "SplitStore":
+        """
+        create a split store for the given book
+
+        Args:
+            book (Book): the ledger book to convert
+
+        Returns:
+            SplitStore: the columnar representation of the book's splits
+        """
+        store = cls(
+            list(book.accounts.keys()),
+            [],
+            scale=book.get_scale(),
+        )
+        for transaction_id, tx in book.transactions.items():
+            store.add_transaction(transaction_id, tx)
+        store.flush()
+        return store
+
+    def add_transaction(self, transaction_id: str, tx: "Transaction"):
+        """
+        add the rows of the given transaction and its splits -
+        the columns are only extended on the next flush
+
+        Args:
+            transaction_id (str): the id of the transaction
+            tx (Transaction): the transaction to add
+        """
+        if self.pending is None:
+            self.pending = {
+                name: [] for name in {**self.split_columns, **self.transaction_columns}
+            }
+        p = self.pending
+        ti = len(self.transaction_ids)
+        self.transaction_ids.append(transaction_id)
+        tx_date = DateUtils.iso_to_ordinal(tx.isodate)
+        p["tx_dates"].append(tx_date)
+        p["tx_payee_idx"].append(self.payees.intern(tx.payee))
+        p["tx_memo_idx"].append(self.memos.intern(tx.memo))
+        p["tx_description_idx"].append(self.descriptions.intern(tx.description))
+        p["tx_isodate_idx"].append(self.isodates.intern(tx.isodate))
+        row = len(self.amounts) + len(p["amounts"])
+        for split in tx.splits:
+            if split is None:
+                p["amounts"].append(0)
+                p["account_idx"].append(-1)
+                p["memo_idx"].append(-1)
+                p["reconciled"].append(False)
+                p["valid"].append(False)
+            else:
+                p["amounts"].append(Amount.to_minor(split.amount, self.scale))
+                aidx = self.account_index.get(split.account_id, -1)
+                if aidx < 0:
+                    self.unknown_account_ids[row] = split.account_id
+                p["account_idx"].append(aidx)
+                p["memo_idx"].append(self.memos.intern(split.memo))
+                p["reconciled"].append(split.reconciled)
+                p["valid"].append(split.amount is not None)
+            p["dates"].append(tx_date)
+            p["tx_idx"].append(ti)
+            row += 1
+        p["tx_split_start"].append(row)
+
+    def flush(self):
+        """
+        append the pending rows to the columns
+        """
+        if not self.pending:
+            return
+        for columns in (self.split_columns, self.transaction_columns):
+            for name, dtype in columns.items():
+                rows = np.array(self.pending[name], dtype=dtype)
+                setattr(self, name, np.concatenate((getattr(self, name), rows)))
+        self.pending = None
+
+    def account_sums(self) -> Tuple[np.ndarray, np.ndarray]:
+        """
+        sum up the valid split amounts per account exactly in minor units
+
+        Returns:
+            Tuple[np.ndarray, np.ndarray]: the int64 sums and the number of valid splits per account index
+        """
+        mask = self.valid & (self.account_idx >= 0)
+        idx = self.account_idx[mask]
+        n = len(self.account_ids)
+        sums = np.zeros(n, dtype=np.int64)
+        np.add.at(sums, idx, self.amounts[mask])
+        counts = np.bincount(idx, minlength=n)
+        return sums, counts
+
+    def invalid_splits(self) -> List[Tuple[int, int, Optional[str]]]:
+        """
+        get the invalid splits
+
+        Returns:
+            List[Tuple[int, int, Optional[str]]]: 1-based transaction and split numbers
+            and the unknown account id (if any) of splits that are None, have no amount
+            or refer to an unknown account
+        """
+        invalid = []
+        for i in np.flatnonzero(~self.valid | (self.account_idx < 0)):
+            i = int(i)
+            ti = int(self.tx_idx[i])
+            si = i - int(self.tx_split_start[ti])
+            account_id = self.unknown_account_ids.get(i) if self.valid[i] else None
+            invalid.append((ti + 1, si + 1, account_id))
+        return invalid
+
+    def date_range(self) -> Tuple[Optional[str], Optional[str]]:
+        """
+        get the date range of the transactions
+
+        Returns:
+            Tuple[Optional[str], Optional[str]]: the minimum and maximum ISO date
+        """
+        dated = self.tx_dates[self.tx_dates > 0]
+        if len(dated) == 0:
+            return None, None
+        return DateUtils.ordinal_to_iso(dated.min()), DateUtils.ordinal_to_iso(
+            dated.max()
+        )
+
+    def date_mask(self, start_date: str = None, end_date: str = None) -> np.ndarray:
+        """
+        get a transaction mask for the given date range
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+
+        Returns:
+            np.ndarray: boolean mask of the dated transactions within the range
+        """
+        mask = self.tx_dates > 0
+        if start_date:
+            mask &= self.tx_dates >= DateUtils.iso_to_ordinal(start_date)
+        if end_date:
+            mask &= self.tx_dates <= DateUtils.iso_to_ordinal(end_date)
+        return mask
+
+    def select(self, tx_mask: np.ndarray) -> "SplitStore":
+        """
+        select the transactions of the given mask
+
+        Args:
+            tx_mask (np.ndarray): boolean mask over the transactions
+
+        Returns:
+            SplitStore: a store with only the selected transactions and their splits
+        """
+        tx_indices = np.flatnonzero(tx_mask)
+        store = SplitStore(
+            self.account_ids,
+            [self.transaction_ids[t] for t in tx_indices],
+            scale=self.scale,
+        )
+        # the string tables are shared
+        store.memos = self.memos
+        store.payees = self.payees
+        store.descriptions = self.descriptions
+        store.isodates = self.isodates
+        split_counts = np.diff(self.tx_split_start)
+        split_mask = np.repeat(tx_mask, split_counts)
+        split_indices = np.flatnonzero(split_mask)
+        store.amounts = self.amounts[split_mask]
+        store.account_idx = self.account_idx[split_mask]
+        store.dates = self.dates[split_mask]
+        store.memo_idx = self.memo_idx[split_mask]
+        store.reconciled = self.reconciled[split_mask]
+        store.valid = self.valid[split_mask]
+        store.tx_idx = np.repeat(
+            np.arange(len(tx_indices), dtype=np.int32), split_counts[tx_indices]
+        )
+        store.tx_dates = self.tx_dates[tx_mask]
+        store.tx_split_start = np.concatenate(
+            ([0], np.cumsum(split_counts[tx_indices]))
+        ).astype(np.int64)
+        store.tx_payee_idx = self.tx_payee_idx[tx_mask]
+        store.tx_memo_idx = self.tx_memo_idx[tx_mask]
+        store.tx_description_idx = self.tx_description_idx[tx_mask]
+        store.tx_isodate_idx = self.tx_isodate_idx[tx_mask]
+        if self.unknown_account_ids:
+            new_pos = {int(old): new for new, old in enumerate(split_indices)}
+            store.unknown_account_ids = {
+                new_pos[i]: account_id
+                for i, account_id in self.unknown_account_ids.items()
+                if i in new_pos
+            }
+        return store
+
+    def retain_accounts(self, keep: np.ndarray) -> "SplitStore":
+        """
+        reindex the store for a reduced set of accounts
+
+        Args:
+            keep (np.ndarray): boolean mask over the account indices to keep
+
+        Returns:
+            SplitStore: a store sharing the split columns with remapped account indices
+        """
+        store = copy(self)
+        store.account_ids = [self.account_ids[i] for i in np.flatnonzero(keep)]
+        store.account_index = {
+            account_id: i for i, account_id in enumerate(store.account_ids)
+        }
+        new_index = np.cumsum(keep, dtype=np.int32) - 1
+        new_index[~keep] = -1
+        store.account_idx = np.where(
+            self.account_idx >= 0, new_index[self.account_idx], -1
+        ).astype(np.int32)
+        return store
+
+    def to_split(self, i: int) -> "Split":
+        """
+        materialize the split with the given row index
+
+        Args:
+            i (int): the split row index
+
+        Returns:
+            Split: the split object
+        """
+        from nomina.ledger import Split
+
+        aidx = int(self.account_idx[i])
+        account_id = (
+            self.account_ids[aidx] if aidx >= 0 else self.unknown_account_ids.get(i)
+        )
+        split = Split(
+            amount=Amount.from_minor(self.amounts[i], self.scale),
+            account_id=account_id,
+            memo=self.memos.lookup(int(self.memo_idx[i])),
+            reconciled=bool(self.reconciled[i]),
+        )
+        return split
+
+    def to_transaction(self, t: int) -> "Transaction":
+        """
+        materialize the transaction with the given transaction index
+
+        Args:
+            t (int): the transaction index
+
+        Returns:
+            Transaction: the transaction object with its splits
+        """
+        from nomina.ledger import Transaction
+
+        start = int(self.tx_split_start[t])
+        end = int(self.tx_split_start[t + 1])
+        tx = Transaction(
+            isodate=self.isodates.lookup(int(self.tx_isodate_idx[t])),
+            description=self.descriptions.lookup(int(self.tx_description_idx[t])),
+            splits=[self.to_split(i) for i in range(start, end)],
+            payee=self.payees.lookup(int(self.tx_payee_idx[t])),
+            memo=self.memos.lookup(int(self.tx_memo_idx[t])),
+        )
+        return tx
@@ -0,0 +1,492 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+from dataclasses import fields
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from basemkit.persistent_log import Log
+from lodstorage.sql import SQLDB
+
+from nomina.account_tree import AccountTree
+from nomina.amount import Amount
+from nomina.ledger import Account, Book, Split, Transaction
+from nomina.running_balances import RegisterEntry, RunningBalances
+from nomina.stats import Stats
+
+
+class SqliteBook:
+    """
+    a ledger Book stored in an SQLite database with tables for accounts,
+    transactions and splits - lookups, filtering, balances and registers
+    are pushed down as indexed SQL queries so that only the
+    requested part of the book is loaded into memory
+
+    SqliteBook is not a Book: it mirrors the read API of Book that can be
+    pushed down - lookup_account, get_transaction, filter, get_stats,
+    calc_balances, get_register and balance_as_of - and gives the same results.
+    Book keeps its accounts and transactions as dicts, so the rest of its API
+    e.g. the book and account views works on the Book returned by to_book or filter.
+    """
+
+    file_type = "NOMINA-LEDGER-BOOK-SQLITE"
+    ddl = [
+        "CREATE TABLE book (key TEXT PRIMARY KEY, value TEXT)",
+        """CREATE TABLE accounts (
+            account_id TEXT PRIMARY KEY,
+            name TEXT,
+            account_type TEXT,
+            description TEXT,
+            currency TEXT,
+            parent_account_id TEXT,
+            pos INTEGER
+        )""",
+        """CREATE TABLE transactions (
+            tx_pos INTEGER PRIMARY KEY,
+            transaction_id TEXT UNIQUE NOT NULL,
+            isodate TEXT,
+            date_key TEXT,
+            description TEXT,
+            payee TEXT,
+            memo TEXT
+        )""",
+        """CREATE TABLE splits (
+            tx_pos INTEGER NOT NULL,
+            split_pos INTEGER NOT NULL,
+            is_none INTEGER NOT NULL,
+            amount REAL,
+            amount_minor INTEGER,
+            account_id TEXT,
+            memo TEXT,
+            reconciled INTEGER,
+            PRIMARY KEY (tx_pos, split_pos)
+        )""",
+        "CREATE INDEX idx_transactions_date ON transactions(date_key)",
+        "CREATE INDEX idx_transactions_payee ON transactions(payee)",
+        "CREATE INDEX idx_splits_account ON splits(account_id, tx_pos)",
+    ]
+
+    def __init__(self, db_path: str, lenient: bool = False, debug: bool = False):
+        """
+        constructor
+
+        Args:
+            db_path (str): the path of the SQLite database
+            lenient (bool): if True log invalid splits instead of raising an error
+            debug (bool): if True show the SQL queries
+        """
+        self.db_path = db_path
+        self.lenient = lenient
+        self.log = Log()
+        self.sqldb = SQLDB(db_path, debug=debug)
+        self._header = None
+        self._accounts = None
+        self._account_tree = None
+
+    def close(self):
+        """
+        close the database connection
+        """
+        self.sqldb.close()
+
+    @classmethod
+    def create(cls, db_path: str, book: Book) -> "SqliteBook":
+        """
+        store the given book in a new SQLite database
+
+        Args:
+            db_path (str): the path of the database - an existing file is replaced
+            book (Book): the ledger book to store
+
+        Returns:
+            SqliteBook: the SQLite backed book
+        """
+        if os.path.exists(db_path):
+            os.remove(db_path)
+        sqlite_book = cls(db_path, lenient=book.lenient)
+        connection = sqlite_book.sqldb.c
+        scale = book.get_scale()
+        header = {
+            f.name: getattr(book, f.name)
+            for f in fields(book)
+            if f.name not in ("accounts", "transactions")
+        }
+        header["file_type"] = cls.file_type
+        header["scale"] = scale
+        with connection:
+            for ddl in cls.ddl:
+                connection.execute(ddl)
+            connection.executemany(
+                "INSERT INTO book VALUES (?, ?)",
+                [
+                    (key, None if value is None else str(value))
+                    for key, value in header.items()
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO accounts VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        a.account_id,
+                        a.name,
+                        a.account_type,
+                        a.description,
+                        a.currency,
+                        a.parent_account_id,
+                        pos,
+                    )
+                    for pos, a in enumerate(book.accounts.values())
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO transactions VALUES (?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        tx_pos,
+                        transaction_id,
+                        tx.isodate,
+                        RunningBalances.date_key(tx) or None,
+                        tx.description,
+                        tx.payee,
+                        tx.memo,
+                    )
+                    for tx_pos, (transaction_id, tx) in enumerate(
+                        book.transactions.items()
+                    )
+                ],
+            )
+            connection.executemany(
+                "INSERT INTO splits VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                [
+                    (
+                        tx_pos,
+                        split_pos,
+                        split is None,
+                        split.amount if split else None,
+                        Amount.to_minor(split.amount, scale) if split else None,
+                        split.account_id if split else None,
+                        split.memo if split else None,
+                        split.reconciled if split else None,
+                    )
+                    for tx_pos, tx in enumerate(book.transactions.values())
+                    for split_pos, split in enumerate(tx.splits)
+                ],
+            )
+        return sqlite_book
+
+    @property
+    def header(self) -> Dict[str, Optional[str]]:
+        """
+        the header fields of the book
+        """
+        if self._header is None:
+            rows = self.sqldb.query("SELECT key, value FROM book")
+            self._header = {row["key"]: row["value"] for row in rows}
+        return self._header
+
+    @property
+    def scale(self) -> int:
+        return int(self.header.get("scale", Amount.default_scale))
+
+    @property
+    def accounts(self) -> Dict[str, Account]:
+        """
+        the accounts in their original order - loaded eagerly since they are few
+        """
+        if self._accounts is None:
+            rows = self.sqldb.query("SELECT * FROM accounts ORDER BY pos")
+            self._accounts = {}
+            for row in rows:
+                row.pop("pos")
+                self._accounts[row["account_id"]] = Account(**row)
+        return self._accounts
+
+    def get_account_tree(self) -> AccountTree:
+        """
+        get the account tree of the book
+        """
+        if self._account_tree is None:
+            self._account_tree = AccountTree(self.accounts)
+        return self._account_tree
+
+    def lookup_account(self, account_id: str) -> Optional[Account]:
+        """
+        Get the account for the given account id.
+        """
+        return self.accounts.get(account_id)
+
+    def _to_transactions(
+        self, tx_rows: List[dict]
+    ) -> Iterator[Tuple[str, Transaction]]:
+        """
+        materialize the transactions of the given rows with their splits
+        """
+        tx_positions = [row["tx_pos"] for row in tx_rows]
+        splits_by_tx: Dict[int, List[Optional[Split]]] = {}
+        # query the splits in chunks to stay within the SQL variable limit
+        chunk_size = 500
+        for i in range(0, len(tx_positions), chunk_size):
+            chunk = tx_positions[i : i + chunk_size]
+            placeholders = ",".join("?" * len(chunk))
+            for row in self.sqldb.queryGen(
+                f"""SELECT * FROM splits WHERE tx_pos IN ({placeholders})
+                ORDER BY tx_pos, split_pos""",
+                tuple(chunk),
+            ):
+                split = None
+                if not row["is_none"]:
+                    split = Split(
+                        amount=row["amount"],
+                        account_id=row["account_id"],
+                        memo=row["memo"],
+                        reconciled=bool(row["reconciled"]),
+                    )
+                splits_by_tx.setdefault(row["tx_pos"], []).append(split)
+        for row in tx_rows:
+            transaction = Transaction(
+                isodate=row["isodate"],
+                description=row["description"],
+                splits=splits_by_tx.get(row["tx_pos"], []),
+                payee=row["payee"],
+                memo=row["memo"],
+            )
+            yield row["transaction_id"], transaction
+
+    def get_transaction(self, transaction_id: str) -> Optional[Transaction]:
+        """
+        get the transaction with the given id
+
+        Args:
+            transaction_id (str): the id of the transaction
+
+        Returns:
+            Optional[Transaction]: the transaction or None if not found
+        """
+        rows = self.sqldb.query(
+            "SELECT * FROM transactions WHERE transaction_id = ?", (transaction_id,)
+        )
+        for _transaction_id, transaction in self._to_transactions(rows):
+            return transaction
+        return None
+
+    def iter_transactions(
+        self, start_date: str = None, end_date: str = None, payee: str = None
+    ) -> Iterator[Tuple[str, Transaction]]:
+        """
+        iterate over the transactions within the given date range in insertion order
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+            payee (str): only transactions of the given payee
+
+        Yields:
+            Tuple[str, Transaction]: the transaction id and transaction
+        """
+        conditions = ["date_key IS NOT NULL"]
+        params = []
+        if start_date:
+            conditions.append("date_key >= ?")
+            params.append(start_date)
+        if end_date:
+            conditions.append("date_key <= ?")
+            params.append(end_date)
+        if payee is not None:
+            conditions.append("payee = ?")
+            params.append(payee)
+        sql = f"""SELECT * FROM transactions WHERE {' AND '.join(conditions)}
+        ORDER BY tx_pos"""
+        chunk = []
+        for row in self.sqldb.queryGen(sql, tuple(params)):
+            chunk.append(row)
+            if len(chunk) >= 1000:
+                yield from self._to_transactions(chunk)
+                chunk = []
+        if chunk:
+            yield from self._to_transactions(chunk)
+
+    def to_book(self) -> Book:
+        """
+        load the complete book into memory
+
+        Returns:
+            Book: the ledger book
+        """
+        book = self._new_book()
+        rows = self.sqldb.query("SELECT * FROM transactions ORDER BY tx_pos")
+        for transaction_id, transaction in self._to_transactions(rows):
+            book.transactions[transaction_id] = transaction
+        book.touch()
+        return book
+
+    def _new_book(self) -> Book:
+        """
+        create an in memory book with my header fields and accounts
+        """
+        book_fields = {f.name for f in fields(Book)}
+        header = {
+            key: value
+            for key, value in self.header.items()
+            if key in book_fields
+            and key not in ("file_type", "accounts", "transactions")
+        }
+        book = Book(**header)
+        book.lenient = self.lenient
+        for account in self.accounts.values():
+            book.add_account(account)
+        return book
+
+    def filter(
+        self,
+        start_date: str = None,
+        end_date: str = None,
+        remove_unused_accounts: bool = True,
+    ) -> Book:
+        """
+        Filter the transactions based on the given date range
+        with an indexed SQL query.
+
+        Args:
+            start_date (str): The start date in 'YYYY-MM-DD' format.
+            end_date (str): The end date in 'YYYY-MM-DD' format.
+
+        Returns:
+            Book: an in memory book with the filtered transactions in insertion order
+            as Book.filter
+        """
+        book = self._new_book()
+        for transaction_id, transaction in self.iter_transactions(start_date, end_date):
+            book.transactions[transaction_id] = transaction
+        book.touch()
+        if remove_unused_accounts:
+            book.remove_unused_accounts()
+        return book
+
+    def get_stats(self) -> Stats:
+        """
+        Get statistics about the Book via SQL aggregates.
+
+        Returns:
+            Stats: An object containing various statistics about the Book.
+        """
+        row = self.sqldb.query(
+            "SELECT COUNT(*) AS n, MIN(date_key) AS min_date, MAX(date_key) AS max_date FROM transactions"
+        )[0]
+        currency_counts = {}
+        for account in self.accounts.values():
+            currency_counts[account.currency] = (
+                currency_counts.get(account.currency, 0) + 1
+            )
+        stats = Stats(
+            accounts=len(self.accounts),
+            transactions=row["n"],
+            start_date=row["min_date"],
+            end_date=row["max_date"],
+            currencies=currency_counts,
+        )
+        return stats
+
+    def calc_balances(self) -> Dict[str, Optional[float]]:
+        """
+        Calculate the balances for all accounts as an SQL aggregate of
+        the exact minor unit amounts including propagation up the account hierarchy.
+        Unused accounts will have a balance of None.
+
+        Returns:
+            Dict[str, Optional[float]]: A dictionary mapping account IDs to their balances or None if unused.
+        """
+        invalid_rows = self.sqldb.query("""SELECT tx_pos, split_pos FROM splits
+            WHERE is_none OR amount IS NULL
+            ORDER BY tx_pos, split_pos""")
+        for row in invalid_rows:
+            msg = f"split {row['split_pos'] + 1} (or amount) of transaction {row['tx_pos'] + 1} is None"
+            if self.lenient:
+                self.log.log("⚠️", "split", msg)
+            else:
+                raise ValueError(msg)
+        balances = {account_id: None for account_id in self.accounts}
+        for row in self.sqldb.query(
+            """SELECT account_id, SUM(amount_minor) AS balance FROM splits
+            WHERE NOT is_none AND amount IS NOT NULL
+            GROUP BY account_id"""
+        ):
+            balances[row["account_id"]] = row["balance"]
+        tree = self.get_account_tree()
+        balances = tree.rollup(balances)
+        balances = {
+            account_id: (
+                None if balance is None else Amount.from_minor(balance, self.scale)
+            )
+            for account_id, balance in balances.items()
+        }
+        return balances
+
+    def get_register(self, account_id: str) -> List[RegisterEntry]:
+        """
+        get the date ordered register of the given account with the
+        running balances calculated by an SQL window function
+
+        Args:
+            account_id (str): the id of the account
+
+        Returns:
+            List[RegisterEntry]: the postings with their running balances
+        """
+        entries = []
+        for row in self.sqldb.queryGen(
+            """SELECT COALESCE(t.date_key, '') AS date_key, t.transaction_id, s.split_pos,
+            COALESCE(s.amount_minor, 0) AS amount,
+            SUM(COALESCE(s.amount_minor, 0)) OVER (
+                ORDER BY COALESCE(t.date_key, ''), s.tx_pos, s.split_pos
+                ROWS UNBOUNDED PRECEDING
+            ) AS balance
+            FROM splits s JOIN transactions t ON t.tx_pos = s.tx_pos
+            WHERE s.account_id = ? AND NOT s.is_none
+            ORDER BY COALESCE(t.date_key, ''), s.tx_pos, s.split_pos""",
+            (account_id,),
+        ):
+            entries.append(
+                RegisterEntry(
+                    isodate=row["date_key"],
+                    transaction_id=row["transaction_id"],
+                    split_pos=row["split_pos"],
+                    amount=Amount.from_minor(row["amount"], self.scale),
+                    balance=Amount.from_minor(row["balance"], self.scale),
+                )
+            )
+        return entries
+
+    def balance_as_of(
+        self, account_id: str, isodate: str, with_subaccounts: bool = False
+    ) -> float:
+        """
+        get the balance of the given account at the end of the given date
+
+        Args:
+            account_id (str): the id of the account
+            isodate (str): the date in 'YYYY-MM-DD' format
+            with_subaccounts (bool): if True include the balances of all subaccounts
+
+        Returns:
+            float: the balance
+        """
+        account_ids = [account_id]
+        if with_subaccounts:
+            tree = self.get_account_tree()
+            account_ids = [
+                aid
+                for aid in tree.order
+                if aid == account_id or account_id in tree.ancestors[aid]
+            ]
+        placeholders = ",".join("?" * len(account_ids))
+        row = self.sqldb.query(
+            f"""SELECT SUM(s.amount_minor) AS balance
+            FROM splits s JOIN transactions t ON t.tx_pos = s.tx_pos
+            WHERE s.account_id IN ({placeholders}) AND NOT s.is_none
+            AND COALESCE(t.date_key, '') <= ?""",
+            (*account_ids, isodate),
+        )[0]
+        return Amount.from_minor(row["balance"] or 0, self.scale)
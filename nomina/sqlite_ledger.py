@@ -0,0 +1,94 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from pathlib import Path
+
+from nomina.ledger import Book as LedgerBook
+from nomina.nomina_converter import BaseFromLedgerConverter, BaseToLedgerConverter
+from nomina.sqlite_book import SqliteBook
+
+
+class SqliteToLedgerConverter(BaseToLedgerConverter):
+    """
+    Convert an SQLite Ledger Book to a Ledger Book
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(from_format_acronym="LB-SQLITE", debug=debug)
+        self.sqlite_book = None
+
+    def load(self, input_path: str) -> SqliteBook:
+        """
+        open the SQLite database
+
+        Args:
+            input_path (str): the path of the database file
+
+        Returns:
+            SqliteBook: the SQLite backed book
+        """
+        self.sqlite_book = SqliteBook(input_path)
+        return self.sqlite_book
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        load the Ledger Book from the database
+        """
+        ledger_book = self.sqlite_book.to_book()
+        self.sqlite_book.close()
+        return ledger_book
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the target book
+        """
+        if self.debug:
+            self.target.get_stats().show()
+
+    def to_text(self) -> str:
+        """
+        create the output text
+        """
+        yaml_str = self.target.to_yaml()
+        return yaml_str
+
+
+class LedgerToSqliteConverter(BaseFromLedgerConverter):
+    """
+    Convert a Ledger Book to an SQLite database
+    """
+
+    def __init__(self, debug: bool = False):
+        """
+        constructor
+        """
+        super().__init__(to_format_acronym="LB-SQLITE", debug=debug)
+
+    def set_source(self, source: LedgerBook):
+        self.source = source
+
+    def convert_to_target(self) -> LedgerBook:
+        """
+        the database is written on save
+        """
+        return self.source
+
+    def show_stats(self) -> None:
+        """
+        show the statistics of the source book
+        """
+        if self.debug:
+            self.source.get_stats().show()
+
+    def save(self, output_path: Path):
+        """
+        store the Ledger Book in the given SQLite database file
+        """
+        sqlite_book = SqliteBook.create(str(output_path), self.source)
+        sqlite_book.close()
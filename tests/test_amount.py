@@ -0,0 +1,140 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from decimal import Decimal
+
+from nomina.amount import Amount
+from nomina.ledger import Account, Book, Split, Transaction
+from tests.basetest import Basetest
+
+
+class Test_Amount(Basetest):
+    """
+    test the exact minor unit amounts
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+
+    def test_conversions(self):
+        """
+        test converting amounts to and from minor units
+        """
+        self.assertEqual(2, Amount.scale("EUR"))
+        self.assertEqual(0, Amount.scale("JPY"))
+        self.assertEqual(3, Amount.scale("KWD"))
+        # int(0.29 * 100) would truncate to 28
+        self.assertEqual(29, Amount.to_minor(0.29))
+        self.assertEqual(-350, Amount.to_minor("-3.50"))
+        self.assertEqual(1234, Amount.to_minor(Decimal("1.234"), 3))
+        self.assertEqual(-350, Amount.from_fraction("-3500/1000"))
+        self.assertEqual("-350/100", Amount.to_fraction(-350))
+        self.assertEqual(Decimal("-3.50"), Amount.to_decimal(-350))
+        self.assertEqual(1.0, Amount.sum([0.1] * 10))
+        self.assertEqual(0.3, Amount.sum([0.1, 0.2]))
+
+    def test_exact_balances(self):
+        """
+        test that the balances are summed up exactly
+        """
+        for columnar in [False, True]:
+            with self.subTest(columnar=columnar):
+                book = Book()
+                book.columnar = columnar
+                book.add_account(Account("Cash", "Cash", "Assets"))
+                book.add_account(Account("Food", "Food", "Expenses"))
+                for i in range(10):
+                    book.add_transaction(
+                        f"t{i}",
+                        Transaction(
+                            isodate=f"2024-10-{i+1:02d}",
+                            splits=[
+                                Split(amount=-0.1, account_id="Cash"),
+                                Split(amount=0.1, account_id="Food"),
+                            ],
+                        ),
+                    )
+                balances = book.calc_balances()
+                self.assertEqual(-1.0, balances["Cash"])
+                self.assertEqual(1.0, balances["Food"])
+                self.assertEqual(1.0, book.balance_as_of("Food", "2024-12-31"))
+
+    def test_parse(self):
+        """
+        test parsing amount strings to minor units and floats
+        """
+        test_cases = [
+            ("-12.50", 2, -1250, -12.5),
+            ("12", 2, 1200, 12.0),
+            ("1,234.50", 2, 123450, 1234.5),
+            ("-3,5 EUR", 2, -350, -3.5),
+            ("$ 1,000.00", 2, 100000, 1000.0),
+            (".5", 2, 50, 0.5),
+            ("1.2345", 3, 1234, 1.2345),
+            ("-0.125", 2, -12, -0.125),
+            # the last separator is the decimal separator
+            ("-1.234,50", 2, -123450, -1234.5),
+            ("1.234.567,89 EUR", 2, 123456789, 1234567.89),
+            ("1,234,567.89", 2, 123456789, 1234567.89),
+        ]
+        for amount_str, scale, expected_minor, expected_float in test_cases:
+            with self.subTest(amount_str=amount_str):
+                minor, amount_float = Amount.parse(amount_str, scale)
+                self.assertEqual(expected_minor, minor)
+                self.assertEqual(expected_float, amount_float)
+        minors, floats = Amount.parse_many(["-10.00", "4,50", "5.5"])
+        self.assertEqual([-1000, 450, 550], minors)
+        self.assertEqual([-10.0, 4.5, 5.5], floats)
+        self.assertEqual("-1234.50", Amount.clean("-1.234,50 EUR"))
+        with self.assertRaises(ValueError):
+            Amount.parse("n/a")
+
+    def test_sub_minor_amounts(self):
+        """
+        test that amounts finer than the currency scale are not rounded away
+        """
+        self.assertEqual(4, Amount.decimals(0.0015))
+        self.assertEqual(0, Amount.decimals(100.0))
+        self.assertEqual(4, Amount.scale_of_amounts([1.5, 0.0015, None]))
+        self.assertEqual(Amount.max_scale, Amount.scale_of_amounts([0.1 + 0.2]))
+        self.assertEqual(0.0025, Amount.sum([0.0015, 0.001]))
+        for columnar in [False, True]:
+            with self.subTest(columnar=columnar):
+                book = Book()
+                book.columnar = columnar
+                book.add_account(Account("Wallet", "Wallet", "Assets", currency="BTC"))
+                book.add_account(Account("Fees", "Fees", "Expenses", currency="BTC"))
+                book.add_transaction(
+                    "t1",
+                    Transaction(
+                        isodate="2024-01-05",
+                        splits=[
+                            Split(amount=1.0, account_id="Wallet"),
+                            Split(amount=-1.0, account_id="Fees"),
+                        ],
+                    ),
+                )
+                # build the indexes at the scale of the first transaction
+                self.assertEqual(1.0, book.balance_as_of("Wallet", "2024-12-31"))
+                self.assertEqual(1.0, book.get_period_end_balances("2024-01")["Wallet"])
+                self.assertEqual(1.0, book.calc_balances()["Wallet"])
+                book.add_transaction(
+                    "t2",
+                    Transaction(
+                        isodate="2024-01-06",
+                        splits=[
+                            Split(amount=-0.0015, account_id="Wallet"),
+                            Split(amount=0.0015, account_id="Fees"),
+                        ],
+                    ),
+                )
+                self.assertEqual(4, book.get_scale())
+                self.assertEqual(0.9985, book.calc_balances()["Wallet"])
+                self.assertEqual(0.9985, book.balance_as_of("Wallet", "2024-12-31"))
+                self.assertEqual(
+                    0.9985, book.get_period_end_balances("2024-01")["Wallet"]
+                )
+                self.assertEqual(-0.0015, book.get_register("Wallet")[-1].amount)
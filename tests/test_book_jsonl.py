@@ -0,0 +1,108 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+
+from nomina.book_jsonl import BookJsonl, BookJsonlWriter
+from nomina.file_formats import AccountingFileFormats
+from nomina.ledger import Account, Split, Transaction
+from nomina.nomina_cmd import NominaCmd
+from tests.basetest import Basetest
+from tests.example_testcases import NominaExample
+
+
+class Test_BookJsonl(Basetest):
+    """
+    test the JSON Lines Ledger Book format
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.examples = NominaExample.get_examples()
+        self.target_dir = "/tmp/nomina"
+        os.makedirs(self.target_dir, exist_ok=True)
+
+    def test_round_trip(self):
+        """
+        test saving and reloading sequentially and in parallel chunks
+        """
+        detector = AccountingFileFormats()
+        for name, example in self.examples.items():
+            with self.subTest(f"Testing {name}"):
+                ledger_book = example.get_ledger_book()
+                jsonl_file = f"{self.target_dir}/{name}.jsonl"
+                BookJsonl.save(ledger_book, jsonl_file)
+                self.assertEqual("LB-JSONL", detector.detect_format(jsonl_file).acronym)
+                for workers in [1, 2]:
+                    reloaded = BookJsonl.load(jsonl_file, workers=workers)
+                    self.assertEqual(ledger_book.name, reloaded.name)
+                    self.assertEqual(ledger_book.accounts, reloaded.accounts)
+                    self.assertEqual(ledger_book.transactions, reloaded.transactions)
+                    self.assertEqual(
+                        list(ledger_book.transactions), list(reloaded.transactions)
+                    )
+
+    def test_append(self):
+        """
+        test appending accounts and transactions without rewriting the file
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        jsonl_file = f"{self.target_dir}/expenses2024_append.jsonl"
+        BookJsonl.save(ledger_book, jsonl_file)
+        size = os.path.getsize(jsonl_file)
+        account = Account(
+            account_id="Expenses:Books", name="Books", account_type="EXPENSE"
+        )
+        transaction = Transaction(
+            isodate="2024-12-24",
+            description="Christmas present",
+            splits=[
+                Split(amount=25.0, account_id="Expenses:Books"),
+                Split(amount=-25.0, account_id="Assets:Cash"),
+            ],
+        )
+        with BookJsonlWriter.open(jsonl_file, append=True) as writer:
+            writer.write_account(account)
+            writer.write_transaction("Books2024-12-24", transaction)
+        with open(jsonl_file, "rb") as file:
+            file.seek(size)
+            self.assertEqual(2, len(file.read().splitlines()))
+        reloaded = BookJsonl.load(jsonl_file)
+        self.assertEqual(account, reloaded.accounts["Expenses:Books"])
+        self.assertEqual(transaction, reloaded.transactions["Books2024-12-24"])
+        self.assertEqual(len(ledger_book.transactions) + 1, len(reloaded.transactions))
+
+    def test_convert_incrementally(self):
+        """
+        test writing JSON Lines while a converter produces the transactions
+        """
+        cmd = NominaCmd()
+        example = self.examples["expenses2024"]
+        gnucash_file = f"{self.target_dir}/expenses2024_for_jsonl.gnucash"
+        jsonl_file = f"{self.target_dir}/expenses2024_from_gnucash.jsonl"
+        for input_file, target_format, output_file in [
+            (example.ledger_file, "GC-XML", gnucash_file),
+            (gnucash_file, "LB-JSONL", jsonl_file),
+        ]:
+            argv = [
+                "--convert",
+                str(input_file),
+                "--format",
+                target_format,
+                "--output",
+                output_file,
+            ]
+            exit_code = cmd.cmd_main(argv)
+            self.assertEqual(0, exit_code)
+        with open(jsonl_file) as file:
+            lines = file.readlines()
+        ledger_book = example.get_ledger_book()
+        # the accounts following the first one are appended as they are added
+        self.assertIn('"file_type": "NOMINA-LEDGER-BOOK-JSONL"', lines[0])
+        tx_lines = [line for line in lines if line.startswith('{"transaction_id"')]
+        self.assertEqual(len(ledger_book.transactions), len(tx_lines))
+        reloaded = BookJsonl.load(jsonl_file)
+        self.assertEqual(len(ledger_book.accounts), len(reloaded.accounts))
@@ -0,0 +1,147 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+
+from nomina.book_jsonl import BookJsonl, BookJsonlWriter
+from nomina.book_snapshot import BookSnapshot
+from nomina.file_formats import AccountingFileFormats
+from nomina.ledger import Account, Book, Split, Transaction
+from nomina.nomina_cmd import NominaCmd
+from nomina.snapshot_ledger import SnapshotToLedgerConverter
+from tests.basetest import Basetest
+from tests.example_testcases import NominaExample
+
+
+class Test_BookSnapshot(Basetest):
+    """
+    test the binary Ledger Book snapshots
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.examples = NominaExample.get_examples()
+        self.target_dir = "/tmp/nomina"
+        os.makedirs(self.target_dir, exist_ok=True)
+
+    def test_round_trip(self):
+        """
+        test saving and memory mapped reloading of snapshots
+        """
+        detector = AccountingFileFormats()
+        for name, example in self.examples.items():
+            with self.subTest(f"Testing {name}"):
+                ledger_book = example.get_ledger_book()
+                snapshot_file = f"{self.target_dir}/{name}.lbb"
+                BookSnapshot.from_book(ledger_book).save(snapshot_file)
+                self.assertEqual(
+                    "LB-BIN", detector.detect_format(snapshot_file).acronym
+                )
+                snapshot = BookSnapshot.open(snapshot_file)
+                reloaded = snapshot.to_book()
+                self.assertEqual(ledger_book.name, reloaded.name)
+                self.assertEqual(ledger_book.accounts, reloaded.accounts)
+                self.assertEqual(ledger_book.transactions, reloaded.transactions)
+                # columnar access without materializing the transactions
+                ledger_book.lenient = True
+                ledger_book.columnar = True
+                store = snapshot.to_split_store()
+                expected = ledger_book.get_split_store()
+                self.assertEqual(expected.amounts.tolist(), store.amounts.tolist())
+                self.assertEqual(expected.valid.tolist(), store.valid.tolist())
+                self.assertEqual(expected.tx_dates.tolist(), store.tx_dates.tolist())
+                snapshot.close()
+
+    def test_convert(self):
+        """
+        test converting to and from snapshots via the command line
+        """
+        cmd = NominaCmd()
+        example = self.examples["expenses2024"]
+        snapshot_file = f"{self.target_dir}/expenses2024_converted.lbb"
+        yaml_file = f"{self.target_dir}/expenses2024_reconverted.yaml"
+        for input_file, target_format, output_file in [
+            (example.ledger_file, "LB-BIN", snapshot_file),
+            (snapshot_file, "LB-YAML", yaml_file),
+        ]:
+            argv = [
+                "--convert",
+                str(input_file),
+                "--format",
+                target_format,
+                "--output",
+                output_file,
+            ]
+            exit_code = cmd.cmd_main(argv)
+            self.assertEqual(0, exit_code)
+        self.assertIn("Bakery2024-10-06_0900_1", open(yaml_file).read())
+
+    def test_minor_units(self):
+        """
+        test that the split amounts are stored as exact minor units
+        """
+        book = Book(name="minor")
+        book.add_account(Account(account_id="Cash", name="Cash", account_type="CASH"))
+        for i in range(3):
+            book.add_transaction(
+                f"t{i}",
+                Transaction(
+                    isodate="2024-01-01", splits=[Split(amount=0.1, account_id="Cash")]
+                ),
+            )
+        snapshot_file = f"{self.target_dir}/minor.lbb"
+        BookSnapshot.from_book(book).save(snapshot_file)
+        with BookSnapshot.open(snapshot_file) as snapshot:
+            self.assertEqual(2, snapshot.scale)
+            self.assertEqual("int64", snapshot.columns["split_amount"].dtype.name)
+            self.assertEqual([10, 10, 10], snapshot.columns["split_amount"].tolist())
+            self.assertEqual(book.transactions, snapshot.to_book().transactions)
+            mapped = snapshot.mmap
+        self.assertTrue(mapped.closed)
+        # amounts finer than the currency are kept exactly
+        book.add_transaction(
+            "t3",
+            Transaction(
+                isodate="2024-01-02", splits=[Split(amount=0.004, account_id="Cash")]
+            ),
+        )
+        BookSnapshot.from_book(book).save(snapshot_file)
+        with BookSnapshot.open(snapshot_file) as snapshot:
+            self.assertEqual(3, snapshot.scale)
+            self.assertEqual(book.transactions, snapshot.to_book().transactions)
+            self.assertEqual(book.calc_balances(), snapshot.to_book().calc_balances())
+        # amounts that no scale represents exactly fail loudly
+        book.add_transaction(
+            "t4",
+            Transaction(
+                isodate="2024-01-03",
+                splits=[Split(amount=0.1 + 0.2, account_id="Cash")],
+            ),
+        )
+        with self.assertRaises(ValueError):
+            BookSnapshot.from_book(book)
+        # snapshots of another version are rejected
+        with open(snapshot_file, "r+b") as file:
+            file.write(b"NOMINA-LEDGER-BOOK-BIN 1\n")
+        with self.assertRaises(ValueError):
+            BookSnapshot.open(snapshot_file)
+
+    def test_streaming_listener(self):
+        """
+        test that the listeners of the converter see every transaction
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        snapshot_file = f"{self.target_dir}/expenses2024_listener.lbb"
+        BookSnapshot.from_book(ledger_book).save(snapshot_file)
+        jsonl_file = f"{self.target_dir}/expenses2024_listener.jsonl"
+        converter = SnapshotToLedgerConverter()
+        with BookJsonlWriter.open(jsonl_file) as writer:
+            converter.add_listener(writer)
+            converter.convert_to_ledger(snapshot_file)
+        self.assertTrue(writer.streamed)
+        self.assertIsNone(converter.snapshot.mmap)
+        streamed = BookJsonl.load(jsonl_file)
+        self.assertEqual(ledger_book.transactions, streamed.transactions)
@@ -0,0 +1,57 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+from dataclasses import fields
+
+from nomina.book_stream import BookStreamLoader
+from nomina.ledger import Book
+from tests.basetest import Basetest
+from tests.example_testcases import NominaExample
+
+
+class Test_BookStream(Basetest):
+    """
+    test the streaming LB-YAML loader
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.examples = NominaExample.get_examples()
+
+    def test_load_streaming(self):
+        """
+        test that the streaming loader loads the same books as the document loader
+        """
+        for name, example in self.examples.items():
+            with self.subTest(f"Testing {name}"):
+                ledger_book = example.get_ledger_book()
+                streamed_book = Book.load_streaming(example.ledger_file)
+                for book_field in fields(Book):
+                    self.assertEqual(
+                        getattr(ledger_book, book_field.name),
+                        getattr(streamed_book, book_field.name),
+                    )
+                with BookStreamLoader.open(example.ledger_file) as loader:
+                    stats = loader.scan_stats()
+                self.assertEqual(ledger_book.get_stats(), stats)
+
+    def test_lazy_transactions(self):
+        """
+        test the lazy transactions with early stop and date window
+        """
+        example = self.examples["expenses2024"]
+        with BookStreamLoader.open(example.ledger_file) as loader:
+            book = loader.read_header()
+            self.assertEqual(3, len(book.accounts))
+            self.assertEqual(0, len(book.transactions))
+            for transaction_id, _transaction in loader.iter_transactions():
+                self.assertEqual("Bakery2024-10-06_0900_1", transaction_id)
+                break
+        book = Book.load_streaming(
+            example.ledger_file, start_date="2024-10-07", end_date="2024-12-31"
+        )
+        self.assertEqual(0, len(book.transactions))
+        self.assertEqual(3, len(book.accounts))
@@ -21,10 +21,12 @@ class TestNominaConverter(Basetest):
         Basetest.setUp(self, debug=debug, profile=profile)
         self.input_files = [
             "empty.yaml",
+            "empty_sqlite.gnucash",
             "empty_xml.gnucash",
             "example.beancount",
             "expenses.qif",
             "expenses.yaml",
+            "expenses_sqlite.gnucash",
             "expenses2024_bzv.yaml",
             "expenses2024.yaml",
             "expenses2024_xml.gnucash",
@@ -35,8 +37,13 @@ class TestNominaConverter(Basetest):
         ]
         self.target_formats = [
             ("LB-YAML", ".yaml"),
+            ("LB-BIN", ".lbb"),
+            ("LB-SQLITE", ".sqlite"),
+            ("LB-JSONL", ".jsonl"),
             ("GC-XML", ".gnucash"),
+            ("GC-SQLITE", ".gnucash"),
             ("BEAN", ".beancount"),
+            ("QIF", ".qif"),
         ]
         self.formats = AccountingFileFormats()
         self.target_dir = "/tmp/nomina"
@@ -0,0 +1,91 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import shutil
+
+from nomina.compressed_file import CompressedFile, zstandard
+from nomina.file_formats import AccountingFileFormats
+from nomina.ledger import Book
+from nomina.nomina_cmd import NominaCmd
+from tests.basetest import Basetest
+
+
+class Test_CompressedFile(Basetest):
+    """
+    test the transparent compression of the file formats
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.target_dir = "/tmp/nomina/compressed"
+        os.makedirs(self.target_dir, exist_ok=True)
+        self.suffixes = [".gz", ".bz2", ".xz"]
+        if zstandard is not None:
+            self.suffixes.append(".zst")
+        self.input_files = {
+            "expenses2024.yaml": "LB-YAML",
+            "expenses_xml.gnucash": "GC-XML",
+            "example.beancount": "BEAN",
+            "expenses.qif": "QIF",
+        }
+
+    def compress(self, input_file: str, suffix: str) -> str:
+        """
+        compress the given example file with the codec of the given suffix
+        """
+        compressed_file = f"{self.target_dir}/{input_file}{suffix}"
+        with open(f"{self.examples_path}/{input_file}", "rb") as source:
+            with CompressedFile.open(compressed_file, "wb") as target:
+                shutil.copyfileobj(source, target)
+        return compressed_file
+
+    def test_detect_and_convert(self):
+        """
+        test detecting and converting compressed files
+        """
+        detector = AccountingFileFormats()
+        cmd = NominaCmd()
+        for input_file, acronym in self.input_files.items():
+            for suffix in self.suffixes:
+                with self.subTest(input_file=input_file, suffix=suffix):
+                    compressed_file = self.compress(input_file, suffix)
+                    compression = CompressedFile.detect(compressed_file)
+                    self.assertEqual(suffix, compression.suffix)
+                    fformat = detector.detect_format(compressed_file)
+                    self.assertEqual(acronym, fformat.acronym)
+                    if acronym == "LB-YAML":
+                        continue
+                    # write the converted book compressed by suffix
+                    output_file = (
+                        f"{self.target_dir}/{input_file}_converted.yaml{suffix}"
+                    )
+                    argv = [
+                        "--convert",
+                        compressed_file,
+                        "--format",
+                        "LB-YAML",
+                        "--output",
+                        output_file,
+                    ]
+                    self.assertEqual(0, cmd.cmd_main(argv))
+                    self.assertTrue(CompressedFile.is_compressed(output_file))
+                    book = Book.load_streaming(output_file)
+                    self.assertTrue(len(book.transactions) > 0)
+
+    def test_gnucash_gzipped_xml(self):
+        """
+        test GnuCash's default gzipped XML without compression suffix
+        """
+        compressed_file = self.compress("expenses_xml.gnucash", ".gz")
+        gnucash_file = f"{self.target_dir}/expenses_gzipped.gnucash"
+        os.replace(compressed_file, gnucash_file)
+        detector = AccountingFileFormats()
+        self.assertEqual("GC-XML", detector.detect_format(gnucash_file).acronym)
+        yaml_file = f"{self.target_dir}/expenses_gzipped.yaml"
+        argv = ["--convert", gnucash_file, "--format", "LB-YAML", "--output", yaml_file]
+        self.assertEqual(0, NominaCmd().cmd_main(argv))
+        self.assertFalse(CompressedFile.is_compressed(yaml_file))
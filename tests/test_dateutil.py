@@ -37,3 +37,50 @@ class Test_Dateutils(Basetest):
             expected_ranges,
             "Date ranges do not match the expected output.",
         )
+
+    def test_parse_date(self):
+        """
+        test the compiled fast path against strptime
+        """
+        from datetime import datetime
+
+        def parse_with_strptime(date_str: str):
+            for date_format in DateUtils.default_formats:
+                try:
+                    return datetime.strptime(date_str, date_format).strftime("%Y-%m-%d")
+                except ValueError:
+                    continue
+            return None
+
+        for date_str in [
+            "05.10.24",
+            "5.1.24",
+            "31.02.24",
+            "23/10/2013",
+            "1/2/99",
+            "2024-10-06",
+            "2024/1/5",
+            "2024-10-06 00:00:00 +0000",
+            "10/06/24 00:00:00",
+            "10/06/24 25:00:00",
+            "29.02.24",
+            "1.1.68",
+            "1.1.69",
+            "garbage",
+        ]:
+            with self.subTest(date_str=date_str):
+                self.assertEqual(
+                    parse_with_strptime(date_str), DateUtils.parse_date(date_str)
+                )
+
+    def test_parse_dates(self):
+        """
+        test format sniffing and batch parsing
+        """
+        date_strs = ["01/02/03", "2024/01/05", None, "2024/01/05", "2024/12/31", "bad"]
+        self.assertEqual("%Y/%m/%d", DateUtils.sniff_format(date_strs))
+        iso_dates = DateUtils.parse_dates(date_strs)
+        self.assertEqual(
+            ["2003-02-01", "2024-01-05", None, "2024-01-05", "2024-12-31", None],
+            iso_dates,
+        )
@@ -0,0 +1,282 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import sqlite3
+
+from nomina.amount import Amount
+from nomina.gnc_ledger import (
+    GnuCashSqliteToLedgerConverter,
+    GnuCashToLedgerConverter,
+    LedgerToGnuCashSqliteConverter,
+)
+from nomina.gnucash_sqlite import GnuCashSqlite
+from nomina.ledger import Account, Book, Split, Transaction
+from tests.basetest import Basetest
+
+
+class Test_GnuCashSqlite(Basetest):
+    """
+    test reading and writing GnuCash SQLite books
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.target_dir = "/tmp/nomina"
+        os.makedirs(self.target_dir, exist_ok=True)
+
+    def test_isodate(self):
+        """
+        test converting the post dates of the ISO and the legacy format
+        """
+        for post_date, expected in [
+            ("2014-01-02 10:59:00", "2014-01-02 10:59:00 +0000"),
+            ("20140102105900", "2014-01-02 10:59:00 +0000"),
+            (None, None),
+        ]:
+            with self.subTest(post_date=post_date):
+                self.assertEqual(expected, GnuCashSqlite.isodate(post_date))
+        self.assertEqual(-350, Amount.from_num_denom(-350, 100))
+        self.assertEqual(-350, Amount.from_num_denom(-3500, 1000))
+        self.assertEqual(123, Amount.from_num_denom(123, 1, 0))
+
+    def test_sqlite_vs_xml(self):
+        """
+        test that the SQLite and the XML variant of a GnuCash book
+        are converted to the same Ledger Book
+        """
+        for name, accounts, transactions in [("empty", 64, 0), ("expenses", 5, 2)]:
+            with self.subTest(name=name):
+                sqlite_book = GnuCashSqliteToLedgerConverter().convert_to_ledger(
+                    f"{self.examples_path}/{name}_sqlite.gnucash"
+                )
+                xml_book = GnuCashToLedgerConverter().convert_to_ledger(
+                    f"{self.examples_path}/{name}_xml.gnucash"
+                )
+                self.assertEqual(accounts, len(sqlite_book.accounts))
+                self.assertEqual(transactions, len(sqlite_book.transactions))
+                self.assertEqual(xml_book.accounts, sqlite_book.accounts)
+                # the XML converter uses date and description as transaction id
+                self.assertEqual(
+                    list(xml_book.transactions.values()),
+                    list(sqlite_book.transactions.values()),
+                )
+
+    def test_post_date(self):
+        """
+        test converting ledger dates to GnuCash SQLite post dates in UTC
+        """
+        for isodate, expected in [
+            ("2024-10-06", "2024-10-06 10:59:00"),
+            ("2014-01-02 10:59:00 +0000", "2014-01-02 10:59:00"),
+            ("2024-01-01 00:30:00 +0100", "2023-12-31 23:30:00"),
+            (None, None),
+        ]:
+            with self.subTest(isodate=isodate):
+                self.assertEqual(expected, GnuCashSqlite.post_date(isodate))
+
+    def test_sqlite_round_trip(self):
+        """
+        test writing GnuCash SQLite books and reading them back
+        """
+        for name in ["empty", "expenses"]:
+            with self.subTest(name=name):
+                book = GnuCashSqliteToLedgerConverter().convert_to_ledger(
+                    f"{self.examples_path}/{name}_sqlite.gnucash"
+                )
+                db_path = f"{self.target_dir}/{name}_roundtrip.gnucash"
+                converter = LedgerToGnuCashSqliteConverter()
+                converter.convert_from_ledger(book)
+                converter.save(db_path)
+                round_trip = GnuCashSqliteToLedgerConverter().convert_to_ledger(db_path)
+                # the guids of a GnuCash book are kept
+                self.assertEqual(book.accounts, round_trip.accounts)
+                self.assertEqual(book.transactions, round_trip.transactions)
+
+    def test_zero_splits(self):
+        """
+        test that zero value splits survive a round trip
+        """
+        book = Book(name="zero")
+        for account_id, account_type in [
+            ("Assets", "ASSET"),
+            ("Assets:Checking", "BANK"),
+            ("Expenses", "EXPENSE"),
+            ("Expenses:Fees", "EXPENSE"),
+        ]:
+            parent_id, _, name = account_id.rpartition(":")
+            book.add_account(
+                Account(
+                    account_id=account_id,
+                    name=name,
+                    account_type=account_type,
+                    parent_account_id=parent_id or None,
+                )
+            )
+        book.add_transaction(
+            "fee",
+            Transaction(
+                isodate="2024-03-01",
+                description="waived fee",
+                splits=[
+                    Split(amount=0.0, account_id="Expenses:Fees", memo="waived"),
+                    Split(amount=0.0, account_id="Assets:Checking"),
+                ],
+            ),
+        )
+        db_path = f"{self.target_dir}/zero.gnucash"
+        GnuCashSqlite.save(book, db_path)
+        round_trip = GnuCashSqliteToLedgerConverter().convert_to_ledger(db_path)
+        self.assertEqual(1, len(round_trip.transactions))
+        tx = next(iter(round_trip.transactions.values()))
+        self.assertEqual(2, len(tx.splits))
+        # the account ids of the written book are guids
+        self.assertEqual(
+            {("Fees", "waived"), ("Checking", None)},
+            {
+                (round_trip.accounts[split.account_id].name, split.memo or None)
+                for split in tx.splits
+            },
+        )
+        self.assertEqual([0.0, 0.0], [split.amount for split in tx.splits])
+
+    def test_unknown_account(self):
+        """
+        test that a split of an unknown account raises unless the book is lenient
+        """
+        book = Book(name="unknown")
+        book.add_account(
+            Account(account_id="Assets", name="Assets", account_type="ASSET")
+        )
+        book.transactions["tx"] = Transaction(
+            isodate="2024-05-01",
+            description="lost split",
+            splits=[
+                Split(amount=1.0, account_id="Assets"),
+                Split(amount=-1.0, account_id="Missing"),
+            ],
+        )
+        db_path = f"{self.target_dir}/unknown.gnucash"
+        with self.assertRaises(ValueError) as context:
+            GnuCashSqlite.save(book, db_path)
+        self.assertIn("Missing", str(context.exception))
+        book.lenient = True
+        GnuCashSqlite.save(book, db_path)
+        connection = sqlite3.connect(db_path)
+        self.assertEqual(
+            1, connection.execute("SELECT count(*) FROM splits").fetchone()[0]
+        )
+        connection.close()
+
+    def test_transaction_currency_scale(self):
+        """
+        test that split values are read at the scale of the transaction currency
+        not of the account commodity e.g. a JPY account in a EUR transaction
+        """
+        book = Book(name="jpy")
+        for account_id, account_type, currency in [
+            ("Assets", "ASSET", "EUR"),
+            ("Assets:Checking", "BANK", "EUR"),
+            ("Expenses", "EXPENSE", "EUR"),
+            ("Expenses:Travel", "EXPENSE", "JPY"),
+        ]:
+            parent_id, _, name = account_id.rpartition(":")
+            book.add_account(
+                Account(
+                    account_id=account_id,
+                    name=name,
+                    account_type=account_type,
+                    currency=currency,
+                    parent_account_id=parent_id or None,
+                )
+            )
+        book.add_transaction(
+            "ticket",
+            Transaction(
+                isodate="2024-04-01",
+                description="train ticket",
+                splits=[
+                    Split(amount=-12.34, account_id="Assets:Checking"),
+                    Split(amount=12.34, account_id="Expenses:Travel"),
+                ],
+            ),
+        )
+        db_path = f"{self.target_dir}/jpy.gnucash"
+        GnuCashSqlite.save(book, db_path)
+        connection = sqlite3.connect(db_path)
+        self.assertEqual(
+            [(-1234, 100), (1234, 100)],
+            connection.execute(
+                "SELECT value_num, value_denom FROM splits ORDER BY value_num"
+            ).fetchall(),
+        )
+        connection.close()
+        round_trip = GnuCashSqliteToLedgerConverter().convert_to_ledger(db_path)
+        tx = next(iter(round_trip.transactions.values()))
+        self.assertEqual(
+            {"Checking": -12.34, "Travel": 12.34},
+            {
+                round_trip.accounts[split.account_id].name: split.amount
+                for split in tx.splits
+            },
+        )
+        self.assertEqual(0, Amount.scale_of_denom(1))
+        self.assertEqual(2, Amount.scale_of_denom(100))
+        self.assertEqual(3, Amount.scale_of_denom(8))
+
+    def test_bulk_save(self):
+        """
+        test bulk inserting a generated book
+        """
+        book = Book(name="bulk")
+        for account_id, account_type in [
+            ("Assets", "ASSET"),
+            ("Assets:Checking", "BANK"),
+            ("Expenses", "EXPENSE"),
+            ("Expenses:Food", "EXPENSE"),
+        ]:
+            parent_id, _, name = account_id.rpartition(":")
+            book.add_account(
+                Account(
+                    account_id=account_id,
+                    name=name,
+                    account_type=account_type,
+                    parent_account_id=parent_id or None,
+                )
+            )
+        count = 100000
+        for i in range(count):
+            amount = Amount.from_minor(i % 10000 + 1)
+            book.transactions[f"tx{i}"] = Transaction(
+                isodate=f"2024-{i % 12 + 1:02d}-{i % 28 + 1:02d}",
+                description=f"purchase {i}",
+                splits=[
+                    Split(amount=amount, account_id="Expenses:Food"),
+                    Split(amount=-amount, account_id="Assets:Checking"),
+                ],
+            )
+        db_path = f"{self.target_dir}/bulk.gnucash"
+        written = GnuCashSqlite.save(book, db_path, batch_size=5000)
+        self.assertEqual(count, written)
+        connection = sqlite3.connect(db_path)
+        self.assertEqual(
+            "delete", connection.execute("PRAGMA journal_mode").fetchone()[0]
+        )
+        indexes = connection.execute(
+            "SELECT count(*) FROM sqlite_master WHERE type='index' AND sql IS NOT NULL"
+        ).fetchone()[0]
+        self.assertEqual(len(GnuCashSqlite.indexes), indexes)
+        self.assertEqual(
+            (2 * count, 0),
+            connection.execute(
+                "SELECT count(*), sum(value_num) FROM splits"
+            ).fetchone(),
+        )
+        connection.close()
+        # the root account of the generated book has been added
+        round_trip = GnuCashSqliteToLedgerConverter().convert_to_ledger(db_path)
+        self.assertEqual(5, len(round_trip.accounts))
+        self.assertEqual(count, len(round_trip.transactions))
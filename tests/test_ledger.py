@@ -4,7 +4,7 @@ Created on 2024-10-05
 @author: wf
 """
 
-from nomina.ledger import Book
+from nomina.ledger import Account, Book, BookSlice, Split, Transaction
 from tests.basetest import Basetest
 from tests.example_testcases import NominaExample
 
@@ -48,3 +48,345 @@ class Test_Ledger(Basetest):
         if self.debug:
             stats.show()
         self.assertEqual(0, stats.accounts)
+
+    def test_columnar(self):
+        """
+        test the columnar split store engine against the object based one
+        """
+        for name, example in self.examples.items():
+            with self.subTest(f"Testing {name}"):
+                ledger_book = example.get_ledger_book()
+                ledger_book.lenient = True
+                columnar_book = example.get_ledger_book()
+                columnar_book.lenient = True
+                columnar_book.columnar = True
+                self.assertEqual(ledger_book.get_stats(), columnar_book.get_stats())
+                balances = ledger_book.calc_balances()
+                columnar_balances = columnar_book.calc_balances()
+                self.assertEqual(balances.keys(), columnar_balances.keys())
+                for account_id, balance in balances.items():
+                    if balance is None:
+                        self.assertIsNone(columnar_balances[account_id])
+                    else:
+                        self.assertAlmostEqual(balance, columnar_balances[account_id])
+                stats = ledger_book.filter().get_stats()
+                columnar_stats = columnar_book.filter().get_stats()
+                self.assertEqual(stats, columnar_stats)
+                store = columnar_book.get_split_store()
+                for t, tx_id in enumerate(store.transaction_ids):
+                    tx = store.to_transaction(t)
+                    self.assertEqual(
+                        len(ledger_book.transactions[tx_id].splits), len(tx.splits)
+                    )
+                    # the time part of the date is kept
+                    self.assertEqual(
+                        ledger_book.transactions[tx_id].isodate, tx.isodate
+                    )
+
+    def test_split_store_incremental(self):
+        """
+        test that added transactions extend the split store instead of rebuilding it
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        ledger_book.columnar = True
+        store = ledger_book.get_split_store()
+        split_count = store.split_count
+        tx = Transaction(
+            isodate="2024-10-07 10:30:00 +0200",
+            description="Coffee",
+            splits=[
+                Split(amount=-2.5, account_id="Cash"),
+                Split(amount=2.5, account_id="Expenses:Food"),
+            ],
+        )
+        ledger_book.add_transaction("Cafe2024-10-07", tx)
+        self.assertTrue(ledger_book._get_synced_indexes()["split_store"])
+        self.assertIs(store, ledger_book.get_split_store())
+        self.assertEqual(split_count + 2, store.split_count)
+        t = store.transaction_ids.index("Cafe2024-10-07")
+        self.assertEqual(tx.isodate, store.to_transaction(t).isodate)
+        ledger_book.columnar = False
+        balances = ledger_book.calc_balances()
+        ledger_book.columnar = True
+        self.assertEqual(balances, ledger_book.calc_balances())
+        # replacing a transaction rebuilds the store
+        ledger_book.add_transaction("Cafe2024-10-07", tx)
+        self.assertIsNot(store, ledger_book.get_split_store())
+
+    def test_posting_index(self):
+        """
+        test the incrementally maintained posting index
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        postings = ledger_book.get_postings("Cash")
+        self.assertEqual(2, len(postings))
+        # incremental update
+        tx = Transaction(
+            isodate="2024-10-07",
+            description="Coffee",
+            splits=[
+                Split(amount=-2.5, account_id="Cash"),
+                Split(amount=2.5, account_id="Expenses:Food"),
+            ],
+        )
+        ledger_book.add_transaction("Cafe2024-10-07", tx)
+        self.assertTrue(ledger_book._get_synced_indexes()["postings"])
+        self.assertEqual(("Cafe2024-10-07", 0), ledger_book.get_postings("Cash")[-1])
+        self.assertEqual(3, len(ledger_book.get_postings("Expenses:Food")))
+        filtered_book = ledger_book.filter(start_date="2024-10-07")
+        self.assertEqual(1, len(filtered_book.get_postings("Cash")))
+        self.assertEqual([], filtered_book.get_postings("Expenses"))
+
+    def test_date_index(self):
+        """
+        test the date index and the bisect based filtering
+        """
+        ledger_book = self.examples["simple_sample"].get_ledger_book()
+        date_keys, date_tx_ids = ledger_book.get_date_index()
+        self.assertEqual(sorted(date_keys), date_keys)
+        self.assertEqual(len(date_keys), len(date_tx_ids))
+        stats = ledger_book.get_stats()
+        self.assertEqual(stats.start_date, date_keys[0])
+        self.assertEqual(stats.end_date, date_keys[-1])
+        tx = Transaction(isodate="2014-12-01", description="inserted")
+        ledger_book.add_transaction("inserted", tx)
+        self.assertTrue(ledger_book._get_synced_indexes()["dates"])
+        tx_ids = ledger_book.get_transaction_ids_in_range("2014-12-01", "2014-12-01")
+        self.assertEqual(["inserted"], tx_ids)
+        ledger_book.lenient = True
+        filtered_book = ledger_book.filter(
+            "2014-12-01", "2014-12-31", remove_unused_accounts=False
+        )
+        for tx in filtered_book.transactions.values():
+            self.assertTrue("2014-12-01" <= tx.isodate[:10] <= "2014-12-31")
+        self.assertEqual(
+            len(filtered_book.transactions),
+            len(ledger_book.get_transaction_ids_in_range("2014-12-01", "2014-12-31")),
+        )
+
+    def test_compact_records(self):
+        """
+        test the slot based records with interned strings
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        transaction = next(iter(ledger_book.transactions.values()))
+        split = transaction.splits[0]
+        for record in [transaction, split, ledger_book.accounts[split.account_id]]:
+            self.assertFalse(hasattr(record, "__dict__"))
+        other = Split(amount=1.0, account_id="".join(split.account_id))
+        self.assertIs(split.account_id, other.account_id)
+        # YAML round trip
+        yaml_str = ledger_book.to_yaml()
+        reloaded = Book.from_yaml(yaml_str)
+        self.assertEqual(ledger_book.transactions, reloaded.transactions)
+        self.assertEqual(ledger_book.accounts, reloaded.accounts)
+
+    def test_book_slice(self):
+        """
+        test the copy-on-write filtered book slice
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        account_count = len(ledger_book.accounts)
+        book_slice = ledger_book.filter("2024-10-06", "2024-10-06")
+        self.assertIsInstance(book_slice, BookSlice)
+        self.assertEqual(2, len(book_slice.transactions))
+        for tx_id, tx in book_slice.transactions.items():
+            self.assertIs(ledger_book.transactions[tx_id], tx)
+        empty_slice = ledger_book.filter("2025-01-01")
+        self.assertEqual(0, len(empty_slice.accounts))
+        self.assertEqual(account_count, len(ledger_book.accounts))
+        tx_id = "Bakery2024-10-06_0900_1"
+        tx = book_slice.get_transaction_for_update(tx_id)
+        tx.memo = "changed"
+        self.assertIsNot(ledger_book.transactions[tx_id], tx)
+        self.assertEqual("Fresh sourdough bread", ledger_book.transactions[tx_id].memo)
+        yaml_str = book_slice.to_yaml()
+        self.assertIn("changed", yaml_str)
+        # splits are only modified on the private copy
+        balances = ledger_book.calc_balances()
+        postings = list(ledger_book.get_postings("Expenses:Food"))
+        tx.splits[0].amount += 1.0
+        book_slice.touch()
+        self.assertEqual(balances, ledger_book.calc_balances())
+        self.assertEqual(postings, ledger_book.get_postings("Expenses:Food"))
+        self.assertEqual(-3.5, ledger_book.transactions[tx_id].splits[0].amount)
+        # the other transactions of the slice are shared with the parent
+        other_id = next(t for t in book_slice.transactions if t != tx_id)
+        self.assertIs(
+            ledger_book.transactions[other_id], book_slice.transactions[other_id]
+        )
+
+    def test_filter_order(self):
+        """
+        test that filtered transactions keep the insertion order
+        """
+        ledger_book = Book()
+        ledger_book.add_account(
+            Account(account_id="Cash", name="Cash", account_type="CASH")
+        )
+        for tx_id, isodate in [
+            ("c", "2024-03-01"),
+            ("a", "2024-01-01"),
+            ("b", "2024-02-01"),
+        ]:
+            ledger_book.add_transaction(
+                tx_id,
+                Transaction(
+                    isodate=isodate, splits=[Split(amount=1.0, account_id="Cash")]
+                ),
+            )
+        for columnar in [False, True]:
+            with self.subTest(columnar=columnar):
+                ledger_book.columnar = columnar
+                filtered_book = ledger_book.filter("2024-01-01", "2024-02-28")
+                self.assertEqual(["a", "b"], list(filtered_book.transactions))
+                filtered_book = ledger_book.filter()
+                self.assertEqual(["c", "a", "b"], list(filtered_book.transactions))
+
+    def test_account_tree(self):
+        """
+        test the account tree and the hierarchical balance rollup
+        """
+        book = Book()
+        book.create_account("Assets", description="root", account_type="ASSET")
+        book.create_account("Bank", description="bank", parent_account_id="Assets")
+        book.create_account(
+            "Checking", description="checking", parent_account_id="Assets:Bank"
+        )
+        book.create_account("Expenses", description="expenses")
+        book.create_account("Food", description="food", parent_account_id="Expenses")
+        tree = book.get_account_tree()
+        self.assertEqual(2, tree.depth["Assets:Bank:Checking"])
+        self.assertEqual(
+            ["Assets:Bank", "Assets"], tree.ancestors["Assets:Bank:Checking"]
+        )
+        checking = book.lookup_account("Assets:Bank:Checking")
+        self.assertEqual("Assets:Bank:Checking", book.fq_account_name(checking))
+        self.assertEqual("Assets/Bank/Checking", book.fq_account_name(checking, "/"))
+        book.add_transaction(
+            "t1",
+            Transaction(
+                isodate="2024-10-06",
+                splits=[
+                    Split(amount=-3.5, account_id="Assets:Bank:Checking"),
+                    Split(amount=3.5, account_id="Expenses:Food"),
+                ],
+            ),
+        )
+        for columnar in [False, True]:
+            book.columnar = columnar
+            balances = book.calc_balances()
+            self.assertAlmostEqual(-3.5, balances["Assets"], msg=f"{columnar}")
+            self.assertAlmostEqual(-3.5, balances["Assets:Bank"])
+            self.assertAlmostEqual(3.5, balances["Expenses"])
+
+    def test_running_balances(self):
+        """
+        test the incrementally maintained running balances
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        self.assertAlmostEqual(-5.9, ledger_book.balance_as_of("Cash", "2024-10-06"))
+        self.assertAlmostEqual(0.0, ledger_book.balance_as_of("Cash", "2024-10-05"))
+        # add an earlier transaction - the later balances need to be shifted
+        ledger_book.add_transaction(
+            "Kiosk2024-10-01",
+            Transaction(
+                isodate="2024-10-01",
+                splits=[
+                    Split(amount=-1.0, account_id="Cash"),
+                    Split(amount=1.0, account_id="Expenses:Food"),
+                ],
+            ),
+        )
+        self.assertTrue(ledger_book._get_synced_indexes()["running_balances"])
+        register = ledger_book.get_register("Cash")
+        self.assertEqual("Kiosk2024-10-01", register[0].transaction_id)
+        self.assertAlmostEqual(-6.9, register[-1].balance)
+        self.assertAlmostEqual(
+            6.9,
+            ledger_book.balance_as_of("Expenses", "2024-12-31", with_subaccounts=True),
+        )
+        ledger_book.remove_transaction("Bakery2024-10-06_0900_1")
+        self.assertTrue(ledger_book._get_synced_indexes()["running_balances"])
+        self.assertAlmostEqual(-3.4, ledger_book.balance_as_of("Cash", "2024-10-06"))
+        self.assertEqual(2, len(ledger_book.get_postings("Cash")))
+
+    def test_unsorted_register(self):
+        """
+        test that out of order postings are merged in date order and
+        that splits without amount are not posted
+        """
+        ledger_book = Book()
+        ledger_book.add_account(
+            Account(account_id="Cash", name="Cash", account_type="CASH")
+        )
+        for tx_id, isodate, amount in [
+            ("c", "2024-03-01", 3.0),
+            ("a", "2024-01-01", 1.0),
+            ("n", "2024-01-15", None),
+            ("b", "2024-02-01", 2.0),
+            ("a2", "2024-01-01", 0.5),
+        ]:
+            ledger_book.transactions[tx_id] = Transaction(
+                isodate=isodate, splits=[Split(amount=amount, account_id="Cash")]
+            )
+        register = ledger_book.get_register("Cash")
+        self.assertEqual(
+            [("a", 1.0), ("a2", 1.5), ("b", 3.5), ("c", 6.5)],
+            [(entry.transaction_id, entry.balance) for entry in register],
+        )
+        self.assertEqual(3.5, ledger_book.balance_as_of("Cash", "2024-02-15"))
+
+    def test_balance_checkpoints(self):
+        """
+        test the monthly and yearly balance checkpoints
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        balances = ledger_book.get_period_end_balances("2024-10")
+        self.assertEqual(ledger_book.calc_balances(), balances)
+        self.assertIsNone(ledger_book.get_period_end_balances("2024-09")["Cash"])
+        # add a transaction in an earlier month
+        ledger_book.add_transaction(
+            "Kiosk2024-09-30",
+            Transaction(
+                isodate="2024-09-30",
+                splits=[
+                    Split(amount=-1.0, account_id="Cash"),
+                    Split(amount=1.0, account_id="Expenses:Food"),
+                ],
+            ),
+        )
+        self.assertTrue(ledger_book._get_synced_indexes()["checkpoints"])
+        september = ledger_book.get_period_end_balances("2024-09")
+        self.assertEqual(-1.0, september["Cash"])
+        self.assertEqual(1.0, september["Expenses"])
+        self.assertEqual(
+            ledger_book.calc_balances(), ledger_book.get_period_end_balances("2024")
+        )
+        self.assertAlmostEqual(
+            5.9,
+            ledger_book.get_period_delta("Expenses", "2024-10", with_subaccounts=True),
+        )
+        self.assertAlmostEqual(
+            -6.9, ledger_book.get_period_delta("Cash", "2024-01", "2024-12")
+        )
+        ledger_book.remove_transaction("Kiosk2024-09-30")
+        self.assertIsNone(ledger_book.get_period_end_balances("2024-09")["Cash"])
+
+    def test_stats_cache(self):
+        """
+        test the memoized statistics
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        stats = ledger_book.get_stats()
+        self.assertIs(stats, ledger_book.get_stats())
+        ledger_book.add_transaction(
+            "Kiosk2024-10-07", Transaction(isodate="2024-10-07", description="Kiosk")
+        )
+        stats = ledger_book.get_stats()
+        self.assertEqual("2024-10-07", stats.end_date)
+        self.assertEqual(stats, ledger_book.calc_stats())
+        ledger_book.add_account(
+            Account(account_id="Bank", name="Bank", account_type="BANK", currency="USD")
+        )
+        self.assertEqual(1, ledger_book.get_stats().currencies["USD"])
@@ -4,9 +4,17 @@ Created on 2024-10-06
 @author: wf
 """
 
+import os
+import re
 from copy import deepcopy
 
-from nomina.qif_ledger import QifToLedgerConverter
+from nomina.ledger import Book
+from nomina.nomina_cmd import NominaCmd
+from nomina.qif_ledger import (
+    LedgerQifWriter,
+    LedgerToQifConverter,
+    QifToLedgerConverter,
+)
 from tests.basetest import Basetest
 from tests.example_testcases import NominaExample
 
@@ -24,12 +32,12 @@ class Test_LedgerQif(Basetest):
         """
         test the expenses example
         """
-        for name,accounts_diff,currencies_diff in [
-             ("qifparser_test_file",0,0),
-             ("expenses",2,5)
+        for name, accounts_diff, currencies_diff in [
+            ("qifparser_test_file", 0, 0),
+            ("expenses", 2, 5),
         ]:
             example = self.examples[name]
-            qif_example = str(example.example_path) + "/"+name+".qif"
+            qif_example = str(example.example_path) + "/" + name + ".qif"
             converter = QifToLedgerConverter()
             converter.load(qif_example)
             book = converter.convert_to_target()
@@ -43,4 +51,257 @@ class Test_LedgerQif(Basetest):
             expected_stats.accounts += accounts_diff
             expected_stats.currencies["EUR"] += currencies_diff
             example.check_stats(stats, expected_stats=expected_stats)
-            pass
+            # parsing in parallel gives the same book
+            parallel_converter = QifToLedgerConverter(workers=2)
+            parallel_book = parallel_converter.convert_to_ledger(qif_example)
+            self.assertEqual(sorted(book.accounts), sorted(parallel_book.accounts))
+            self.assertEqual(
+                sorted(book.transactions), sorted(parallel_book.transactions)
+            )
+            self.assertEqual(book.calc_balances(), parallel_book.calc_balances())
+
+    def test_resolution(self):
+        """
+        test resolving transfer accounts and categories via the resolution table
+        """
+        from nomina.qif import SplitCategory
+
+        converter = QifToLedgerConverter()
+        book = Book()
+        converter.create_root_accounts(book)
+        for name, parent in [
+            ("Food", "Category"),
+            ("Checking", None),
+            ("Travel", "Category"),
+        ]:
+            account = book.create_account(
+                name, description="", parent_account_id=parent
+            )
+            converter.register_account(account)
+        # a regular account takes precedence over a category with the same name
+        account = book.create_account("Travel", description="")
+        converter.register_account(account)
+        for markup, expected in [
+            ("Food", "Category:Food"),
+            ("[Checking]", "Checking"),
+            ("Travel", "Travel"),
+            ("Food/Business", "Category:Food"),
+            ("Unknown", None),
+            ("[Unknown]", None),
+        ]:
+            with self.subTest(markup=markup):
+                self.assertEqual(
+                    expected, converter.resolve_split_account_id(SplitCategory(markup))
+                )
+
+    def account_name(self, account_id: str) -> str:
+        """
+        get the name of the given account independent of the Category root
+        the QIF import puts the categories of INCOME and EXPENSE accounts under
+        """
+        if account_id.startswith("Category:"):
+            account_id = account_id[len("Category:") :]
+        return account_id
+
+    def transaction_signature(self, book: Book, split_memos: bool = True) -> list:
+        """
+        get the transactions of the given book independent of their ids and order
+        """
+        signature = sorted(
+            (
+                tx.isodate or "",
+                tx.payee or "",
+                tx.memo or "",
+                tuple(
+                    sorted(
+                        (
+                            self.account_name(split.account_id),
+                            split.amount,
+                            (split.memo or "") if split_memos else "",
+                        )
+                        for split in tx.splits
+                    )
+                ),
+            )
+            for tx in book.transactions.values()
+            if tx.splits
+        )
+        return signature
+
+    def test_ledger2qif(self):
+        """
+        test the QIF round trip of the QIF examples and the streaming of a
+        Ledger Book with hierarchical accounts and split transactions
+        """
+        os.makedirs("/tmp/nomina", exist_ok=True)
+        for name in ["qifparser_test_file", "expenses"]:
+            with self.subTest(name=name):
+                example = self.examples[name]
+                qif_example = str(example.example_path) + "/" + name + ".qif"
+                book = QifToLedgerConverter().convert_to_ledger(qif_example)
+                qif_file = f"/tmp/nomina/{name}_roundtrip.qif"
+                converter = LedgerToQifConverter()
+                converter.convert_from_ledger(book)
+                converter.save(qif_file)
+                round_trip = QifToLedgerConverter().convert_to_ledger(qif_file)
+                self.assertEqual(
+                    {self.account_name(account_id) for account_id in book.accounts},
+                    {
+                        self.account_name(account_id)
+                        for account_id in round_trip.accounts
+                    },
+                )
+                self.assertEqual(
+                    self.transaction_signature(book),
+                    self.transaction_signature(round_trip),
+                )
+        book = Book.load_from_yaml_file(self.examples["expenses2024"].ledger_file)
+        # stream the book while it is being copied
+        qif_file = "/tmp/nomina/expenses2024_streamed.qif"
+        with LedgerQifWriter.open(qif_file) as writer:
+            copy = Book()
+            copy.listeners.append(writer)
+            for account in book.accounts.values():
+                copy.add_account(account)
+            for transaction_id, transaction in book.transactions.items():
+                copy.add_transaction(transaction_id, transaction)
+            writer.on_finished(copy)
+        round_trip = QifToLedgerConverter().convert_to_ledger(qif_file)
+        # QIF has no memo for the split of the main account
+        self.assertEqual(
+            self.transaction_signature(book, split_memos=False),
+            self.transaction_signature(round_trip, split_memos=False),
+        )
+
+    def test_ledger2qif_categories(self):
+        """
+        test that INCOME and EXPENSE accounts are written as categories and
+        that the lists precede the transactions when streaming
+        """
+        for name, ext in [("expenses2024", "yaml"), ("qifparser_test_file", "qif")]:
+            with self.subTest(name=name):
+                source = f"{self.examples[name].example_path}/{name}.{ext}"
+                qif_file = f"/tmp/nomina/{name}_categories.qif"
+                exit_code = NominaCmd().cmd_main(
+                    ["--convert", source, "--format", "QIF", "--output", qif_file]
+                )
+                self.assertEqual(0, exit_code)
+                with open(qif_file, encoding="iso-8859-1") as file:
+                    lines = [line.rstrip("\n") for line in file]
+                headers = [line for line in lines if line.startswith("!")]
+                # the !Account records with their name and type lines
+                accounts = [
+                    (lines[i + 1], lines[i + 2])
+                    for i, line in enumerate(lines)
+                    if line == "!Account"
+                ]
+                for _name_line, type_line in accounts:
+                    self.assertIn(type_line[1:], LedgerQifWriter.transaction_types)
+                # every account is declared once
+                self.assertEqual(len(set(accounts)), len(accounts))
+                # the category and class lists precede the transactions
+                transaction_headers = headers[headers.index("!Account") :]
+                self.assertNotIn("!Type:Cat", transaction_headers)
+                self.assertNotIn("!Type:Class", transaction_headers)
+                if name == "expenses2024":
+                    self.assertEqual(
+                        ["NExpenses", "DGeneral Expenses", "E"], lines[1:4]
+                    )
+                    self.assertIn("SExpenses:Food", lines)
+
+    def test_ledger2qif_timestamps(self):
+        """
+        test that transactions with a time are written with a QIF date
+        """
+        book = Book.load_from_yaml_file(self.examples["expenses2024"].ledger_file)
+        for transaction in book.transactions.values():
+            transaction.isodate = f"{transaction.isodate[:10]} 10:59:00 +0000"
+        qif_file = "/tmp/nomina/expenses2024_timestamps.qif"
+        converter = LedgerToQifConverter()
+        converter.convert_from_ledger(book)
+        converter.save(qif_file)
+        with open(qif_file, encoding="iso-8859-1") as file:
+            # the D lines of the accounts are descriptions
+            date_lines = [line.strip() for line in file if re.match(r"D\d", line)]
+        self.assertEqual(len(book.transactions), len(date_lines))
+        for date_line in date_lines:
+            self.assertRegex(date_line, r"^D\d\d/\d\d/\d\d\d\d$")
+        round_trip = QifToLedgerConverter().convert_to_ledger(qif_file)
+        for transaction in book.transactions.values():
+            transaction.isodate = transaction.isodate[:10]
+        self.assertEqual(
+            self.transaction_signature(book, split_memos=False),
+            self.transaction_signature(round_trip, split_memos=False),
+        )
+
+    def test_merge_transfers(self):
+        """
+        test merging the mirrored halves of transfers of a multi-account export
+        """
+        qif_text = """!Account
+NChecking
+TBank
+^
+!Type:Bank
+D2024/01/05
+T-100.00
+L[Savings]
+^
+D2024/01/05
+T-100.00
+L[Savings]
+^
+D2024/01/06
+T-20.00
+L[Savings]
+^
+!Account
+NSavings
+TBank
+^
+!Type:Bank
+D2024/01/05
+T100.00
+L[Checking]
+^
+D2024/01/05
+T100.00
+L[Checking]
+^
+D2024/01/06
+T-20.00
+L[Checking]
+^
+"""
+        os.makedirs("/tmp/nomina", exist_ok=True)
+        qif_file = "/tmp/nomina/transfers.qif"
+        with open(qif_file, "w", encoding="iso-8859-1") as file:
+            file.write(qif_text)
+        for merge_transfers, expected_transactions, expected_merged in [
+            (False, 6, 0),
+            (True, 4, 2),
+        ]:
+            with self.subTest(merge_transfers=merge_transfers):
+                converter = QifToLedgerConverter(merge_transfers=merge_transfers)
+                book = converter.convert_to_ledger(qif_file)
+                self.assertEqual(expected_transactions, len(book.transactions))
+                self.assertEqual(expected_merged, converter.merged_transfers)
+                if merge_transfers:
+                    balances = book.calc_balances()
+                    # the 01-06 halves are not mirrored - they move money in opposite directions
+                    self.assertEqual(-200.0, balances["Checking"])
+                    self.assertEqual(200.0, balances["Savings"])
+        # merging is opt-in on the command line
+        for argv, expected_transactions in [
+            ([], 6),
+            (["--merge-transfers"], 4),
+            (["--workers", "2"], 6),
+        ]:
+            with self.subTest(argv=argv):
+                yaml_file = "/tmp/nomina/transfers.yaml"
+                exit_code = NominaCmd().cmd_main(
+                    ["--convert", qif_file, "--output", yaml_file] + argv
+                )
+                self.assertEqual(0, exit_code)
+                book = Book.load_from_yaml_file(yaml_file)
+                self.assertEqual(expected_transactions, len(book.transactions))
@@ -0,0 +1,128 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+import unittest
+
+from nomina.file_formats import AccountingFileFormats
+from nomina.ledger import Split, Transaction
+from nomina.nomina_cmd import NominaCmd
+from nomina.parquet_book import ParquetBook, pa
+from tests.basetest import Basetest
+from tests.example_testcases import NominaExample
+
+
+@unittest.skipIf(pa is None, "pyarrow is not installed")
+class Test_ParquetBook(Basetest):
+    """
+    test the Parquet Ledger Book datasets
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.examples = NominaExample.get_examples()
+        self.target_dir = "/tmp/nomina"
+        os.makedirs(self.target_dir, exist_ok=True)
+
+    def test_round_trip(self):
+        """
+        test saving and reloading datasets
+        """
+        detector = AccountingFileFormats()
+        for name, example in self.examples.items():
+            with self.subTest(f"Testing {name}"):
+                ledger_book = example.get_ledger_book()
+                dataset_path = f"{self.target_dir}/{name}.parquet"
+                ParquetBook.save(ledger_book, dataset_path)
+                self.assertEqual(
+                    "LB-PARQUET", detector.detect_format(dataset_path).acronym
+                )
+                parquet_book = ParquetBook.open(dataset_path)
+                reloaded = parquet_book.to_book()
+                self.assertEqual(ledger_book.name, reloaded.name)
+                self.assertEqual(ledger_book.accounts, reloaded.accounts)
+                self.assertEqual(ledger_book.transactions, reloaded.transactions)
+                # the split columns feed the vectorized balance calculation
+                ledger_book.lenient = True
+                ledger_book.columnar = True
+                store = parquet_book.to_split_store()
+                expected = ledger_book.get_split_store()
+                for column in [
+                    "amounts",
+                    "account_idx",
+                    "valid",
+                    "tx_dates",
+                    "tx_split_start",
+                ]:
+                    self.assertEqual(
+                        getattr(expected, column).tolist(),
+                        getattr(store, column).tolist(),
+                        column,
+                    )
+                self.assertEqual(
+                    ledger_book.calc_balances(), parquet_book.calc_balances()
+                )
+
+    def test_filter(self):
+        """
+        test filtering by date range with partition pruning
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        dataset_path = f"{self.target_dir}/expenses2024_filter.parquet"
+        parquet_book = ParquetBook.save(ledger_book, dataset_path)
+        for start_date, end_date in [
+            (None, None),
+            ("2024-03-01", "2024-06-30"),
+            ("2024-10-06", None),
+        ]:
+            expected = ledger_book.filter(start_date, end_date)
+            actual = parquet_book.filter(start_date, end_date)
+            self.assertEqual(list(expected.transactions), list(actual.transactions))
+            self.assertEqual(expected.transactions, actual.transactions)
+            self.assertEqual(expected.accounts, actual.accounts)
+        # the filter keeps the insertion order of an unsorted book as Book.filter does
+        for transaction_id, isodate in [("t2", "2024-02-01"), ("t1", "2024-01-01")]:
+            ledger_book.add_transaction(
+                transaction_id,
+                Transaction(
+                    isodate=isodate,
+                    splits=[
+                        Split(amount=-1.0, account_id="Cash"),
+                        Split(amount=1.0, account_id="Expenses:Food"),
+                    ],
+                ),
+            )
+        parquet_book = ParquetBook.save(ledger_book, dataset_path)
+        expected = ledger_book.filter("2024-01-01", "2024-02-28")
+        self.assertEqual(["t2", "t1"], list(expected.transactions))
+        self.assertEqual(
+            list(expected.transactions),
+            list(parquet_book.filter("2024-01-01", "2024-02-28").transactions),
+        )
+
+    def test_convert(self):
+        """
+        test converting to and from Parquet datasets via the command line
+        """
+        cmd = NominaCmd()
+        example = self.examples["expenses2024"]
+        dataset_path = f"{self.target_dir}/expenses2024_converted.parquet"
+        yaml_file = f"{self.target_dir}/expenses2024_from_parquet.yaml"
+        for input_file, target_format, output_file in [
+            (example.ledger_file, "LB-PARQUET", dataset_path),
+            (dataset_path, "LB-YAML", yaml_file),
+        ]:
+            argv = [
+                "--convert",
+                str(input_file),
+                "--format",
+                target_format,
+                "--output",
+                output_file,
+            ]
+            exit_code = cmd.cmd_main(argv)
+            self.assertEqual(0, exit_code)
+        self.assertIn("Bakery2024-10-06_0900_1", open(yaml_file).read())
@@ -4,7 +4,11 @@ Created on 2024-09-30
 @author: wf
 """
 
-from nomina.qif import SplitCategory, SimpleQifParser
+import os
+
+from nomina.date_utils import DateUtils
+from nomina.qif import SimpleQifParser, SplitCategory
+from nomina.qif_ledger import QifToLedgerConverter
 from tests.basetest import Basetest
 from tests.example_testcases import NominaExample
 
@@ -84,7 +88,7 @@ class Test_QifParser(Basetest):
             ("!Account\nNMy Invst\nTInvst\n^", "Invst"),
             ("!Account\nNMy Asset\nTOth A\n^", "Oth A"),
             ("!Account\nNMy Liability\nTOth L\n^", "Oth L"),
-            ("!Account\nNMy Invoice\nTInvoice\n^", "Invoice")
+            ("!Account\nNMy Invoice\nTInvoice\n^", "Invoice"),
         ]
         for qif_text, expected_type in test_cases:
             with self.subTest(f"Testing account type {expected_type}"):
@@ -92,4 +96,123 @@ class Test_QifParser(Basetest):
                 parser.parse(qif_text.splitlines())
                 # Get first (and only) account
                 account = next(iter(parser.accounts.values()))
-                self.assertEqual(expected_type, account.account_type)
\ No newline at end of file
+                self.assertEqual(expected_type, account.account_type)
+
+    def test_streaming(self):
+        """
+        test the streaming parser and the conversion of forward references
+        """
+        qif_text = """!Account
+NChecking
+TBank
+^
+!Type:Bank
+D2024/01/05
+T-12.50
+PBakery
+LFood
+^
+D2024/01/06
+T-100.00
+L[Savings]
+^
+!Type:Cat
+NFood
+DFood and drinks
+^
+!Account
+NSavings
+TBank
+^
+"""
+        qif_file = "/tmp/nomina/forward_references.qif"
+        os.makedirs(os.path.dirname(qif_file), exist_ok=True)
+        with open(qif_file, "w", encoding="iso-8859-1") as file:
+            file.write(qif_text)
+        parser = SimpleQifParser()
+        records = list(parser.iter_file(qif_file))
+        kinds = [type(record).__name__ for _key, record in records]
+        self.assertEqual(
+            ["Account", "Transaction", "Transaction", "Category", "Account"], kinds
+        )
+        # streamed transactions are not kept
+        self.assertEqual(0, len(parser.transactions))
+        self.assertEqual(1, len(parser.categories))
+        converter = QifToLedgerConverter()
+        ledger_book = converter.convert_to_ledger(qif_file)
+        # the transactions are converted right away in file order
+        self.assertEqual(
+            [["Checking", "Dangling"], ["Checking", "Savings"]],
+            [
+                [split.account_id for split in transaction.splits]
+                for transaction in ledger_book.transactions.values()
+            ],
+        )
+        for transaction in ledger_book.transactions.values():
+            self.assertEqual(0.0, transaction.total_amount())
+        # the placeholder of the transfer account is completed by its record
+        self.assertEqual("Bank", ledger_book.accounts["Savings"].account_type)
+
+    def test_date_sniffing(self):
+        """
+        test that the dominant date format of a file is sniffed once and tried first
+        """
+        qif_lines = ["!Type:Cat", "NFood", "DFood and drinks", "^", "!Type:Bank"]
+        for i in range(20):
+            qif_lines.extend([f"D2024-03-{i + 1:02d}", f"T-{i + 1}.00", "LFood", "^"])
+        # a date that does not match the dominant format still parses
+        qif_lines.extend(["D31.12.24", "T-1.00", "LFood", "^"])
+        parser = SimpleQifParser()
+        parser.parse(qif_lines)
+        self.assertEqual("%Y-%m-%d", parser.date_formats[0])
+        self.assertEqual(sorted(DateUtils.default_formats), sorted(parser.date_formats))
+        isodates = [tx.isodate for tx in parser.transactions.values()]
+        self.assertEqual("2024-03-01", isodates[0])
+        self.assertEqual("2024-12-31", isodates[-1])
+
+    def test_parallel_parsing(self):
+        """
+        test parsing chunks of a QIF file in parallel against the sequential parse
+        """
+        qif_lines = ["!Type:Cat", "NFood", "^", "NRent", "^"]
+        for a, account in enumerate(["Checking", "Savings", "Cash"]):
+            qif_lines.extend(["!Account", f"N{account}", "TBank", "^", "!Type:Bank"])
+            for i in range(200):
+                qif_lines.extend(
+                    [
+                        f"D2024/{a + 1:02d}/{i % 28 + 1:02d}",
+                        f"T-{i + 1}.50",
+                        f"PPayee {i}",
+                        "LFood" if i % 2 else "LRent",
+                        "^",
+                    ]
+                )
+        qif_file = "/tmp/nomina/parallel.qif"
+        os.makedirs(os.path.dirname(qif_file), exist_ok=True)
+        with open(qif_file, "w", encoding="iso-8859-1") as file:
+            file.write("\n".join(qif_lines) + "\n")
+        sequential = SimpleQifParser()
+        sequential.parse_file(qif_file)
+        parallel = SimpleQifParser()
+        parallel.parse_file(qif_file, workers=2)
+        self.assertEqual(600, len(parallel.transactions))
+        # the chunks are parsed with the date format sniffed from the whole file
+        self.assertEqual("%Y/%m/%d", sequential.date_formats[0])
+        self.assertEqual(sequential.date_formats, parallel.date_formats)
+        self.assertEqual(list(sequential.accounts), list(parallel.accounts))
+        self.assertEqual(list(sequential.categories), list(parallel.categories))
+        self.assertEqual(list(sequential.transactions), list(parallel.transactions))
+        for key, tx in sequential.transactions.items():
+            ptx = parallel.transactions[key]
+            self.assertEqual(
+                (tx.start_line, tx.end_line, tx.account.name, tx.amount, tx.isodate),
+                (
+                    ptx.start_line,
+                    ptx.end_line,
+                    ptx.account.name,
+                    ptx.amount,
+                    ptx.isodate,
+                ),
+            )
+            # the transactions refer to the merged accounts
+            self.assertIs(parallel.accounts[ptx.account.name], ptx.account)
@@ -0,0 +1,157 @@
+"""
+Created on 2026-10-18
+
+@author: wf
+"""
+
+import os
+
+from nomina.file_formats import AccountingFileFormats
+from nomina.ledger import Account, Book, Split, Transaction
+from nomina.sqlite_book import SqliteBook
+from tests.basetest import Basetest
+from tests.example_testcases import NominaExample
+
+
+class Test_SqliteBook(Basetest):
+    """
+    test the SQLite backed Ledger Book
+    """
+
+    def setUp(self, debug=True, profile=True):
+        Basetest.setUp(self, debug=debug, profile=profile)
+        self.examples = NominaExample.get_examples()
+        self.target_dir = "/tmp/nomina"
+        os.makedirs(self.target_dir, exist_ok=True)
+
+    def test_round_trip(self):
+        """
+        test storing and reloading books
+        """
+        detector = AccountingFileFormats()
+        for name, example in self.examples.items():
+            with self.subTest(f"Testing {name}"):
+                ledger_book = example.get_ledger_book()
+                db_file = f"{self.target_dir}/{name}.sqlite"
+                sqlite_book = SqliteBook.create(db_file, ledger_book)
+                self.assertEqual("LB-SQLITE", detector.detect_format(db_file).acronym)
+                reloaded = sqlite_book.to_book()
+                self.assertEqual(ledger_book.name, reloaded.name)
+                self.assertEqual(ledger_book.accounts, reloaded.accounts)
+                self.assertEqual(ledger_book.transactions, reloaded.transactions)
+                self.assertEqual(ledger_book.get_stats(), sqlite_book.get_stats())
+                sqlite_book.close()
+
+    def test_queries(self):
+        """
+        test the queries pushed down to SQL against the in memory results
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        ledger_book.lenient = True
+        db_file = f"{self.target_dir}/expenses2024_queries.sqlite"
+        sqlite_book = SqliteBook.create(db_file, ledger_book)
+        self.assertEqual(ledger_book.calc_balances(), sqlite_book.calc_balances())
+        for start_date, end_date in [
+            (None, None),
+            ("2024-03-01", "2024-06-30"),
+            ("2024-10-06", None),
+        ]:
+            expected = ledger_book.filter(start_date, end_date)
+            actual = sqlite_book.filter(start_date, end_date)
+            self.assertEqual(expected.transactions, actual.transactions)
+            self.assertEqual(list(expected.transactions), list(actual.transactions))
+            self.assertEqual(expected.accounts, actual.accounts)
+        for account_id in ledger_book.accounts:
+            self.assertEqual(
+                ledger_book.get_register(account_id),
+                sqlite_book.get_register(account_id),
+            )
+            for with_subaccounts in [False, True]:
+                self.assertEqual(
+                    ledger_book.balance_as_of(
+                        account_id, "2024-06-30", with_subaccounts
+                    ),
+                    sqlite_book.balance_as_of(
+                        account_id, "2024-06-30", with_subaccounts
+                    ),
+                )
+        transaction_id = next(iter(ledger_book.transactions))
+        self.assertEqual(
+            ledger_book.transactions[transaction_id],
+            sqlite_book.get_transaction(transaction_id),
+        )
+        self.assertIsNone(sqlite_book.get_transaction("unknown"))
+        sqlite_book.close()
+        # the filter keeps the insertion order of an unsorted book as Book.filter does
+        for transaction_id, isodate in [("t2", "2024-02-01"), ("t1", "2024-01-01")]:
+            ledger_book.add_transaction(
+                transaction_id,
+                Transaction(
+                    isodate=isodate,
+                    splits=[
+                        Split(amount=-1.0, account_id="Cash"),
+                        Split(amount=1.0, account_id="Expenses:Food"),
+                    ],
+                ),
+            )
+        sqlite_book = SqliteBook.create(db_file, ledger_book)
+        expected = ledger_book.filter("2024-01-01", "2024-02-28")
+        self.assertEqual(["t2", "t1"], list(expected.transactions))
+        self.assertEqual(
+            list(expected.transactions),
+            list(sqlite_book.filter("2024-01-01", "2024-02-28").transactions),
+        )
+        sqlite_book.close()
+
+    def test_zero_amounts(self):
+        """
+        test that zero amounts are valid for all balance backends
+        """
+        ledger_book = self.examples["expenses2024"].get_ledger_book()
+        ledger_book.add_transaction(
+            "waived2024-10-07",
+            Transaction(
+                isodate="2024-10-07",
+                description="waived fee",
+                splits=[
+                    Split(amount=0.0, account_id="Cash"),
+                    Split(amount=0.0, account_id="Expenses:Food"),
+                ],
+            ),
+        )
+        db_file = f"{self.target_dir}/expenses2024_zero.sqlite"
+        sqlite_book = SqliteBook.create(db_file, ledger_book)
+        # not lenient - zero amounts must not raise
+        balances = ledger_book.calc_balances()
+        self.assertEqual(balances, sqlite_book.calc_balances())
+        ledger_book.columnar = True
+        self.assertEqual(balances, ledger_book.calc_balances())
+        sqlite_book.close()
+        # a book with only zero amounts has balances of 0.0 instead of None
+        zero_book = Book(name="zero")
+        for account_id in ["Cash", "Fees"]:
+            zero_book.add_account(Account(account_id, account_id, "ASSET"))
+        zero_book.add_transaction(
+            "waived",
+            Transaction(
+                isodate="2024-01-05",
+                splits=[
+                    Split(amount=0.0, account_id="Cash"),
+                    Split(amount=0.0, account_id="Fees"),
+                ],
+            ),
+        )
+        db_file = f"{self.target_dir}/zero.sqlite"
+        sqlite_book = SqliteBook.create(db_file, zero_book)
+        for book in [zero_book, sqlite_book]:
+            with self.subTest(book=type(book).__name__):
+                self.assertEqual({"Cash": 0.0, "Fees": 0.0}, book.calc_balances())
+                self.assertEqual(0.0, book.balance_as_of("Cash", "2024-01-31"))
+                register = book.get_register("Cash")
+                self.assertEqual(1, len(register))
+                self.assertEqual(0.0, register[0].balance)
+        self.assertEqual(
+            {"Cash": 0.0, "Fees": 0.0},
+            zero_book.get_period_end_balances("2024-01"),
+        )
+        sqlite_book.close()